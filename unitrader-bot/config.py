@@ -8,6 +8,7 @@ Required variables are validated on startup; missing values will raise an error.
 import logging
 from functools import lru_cache
 from typing import List
+from urllib.parse import urlsplit
 
 from pydantic import AliasChoices, Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -116,6 +117,9 @@ class Settings(BaseSettings):
     # Pricing note: $1.00/$5.00 per 1M tokens vs 3's $0.25/$1.25 (~4x).
     anthropic_model_fast: str = "claude-haiku-4-5-20251001"
     anthropic_base_url: str = "https://api.anthropic.com"
+    # Request latency-optimized inference for trade decisions. Only enable
+    # on deployments/models that support it; unsupported endpoints reject it.
+    claude_latency_optimized: bool = False
 
     # ─────────────────────────────────────────────
     # Payments
@@ -145,9 +149,17 @@ class Settings(BaseSettings):
     def enabled_exchange_list(self) -> list[str]:
         return [e.strip().lower() for e in self.enabled_exchanges.split(",") if e.strip()]
 
+    # Seconds a fetched spot price is reused by an exchange client; concurrent
+    # lookups for the same symbol share one request. 0 disables the cache.
+    price_cache_ttl: float = 1.0
+
     binance_api_key: str = ""
     binance_api_secret: str = ""
     binance_base_url: str = "https://api.binance.com"
+    # Kline stream that keeps 5-minute closes in memory; empty disables it.
+    # Left unset, it is the mainnet stream only when binance_base_url is the
+    # mainnet REST host, so testnet analysis never runs on mainnet closes.
+    binance_ws_url: str | None = None
 
     alpaca_paper_api_key: str = Field(
         default="",
@@ -316,6 +328,13 @@ class Settings(BaseSettings):
             raise ValueError("jwt_secret_key must be at least 32 characters")
         return v
 
+    @model_validator(mode="after")
+    def default_binance_ws_url(self) -> "Settings":
+        if self.binance_ws_url is None:
+            mainnet = urlsplit(self.binance_base_url).hostname == "api.binance.com"
+            self.binance_ws_url = "wss://stream.binance.com:9443/ws" if mainnet else ""
+        return self
+
     # ─────────────────────────────────────────────
     # Computed properties
     # ─────────────────────────────────────────────
@@ -17,7 +17,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from config import settings
 
@@ -82,6 +82,7 @@ if _pgbouncer_safe_mode:
 elif not _is_sqlite:
     _engine_kwargs.update(
         {
+            "poolclass": AsyncAdaptedQueuePool,
             "pool_size": settings.db_pool_size,
             "max_overflow": settings.db_max_overflow,
             "pool_timeout": settings.db_pool_timeout,
@@ -96,9 +97,10 @@ if _connect_args:
 engine = create_async_engine(_db_url, **_engine_kwargs)
 
 logger.info(
-    "DB engine created — pgbouncer_safe_mode=%s pool=%s",
+    "DB engine created — pgbouncer_safe_mode=%s pool=%s (%s)",
     _pgbouncer_safe_mode,
-    "NullPool" if _pgbouncer_safe_mode else "QueuePool",
+    type(engine.pool).__name__,
+    engine.pool.status(),
 )
 
 # ─────────────────────────────────────────────
@@ -194,6 +196,12 @@ async def create_tables() -> None:
                 "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_clerk_user_id "
                 "ON users (clerk_user_id) WHERE clerk_user_id IS NOT NULL"
             )
+            # Partial index for "last N closed trades" reads (performance summaries):
+            # turns ORDER BY closed_at DESC LIMIT N into an index range scan.
+            await conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS ix_trades_user_closed_desc "
+                "ON trades (user_id, closed_at DESC) WHERE status = 'closed'"
+            )
 
     # SQLite doesn't support IF NOT EXISTS on ADD COLUMN — use try/except per column
     if _is_sqlite:
@@ -266,6 +274,13 @@ async def create_tables() -> None:
                 )
             except Exception:
                 pass
+            try:
+                await conn.exec_driver_sql(
+                    "CREATE INDEX IF NOT EXISTS ix_trades_user_closed_desc "
+                    "ON trades (user_id, closed_at DESC) WHERE status = 'closed'"
+                )
+            except Exception:
+                pass
 
     logger.info("Database tables initialised")
 
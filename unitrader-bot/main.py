@@ -435,6 +435,7 @@ async def lifespan(app: FastAPI):
             await _tg_bot.delete_webhook()
         except Exception:
             pass
+        await _tg_bot.close()
 
     # Background tasks (including the db init task)
     for task in (
@@ -475,6 +476,36 @@ async def lifespan(app: FastAPI):
         )
     except Exception:
         pass
+
+    # Pooled exchange clients (kept open across trading cycles)
+    try:
+        from src.agents.core.trading_agent import close_pooled_exchange_clients
+
+        await close_pooled_exchange_clients()
+    except Exception:
+        pass
+
+    # Shared market-data HTTP client and Binance kline streams
+    try:
+        from src.integrations import binance_kline_stream
+        from src.integrations.market_data import close_http_client
+
+        await binance_kline_stream.close_streams()
+        await close_http_client()
+    except Exception:
+        pass
+
+    # Shared Claude clients for the marketing agents
+    try:
+        from src.agents.marketing import content_writer, social_media
+
+        await asyncio.gather(
+            content_writer.close_claude_client(),
+            social_media.close_claude_client(),
+            return_exceptions=True,
+        )
+    except Exception:
+        pass
     logger.info("Shutting down %s", settings.app_name)
 
 
@@ -520,12 +551,180 @@ def is_market_open_for_asset_class(asset_class: str) -> bool:
     return is_market_open()
 
 
+# Max users whose cycles (and Claude decision calls) are in flight at once.
+_TRADING_LOOP_CONCURRENCY = 16
+
+
+async def _run_user_trading_cycle(user: User) -> None:
+    """Run one trading-loop pass for a single user.
+
+    Cycles for the same user stay sequential so open-trade and daily-loss
+    checks see each other's results; separate users run concurrently.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            settings_result = await db.execute(
+                select(UserSettings).where(UserSettings.user_id == user.id)
+            )
+            user_settings = settings_result.scalar_one_or_none()
+
+            keys_result = await db.execute(
+                select(ExchangeAPIKey.exchange).where(
+                    ExchangeAPIKey.user_id == user.id,
+                    ExchangeAPIKey.is_active == True,  # noqa: E712
+                )
+            )
+            connected_exchanges = {row[0] for row in keys_result.all()}
+
+        if not connected_exchanges:
+            logger.debug("User %s has no exchange keys — skipping trading loop", user.id)
+            return
+
+        approved = (
+            user_settings.approved_assets
+            if user_settings and user_settings.approved_assets
+            else []
+        )
+
+        if not approved:
+            return
+
+        trade_mode = (user_settings.trade_mode or "auto") if user_settings else "auto"
+        trading_paused = (user_settings.trading_paused or False) if user_settings else False
+
+        if trading_paused:
+            logger.debug("Trading loop: user=%s trading paused — skipping", user.id)
+            return
+
+        from src.agents.core.trading_agent import TradingAgent
+        from src.agents.shared_memory import SharedContext, SharedMemory
+
+        agent = TradingAgent(user_id=user.id)
+
+        if trade_mode in ("auto", "guided"):
+            # Full autopilot: analyse + execute for each approved symbol
+            for exchange in connected_exchanges:
+                exchange_symbols = [s for s in approved if s]
+                if not exchange_symbols:
+                    continue
+                # Only run one symbol per exchange per cycle (avoid over-trading)
+                symbol = exchange_symbols[0]
+                try:
+                    result = await agent.run_cycle(
+                        symbol=symbol,
+                        exchange_name=exchange,
+                    )
+                    logger.info(
+                        "Trading loop: user=%s exchange=%s symbol=%s status=%s",
+                        user.id, exchange, symbol, result.get("status"),
+                    )
+                except Exception as exc:
+                    logger.error(
+                        "Trading loop: run_cycle failed user=%s symbol=%s: %s",
+                        user.id, symbol, exc,
+                    )
+
+        elif trade_mode == "picks":
+            # AI Picks mode: use dynamic universe pre-scoring, notify user of top opportunities
+            from routers.telegram_webhooks import get_telegram_bot_service
+            from routers.whatsapp_webhooks import get_whatsapp_bot_service
+            from src.agents.shared_memory import SharedMemory
+            from src.market_context import Exchange, MarketContext
+            from src.watchlists import score_universe
+            from sqlalchemy import select as _select
+
+            for exchange in connected_exchanges:
+                try:
+                    market_ctx = MarketContext(
+                        exchange=Exchange(exchange),
+                        is_paper=True,
+                        trading_account_id="system_picks",
+                        user_id=user.id,
+                    )
+                except Exception:
+                    market_ctx = None
+
+                symbols = (await score_universe(market_context=market_ctx))[:10]
+                if not symbols:
+                    continue
+
+                async with AsyncSessionLocal() as _db:
+                    ctx = await SharedMemory.load(user.id, _db)
+                if ctx is None:
+                    ctx = SharedContext.default(user.id)
+                ctx.exchange = exchange
+
+                picks = []
+                for sym in symbols:
+                    try:
+                        result = await agent.analyze(symbol=sym, exchange=exchange, context=ctx)
+                        if result and result.signal in ("buy", "sell"):
+                            picks.append({
+                                "symbol": sym,
+                                "signal": result.signal.upper(),
+                                "confidence": result.confidence,
+                                "reasoning": (result.explanation_expert or "")[:200],
+                            })
+                    except Exception:
+                        pass
+
+                picks.sort(key=lambda p: p["confidence"], reverse=True)
+                top = picks[:3]
+
+                if not top:
+                    continue
+
+                # Build notification message
+                lines = [f"🔍 Your AI found {len(top)} opportunity{'s' if len(top) > 1 else ''}:"]
+                for i, p in enumerate(top, 1):
+                    em = "📈" if p["signal"] == "BUY" else "📉"
+                    lines.append(f"{i}) {em} {p['signal']} {p['symbol']} — {p['confidence']:.0f}% confidence")
+                lines.append("\nOpen the app to review and trade.")
+                msg = "\n".join(lines)
+
+                # Send to connected platforms
+                async with AsyncSessionLocal() as _db:
+                    from models import UserExternalAccount
+                    ext_rows = (await _db.execute(
+                        _select(UserExternalAccount).where(
+                            UserExternalAccount.user_id == user.id,
+                            UserExternalAccount.is_linked == True,  # noqa: E712
+                        )
+                    )).scalars().all()
+
+                tg_bot = get_telegram_bot_service()
+                wa_bot = get_whatsapp_bot_service()
+
+                for ext in ext_rows:
+                    try:
+                        if ext.platform == "telegram" and tg_bot and tg_bot.app:
+                            await tg_bot.app.bot.send_message(
+                                chat_id=ext.external_id, text=msg
+                            )
+                        elif ext.platform == "whatsapp" and wa_bot:
+                            await wa_bot.send_message(ext.external_id, msg)
+                    except Exception as _exc:
+                        logger.debug("picks notify failed for %s: %s", ext.platform, _exc)
+
+                logger.info(
+                    "Trading loop (picks): user=%s exchange=%s found %d picks",
+                    user.id, exchange, len(top),
+                )
+        else:
+            logger.debug("Trading loop: user=%s trade_mode=%s — no action", user.id, trade_mode)
+
+    except Exception as exc:
+        logger.error("Trading loop error for user %s: %s", user.id, exc)
+
+
 async def _trading_loop() -> None:
     """Execute trading cycles for all active users every 5 minutes.
 
     For each user with active exchange keys and approved assets,
     runs TradingAgent.run_cycle() per symbol. Users without exchange
-    keys are skipped with a debug log rather than an error.
+    keys are skipped with a debug log rather than an error. Users are
+    processed concurrently (bounded by ``_TRADING_LOOP_CONCURRENCY``) so
+    their Claude decision calls overlap instead of running back-to-back.
     """
     logger.info("Trading loop started")
     while True:
@@ -541,161 +740,13 @@ async def _trading_loop() -> None:
                 )
                 active_users = result.scalars().all()
 
-            for user in active_users:
-                try:
-                    async with AsyncSessionLocal() as db:
-                        settings_result = await db.execute(
-                            select(UserSettings).where(UserSettings.user_id == user.id)
-                        )
-                        user_settings = settings_result.scalar_one_or_none()
+            sem = asyncio.Semaphore(_TRADING_LOOP_CONCURRENCY)
 
-                        keys_result = await db.execute(
-                            select(ExchangeAPIKey.exchange).where(
-                                ExchangeAPIKey.user_id == user.id,
-                                ExchangeAPIKey.is_active == True,  # noqa: E712
-                            )
-                        )
-                        connected_exchanges = {row[0] for row in keys_result.all()}
-
-                    if not connected_exchanges:
-                        logger.debug("User %s has no exchange keys — skipping trading loop", user.id)
-                        continue
-
-                    approved = (
-                        user_settings.approved_assets
-                        if user_settings and user_settings.approved_assets
-                        else []
-                    )
-
-                    if not approved:
-                        continue
-
-                    trade_mode = (user_settings.trade_mode or "auto") if user_settings else "auto"
-                    trading_paused = (user_settings.trading_paused or False) if user_settings else False
-
-                    if trading_paused:
-                        logger.debug("Trading loop: user=%s trading paused — skipping", user.id)
-                        continue
+            async def _bounded(user: User) -> None:
+                async with sem:
+                    await _run_user_trading_cycle(user)
 
-                    from src.agents.core.trading_agent import TradingAgent
-                    from src.agents.shared_memory import SharedContext, SharedMemory
-
-                    agent = TradingAgent(user_id=user.id)
-
-                    if trade_mode in ("auto", "guided"):
-                        # Full autopilot: analyse + execute for each approved symbol
-                        for exchange in connected_exchanges:
-                            exchange_symbols = [s for s in approved if s]
-                            if not exchange_symbols:
-                                continue
-                            # Only run one symbol per exchange per cycle (avoid over-trading)
-                            symbol = exchange_symbols[0]
-                            try:
-                                result = await agent.run_cycle(
-                                    symbol=symbol,
-                                    exchange_name=exchange,
-                                )
-                                logger.info(
-                                    "Trading loop: user=%s exchange=%s symbol=%s status=%s",
-                                    user.id, exchange, symbol, result.get("status"),
-                                )
-                            except Exception as exc:
-                                logger.error(
-                                    "Trading loop: run_cycle failed user=%s symbol=%s: %s",
-                                    user.id, symbol, exc,
-                                )
-
-                    elif trade_mode == "picks":
-                        # AI Picks mode: use dynamic universe pre-scoring, notify user of top opportunities
-                        from routers.telegram_webhooks import get_telegram_bot_service
-                        from routers.whatsapp_webhooks import get_whatsapp_bot_service
-                        from src.agents.shared_memory import SharedMemory
-                        from src.market_context import Exchange, MarketContext
-                        from src.watchlists import score_universe
-                        from sqlalchemy import select as _select
-
-                        for exchange in connected_exchanges:
-                            try:
-                                market_ctx = MarketContext(
-                                    exchange=Exchange(exchange),
-                                    is_paper=True,
-                                    trading_account_id="system_picks",
-                                    user_id=user.id,
-                                )
-                            except Exception:
-                                market_ctx = None
-
-                            symbols = (await score_universe(market_context=market_ctx))[:10]
-                            if not symbols:
-                                continue
-
-                            async with AsyncSessionLocal() as _db:
-                                ctx = await SharedMemory.load(user.id, _db)
-                            if ctx is None:
-                                ctx = SharedContext.default(user.id)
-                            ctx.exchange = exchange
-
-                            picks = []
-                            for sym in symbols:
-                                try:
-                                    result = await agent.analyze(symbol=sym, exchange=exchange, context=ctx)
-                                    if result and result.signal in ("buy", "sell"):
-                                        picks.append({
-                                            "symbol": sym,
-                                            "signal": result.signal.upper(),
-                                            "confidence": result.confidence,
-                                            "reasoning": (result.explanation_expert or "")[:200],
-                                        })
-                                except Exception:
-                                    pass
-
-                            picks.sort(key=lambda p: p["confidence"], reverse=True)
-                            top = picks[:3]
-
-                            if not top:
-                                continue
-
-                            # Build notification message
-                            lines = [f"🔍 Your AI found {len(top)} opportunity{'s' if len(top) > 1 else ''}:"]
-                            for i, p in enumerate(top, 1):
-                                em = "📈" if p["signal"] == "BUY" else "📉"
-                                lines.append(f"{i}) {em} {p['signal']} {p['symbol']} — {p['confidence']:.0f}% confidence")
-                            lines.append("\nOpen the app to review and trade.")
-                            msg = "\n".join(lines)
-
-                            # Send to connected platforms
-                            async with AsyncSessionLocal() as _db:
-                                from models import UserExternalAccount
-                                ext_rows = (await _db.execute(
-                                    _select(UserExternalAccount).where(
-                                        UserExternalAccount.user_id == user.id,
-                                        UserExternalAccount.is_linked == True,  # noqa: E712
-                                    )
-                                )).scalars().all()
-
-                            tg_bot = get_telegram_bot_service()
-                            wa_bot = get_whatsapp_bot_service()
-
-                            for ext in ext_rows:
-                                try:
-                                    if ext.platform == "telegram" and tg_bot and tg_bot.app:
-                                        await tg_bot.app.bot.send_message(
-                                            chat_id=ext.external_id, text=msg
-                                        )
-                                    elif ext.platform == "whatsapp" and wa_bot:
-                                        await wa_bot.send_message(ext.external_id, msg)
-                                except Exception as _exc:
-                                    logger.debug("picks notify failed for %s: %s", ext.platform, _exc)
-
-                            logger.info(
-                                "Trading loop (picks): user=%s exchange=%s found %d picks",
-                                user.id, exchange, len(top),
-                            )
-                    else:
-                        logger.debug("Trading loop: user=%s trade_mode=%s — no action", user.id, trade_mode)
-
-                except Exception as exc:
-                    logger.error("Trading loop error for user %s: %s", user.id, exc)
+            await asyncio.gather(*(_bounded(user) for user in active_users))
 
         except Exception as exc:
             logger.error("Trading loop outer error: %s", exc)
@@ -49,7 +49,12 @@ from models import (
 )
 from routers.auth import get_current_user
 from schemas import SuccessResponse, TradeResponse
-from security import encrypt_api_key, hash_api_key, decrypt_api_key
+from security import (
+    decrypt_api_key,
+    encrypt_api_key,
+    forget_decrypted_api_key,
+    hash_api_key,
+)
 from src.agents.goal_tracking_agent import GoalTrackingAgent
 from src.agents.shared_memory import SharedMemory
 from src.integrations.alpaca_rate_limiter import alpaca_limiter
@@ -519,6 +524,9 @@ async def connect_exchange(
         if old_key:
             old_key.is_active = False
             old_key.rotated_at = datetime.now(timezone.utc)
+            forget_decrypted_api_key(
+                old_key.encrypted_api_key, old_key.encrypted_api_secret
+            )
 
         now = datetime.now(timezone.utc)
         new_key_kwargs = dict(
@@ -669,6 +677,9 @@ async def disconnect_exchange(
             detail="Failed to disconnect exchange. Please try again.",
         )
 
+    for key_row in key_rows:
+        forget_decrypted_api_key(key_row.encrypted_api_key, key_row.encrypted_api_secret)
+
     return {"status": "success", "data": {"exchange": exchange, "message": f"{exchange.title()} disconnected"}}
 
 
@@ -9,6 +9,7 @@ import hashlib
 import logging
 import re
 import secrets
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -62,18 +63,35 @@ def encrypt_api_key(api_key: str, api_secret: str) -> tuple[str, str]:
     )
 
 
+# Decrypted broker credentials keyed by their ciphertext. A rotated key has
+# new ciphertext, so entries can never go stale — the TTL only bounds how
+# long plaintext stays resident in memory.
+DECRYPTED_KEY_TTL_SECONDS = 300
+_DECRYPTED_KEY_CACHE_MAX = 1024
+_decrypted_key_cache: dict[tuple[str, str], tuple[tuple[str, str], float]] = {}
+
+
 def decrypt_api_key(encrypted_key: str, encrypted_secret: str) -> tuple[str, str]:
     """Decrypt previously encrypted broker credentials.
 
+    Results are cached for ``DECRYPTED_KEY_TTL_SECONDS`` so trading cycles
+    that reload the same key row skip the Fernet work.
+
     Returns:
         (api_key, api_secret) as plain strings.
 
     Raises:
         InvalidToken: if the ciphertext has been tampered with.
     """
+    cache_key = (encrypted_key, encrypted_secret)
+    now = time.monotonic()
+    cached = _decrypted_key_cache.get(cache_key)
+    if cached and now - cached[1] < DECRYPTED_KEY_TTL_SECONDS:
+        return cached[0]
+
     f = _get_fernet(settings.field_encryption_key)
     try:
-        return (
+        plain = (
             f.decrypt(encrypted_key.encode()).decode(),
             f.decrypt(encrypted_secret.encode()).decode(),
         )
@@ -81,6 +99,22 @@ def decrypt_api_key(encrypted_key: str, encrypted_secret: str) -> tuple[str, str
         logger.error("Failed to decrypt API key — possible tampering detected")
         raise exc
 
+    if len(_decrypted_key_cache) >= _DECRYPTED_KEY_CACHE_MAX:
+        for k in [
+            k for k, (_, ts) in _decrypted_key_cache.items()
+            if now - ts >= DECRYPTED_KEY_TTL_SECONDS
+        ]:
+            del _decrypted_key_cache[k]
+        if len(_decrypted_key_cache) >= _DECRYPTED_KEY_CACHE_MAX:
+            _decrypted_key_cache.clear()
+    _decrypted_key_cache[cache_key] = (plain, now)
+    return plain
+
+
+def forget_decrypted_api_key(encrypted_key: str, encrypted_secret: str) -> None:
+    """Drop cached plaintext for a key row that was rotated or disconnected."""
+    _decrypted_key_cache.pop((encrypted_key, encrypted_secret), None)
+
 
 def hash_api_key(api_key: str) -> str:
     """Return a SHA-256 hex digest of the api_key for quick verification.
@@ -11,11 +11,16 @@ so responses reference real numbers.
 """
 
 import asyncio
+import functools
+import hashlib
 import logging
 import re
+import time
 import uuid
-from datetime import datetime, timezone
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
 from typing import Any
+from typing import Awaitable, Callable
 from typing import Literal
 from typing import Optional
 
@@ -33,6 +38,7 @@ from src.agents.shared_memory import SharedContext, SharedMemory
 from src.agents import shared_memory
 from src.services.context_detection import (
     AI_PERFORMANCE,
+    EMOTIONAL_SUPPORT,
     GENERAL,
     MARKET_ANALYSIS,
     TRADING_QUESTION,
@@ -46,10 +52,36 @@ from src.services.conversation_memory import (
 
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
+# Claude error logging is throttled so an upstream outage cannot flood the logs.
+_CLAUDE_ERROR_LOG_INTERVAL_S = 5.0
+_last_claude_error_log_ts = float("-inf")
+
+
+def _log_claude_error(where: str, exc: BaseException) -> None:
+    """Log a Claude API failure — full traceback at most once per interval.
+
+    The exception class name leads the message for cheap grepping; repeats
+    inside the interval are demoted to DEBUG.
+    """
+    global _last_claude_error_log_ts
+    now = time.monotonic()
+    if now - _last_claude_error_log_ts >= _CLAUDE_ERROR_LOG_INTERVAL_S:
+        _last_claude_error_log_ts = now
+        logger.error(
+            "Claude API error (%s) in %s: %s",
+            exc.__class__.__name__, where, exc, exc_info=exc,
+        )
+    else:
+        logger.debug("Claude API error (%s) in %s: %s", exc.__class__.__name__, where, exc)
+
 _CLAUDE_MODEL = "claude-sonnet-4-20250514"
 _CLAUDE_MODEL_FAST = settings.anthropic_model_fast  # light tasks only; env-overridable
 _MAX_TOKENS = 1024
 _HISTORY_TURNS = 10  # number of past exchanges to include
+# Soft input budget (estimated tokens) — oldest history turns are dropped above it.
+_PROMPT_TOKEN_BUDGET = 12_000
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Channel-aware formatting
@@ -160,6 +192,22 @@ RULES FOR USING ACTION TAGS:
 """
 
 
+@functools.lru_cache(maxsize=4096)
+def _compose_channel_system_prompt(base: str, channel: Channel, companion_name: str) -> str:
+    """Wrap the persona prompt with channel preamble, formatting and action-tag rules.
+
+    ``build_system_prompt`` returns the same (memoised) string object for
+    unchanged inputs, so the key hash is already cached on repeat turns.
+    """
+    prompt = base
+    if channel == "whatsapp":
+        prompt = _whatsapp_capabilities_preamble(companion_name) + prompt
+    # Append channel-specific formatting instructions (never replace base prompt).
+    prompt = prompt + _format_instruction_for_channel(channel)
+    # Append action-tag instruction AFTER formatting block.
+    return prompt + _action_tags_instruction()
+
+
 def parse_action_tag(response_text: str) -> tuple[str, Optional[dict]]:
     """Extract an <ACTION ... /> tag from the response text (best-effort)."""
     try:
@@ -189,6 +237,73 @@ def parse_action_tag(response_text: str) -> tuple[str, Optional[dict]]:
         return response_text, None
 
 
+# Replies claiming no account access despite the injected snapshot; see respond().
+_GUARDRAIL_PHRASES = (
+    "as an ai",
+    "i cannot access",
+    "i can't access",
+    "i do not have access",
+    "i don't have access",
+    "no direct integration",
+)
+# Streamed text held back so a guardrail phrase is never partly forwarded.
+_GUARDRAIL_HOLDBACK = max(len(p) for p in _GUARDRAIL_PHRASES) - 1
+
+
+def _violates_guardrail(text: str) -> bool:
+    """True when ``text`` claims the assistant cannot see the user's account."""
+    lower = text.lower()
+    return any(phrase in lower for phrase in _GUARDRAIL_PHRASES)
+
+
+async def _forward_text(on_text: Callable[[str], Awaitable[None]], text: str) -> None:
+    """Send ``text`` to a streaming caller; callback errors never fail the turn."""
+    try:
+        await on_text(text)
+    except Exception as exc:
+        logger.debug("on_text callback failed: %s", exc)
+
+
+class _ActionTagStreamFilter:
+    """Strip raw ``<ACTION .../>`` tags from streamed text chunks.
+
+    Tags can be split across chunk boundaries, so anything after ``<ACTION``
+    is buffered until the closing ``/>`` arrives and then discarded.
+    """
+
+    def __init__(self) -> None:
+        self._in_tag = False
+        self._buf = ""
+
+    def feed(self, chunk: str) -> list[str]:
+        """Return the user-visible pieces of ``chunk`` (possibly empty)."""
+        out: list[str] = []
+        while chunk:
+            if self._in_tag:
+                self._buf += chunk
+                end_idx = self._buf.find("/>")
+                if end_idx == -1:
+                    break
+                # Discard the full tag content.
+                chunk = self._buf[end_idx + 2 :]
+                self._buf = ""
+                self._in_tag = False
+                continue
+
+            start_idx = chunk.find("<ACTION")
+            if start_idx == -1:
+                out.append(chunk)
+                break
+
+            # Emit text before the tag, then enter tag mode.
+            if start_idx > 0:
+                out.append(chunk[:start_idx])
+            self._in_tag = True
+            self._buf = chunk[start_idx:]
+            chunk = ""
+        return out
+
+
 async def dispatch_action(
     *,
     action: dict,
@@ -309,6 +424,60 @@ async def _save_onboarding_messages(
     except Exception as exc:
         logger.warning("Failed to persist onboarding_messages history: %s", exc)
 
+
+# Strong references to in-flight persistence tasks so they are not GC'd mid-write.
+_PENDING_PERSIST_TASKS: set[asyncio.Task] = set()
+
+
+def _on_persist_done(task: asyncio.Task) -> None:
+    _PENDING_PERSIST_TASKS.discard(task)
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("Background conversation persist failed: %s", exc)
+
+
+def _persist_exchange_in_background(
+    *,
+    user_id: str,
+    user_message: str,
+    response_text: str,
+    context: str,
+    sentiment: str,
+    include_onboarding_history: bool = True,
+) -> str:
+    """Schedule the conversation write off the response path; return its id.
+
+    The id is allocated up-front so callers can hand it back immediately.
+    The task always opens its own session — a request-scoped ``db`` may be
+    closed by the time the write runs.
+    """
+    conversation_id = str(uuid.uuid4())
+
+    async def _persist() -> None:
+        await save_conversation(
+            user_id=user_id,
+            message=user_message,
+            response=response_text,
+            context=context,
+            sentiment=sentiment,
+            conversation_id=conversation_id,
+        )
+        if include_onboarding_history:
+            # Also persist to onboarding_messages so router can inject last 10 turns.
+            await _save_onboarding_messages(
+                user_id=user_id,
+                user_message=user_message,
+                assistant_message=response_text,
+                db=None,
+            )
+
+    task = asyncio.create_task(_persist(), name=f"persist_conversation:{conversation_id}")
+    _PENDING_PERSIST_TASKS.add(task)
+    task.add_done_callback(_on_persist_done)
+    return conversation_id
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Trader Class Detection
 # ─────────────────────────────────────────────────────────────────────────────
@@ -905,6 +1074,102 @@ async def _build_onboarding_system_prompt(user_id: str, db: AsyncSession | None)
     return base + offer_block
 
 
+# ─────────────────────────────────────────────
+# Prompt budgeting
+# ─────────────────────────────────────────────
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token for English prose)."""
+    return len(text) // 4
+
+
+def _trim_history_to_budget(
+    system_prompt: str,
+    history: list[dict[str, str]],
+    user_message: str,
+    budget: int = _PROMPT_TOKEN_BUDGET,
+) -> list[dict[str, str]]:
+    """Drop the oldest history turns (in user/assistant pairs) until the
+    estimated prompt fits ``budget``. The system prompt — including any
+    injected performance / market blocks — and the new message are kept."""
+    fixed = _estimate_tokens(system_prompt) + _estimate_tokens(user_message)
+    sizes = [_estimate_tokens(str(m.get("content") or "")) for m in history]
+    total = fixed + sum(sizes)
+    if total <= budget:
+        return history
+
+    start = 0
+    while start < len(history) and total > budget:
+        step = 2 if start + 1 < len(history) else 1
+        total -= sum(sizes[start : start + step])
+        start += step
+    logger.info(
+        "Prompt over budget (~%d tokens est.) — dropped %d oldest history messages",
+        fixed + sum(sizes),
+        start,
+    )
+    trimmed = history[start:]
+    # Claude requires the first message to be from the user.
+    while trimmed and trimmed[0].get("role") != "user":
+        trimmed = trimmed[1:]
+    return trimmed
+
+
+# ─────────────────────────────────────────────
+# Response cache (near-identical repeat questions)
+# ─────────────────────────────────────────────
+
+# key → (response payload, cached_at). Keys are scoped per user and channel:
+# answers embed the user's own account snapshot and must never cross users.
+_response_cache: dict[str, tuple[dict, datetime]] = {}
+RESPONSE_CACHE_TTL_SECONDS = 120
+RESPONSE_CACHE_MAX_ENTRIES = 10_000
+# Personalised / time-sensitive contexts are always answered fresh.
+_UNCACHEABLE_CONTEXTS = frozenset({AI_PERFORMANCE, EMOTIONAL_SUPPORT})
+
+_WS_RE = re.compile(r"\s+")
+# Follow-ups ("yes", "why?", "tell me more about that") depend on the previous
+# turn, which the key does not cover — only self-contained questions are cached.
+_RESPONSE_CACHE_MIN_WORDS = 3
+_ANAPHORIC_RE = re.compile(
+    r"\b(yes|yeah|yep|no|nope|ok|okay|sure|why|it|its|that|this|these|those|"
+    r"them|they|more|again|above|previous|same|else|instead)\b"
+)
+# Only the plain-answer fields are cached; callers add per-request fields
+# (pending trades, actions taken) to the dict they get back.
+_CACHED_RESPONSE_FIELDS = ("response", "context", "context_label", "user_ai_name", "data_freshness")
+
+
+def _response_cache_key(
+    user_id: str, channel: str, context: str, ai_name: str, user_message: str
+) -> str | None:
+    """Return the cache key for ``user_message``, or None if it must not be cached."""
+    normalized = _WS_RE.sub(" ", user_message.lower()).strip().rstrip("?!.")
+    if len(normalized.split()) < _RESPONSE_CACHE_MIN_WORDS or _ANAPHORIC_RE.search(normalized):
+        return None
+    raw = "\x1f".join((user_id, channel, context, ai_name, normalized))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _get_cached_response(key: str) -> dict | None:
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    payload, cached_at = entry
+    if datetime.now(timezone.utc) - cached_at > timedelta(seconds=RESPONSE_CACHE_TTL_SECONDS):
+        _response_cache.pop(key, None)
+        return None
+    return payload
+
+
+def _store_cached_response(key: str, payload: dict) -> None:
+    if len(_response_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+        # Dicts keep insertion order — drop the oldest entry.
+        _response_cache.pop(next(iter(_response_cache)), None)
+    cached = {k: payload[k] for k in _CACHED_RESPONSE_FIELDS if k in payload}
+    _response_cache[key] = (cached, datetime.now(timezone.utc))
+
+
 # ─────────────────────────────────────────────
 # Performance context injection
 # ─────────────────────────────────────────────
@@ -1102,6 +1367,7 @@ class ConversationAgent:
         shared_context: SharedContext | None = None,
         conversation_history: list[dict[str, str]] | None = None,
         channel: Channel | str = "web",
+        on_text: Callable[[str], Awaitable[None]] | None = None,
     ) -> dict:
         """Process a user message and return an AI response.
 
@@ -1114,15 +1380,21 @@ class ConversationAgent:
         6. Optionally inject performance data.
         7. Inject live market data into the system prompt.
         8. Build the Claude prompt and call the API.
-        9. Persist the exchange to the database.
+        9. Schedule persistence of the exchange (background task).
         10. Return structured response with ``data_freshness``.
 
         Args:
             user_message: The raw text from the user.
-            db: Optional injected AsyncSession (for request-scoped sessions).
+            db: Optional injected AsyncSession (for request-scoped sessions). When
+                omitted, a single session is opened and reused for every read in the call.
             shared_context: If provided (e.g. from Orchestrator.route), used for the system
                 prompt instead of loading SharedMemory again on a new session.
             channel: ``web_app`` | ``whatsapp`` | ``telegram`` — shapes prompt and output length.
+            on_text: Optional async callback. When given, the Claude call is streamed and
+                each user-visible text chunk is forwarded as it arrives (ACTION tags are
+                filtered out). A reply that trips the access guardrail is withheld and the
+                retry streamed instead; action output follows as a final chunk, so the
+                streamed text matches the returned ``response``.
 
         Returns:
             {
@@ -1132,19 +1404,46 @@ class ConversationAgent:
                 "sentiment": str,
                 "user_ai_name": str,
                 "conversation_id": str,
-                "timestamp": str,
+                "timestamp": datetime,  # tz-aware UTC; ISO-encoded by the JSON layer
                 "data_freshness": str | None,
             }
         """
         if not settings.anthropic_api_key:
             return self._fallback_response(user_message)
 
-        # ── Load user profile ──────────────────────────────────────────────
-        async with AsyncSessionLocal() as _db:
-            user_result = await _db.execute(
-                select(User).where(User.id == self.user_id)
+        # One session for the whole turn: reuse the injected one, else open one here.
+        session_cm = nullcontext(db) if db is not None else AsyncSessionLocal()
+        async with session_cm as _db:
+            return await self._respond_in_session(
+                user_message,
+                db=_db,
+                owns_session=db is None,
+                shared_context=shared_context,
+                conversation_history=conversation_history,
+                channel=channel,
+                on_text=on_text,
             )
-            user = user_result.scalar_one_or_none()
+
+    async def _respond_in_session(
+        self,
+        user_message: str,
+        *,
+        db: AsyncSession,
+        owns_session: bool,
+        shared_context: SharedContext | None,
+        conversation_history: list[dict[str, str]] | None,
+        channel: Channel | str,
+        on_text: Callable[[str], Awaitable[None]] | None,
+    ) -> dict:
+        """Body of :meth:`respond`; every read goes through ``db``.
+
+        ``owns_session`` is True when :meth:`respond` opened ``db`` itself.
+        """
+        # ── Load user profile ──────────────────────────────────────────────
+        user_result = await db.execute(
+            select(User).where(User.id == self.user_id)
+        )
+        user = user_result.scalar_one_or_none()
 
         if not user:
             return self._fallback_response(user_message, reason="User not found")
@@ -1152,8 +1451,7 @@ class ConversationAgent:
         if shared_context is not None:
             shared_ctx = shared_context
         else:
-            async with AsyncSessionLocal() as _ctx_db:
-                shared_ctx = await SharedMemory.load(self.user_id, _ctx_db)
+            shared_ctx = await SharedMemory.load(self.user_id, db)
 
         ai_name = (
             (shared_ctx.ai_name or shared_ctx.apex_name or user.ai_name or "Apex").strip()
@@ -1168,13 +1466,13 @@ class ConversationAgent:
             user_message, shared_ctx, context
         )
         if routed_reply is not None:
-            conv = await save_conversation(
+            conversation_id = _persist_exchange_in_background(
                 user_id=self.user_id,
-                message=user_message,
-                response=routed_reply,
+                user_message=user_message,
+                response_text=routed_reply,
                 context=context,
                 sentiment=sentiment,
-                db=db,
+                include_onboarding_history=False,
             )
             from src.services.context_detection import get_context_label
 
@@ -1184,11 +1482,35 @@ class ConversationAgent:
                 "context_label": get_context_label(context),
                 "sentiment": sentiment,
                 "user_ai_name": ai_name,
-                "conversation_id": conv.id,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "conversation_id": conversation_id,
+                "timestamp": datetime.now(_UTC),
                 "data_freshness": "orchestrator",
             }
 
+        # ── Response cache (repeat questions within a short window) ───────
+        ch = _normalize_channel(str(channel))
+        cache_key: str | None = None
+        if context not in _UNCACHEABLE_CONTEXTS:
+            cache_key = _response_cache_key(self.user_id, ch, context, ai_name, user_message)
+        if cache_key is not None:
+            cached = _get_cached_response(cache_key)
+            if cached is not None:
+                if on_text is not None:
+                    await _forward_text(on_text, cached["response"])
+                conversation_id = _persist_exchange_in_background(
+                    user_id=self.user_id,
+                    user_message=user_message,
+                    response_text=cached["response"],
+                    context=context,
+                    sentiment=sentiment,
+                )
+                return {
+                    **cached,
+                    "sentiment": sentiment,
+                    "conversation_id": conversation_id,
+                    "timestamp": datetime.now(_UTC),
+                }
+
         # ── Extract assets and fetch live market data ──────────────────────
         assets = _extract_assets(user_message)
         if not assets and _wants_broad_market_summary(user_message):
@@ -1233,19 +1555,13 @@ class ConversationAgent:
             )
 
         # ── Shared context (accounts / positions) — production persona prompt ──
-        ch = _normalize_channel(str(channel))
         companion_name = (getattr(shared_ctx, "ai_name", None) or getattr(shared_ctx, "apex_name", None) or getattr(user, "ai_name", None) or "Apex").strip() or "Apex"
-        system_prompt = build_system_prompt(shared_ctx, ch)
-        if ch == "whatsapp":
-            system_prompt = _whatsapp_capabilities_preamble(companion_name) + system_prompt
-        # Append channel-specific formatting instructions (never replace base prompt).
-        system_prompt = system_prompt + _format_instruction_for_channel(ch)
-        # Append action-tag instruction AFTER formatting block.
-        system_prompt = system_prompt + _action_tags_instruction()
+        system_prompt = _compose_channel_system_prompt(
+            build_system_prompt(shared_ctx, ch), ch, companion_name
+        )
 
         if context == AI_PERFORMANCE:
-            async with AsyncSessionLocal() as _db2:
-                perf = await _get_performance_summary(self.user_id, _db2)
+            perf = await _get_performance_summary(self.user_id, db)
             system_prompt += f"\n\nCURRENT PERFORMANCE DATA:\n{perf}"
 
         if marks_block:
@@ -1256,36 +1572,47 @@ class ConversationAgent:
             system_prompt += market_block
 
         # ── Build Claude messages ──────────────────────────────────────────
+        history = _trim_history_to_budget(system_prompt, history, user_message)
         messages = [*history, {"role": "user", "content": user_message}]
 
+        # The context reads are done: end the read transaction so the pooled
+        # connection is not held idle in transaction through the Claude call.
+        # An injected session belongs to the caller and is left alone.
+        if owns_session:
+            await db.commit()
+
         # ── Call Claude ────────────────────────────────────────────────────
         max_out = 600 if ch in ("whatsapp", "telegram") else _MAX_TOKENS
+        withheld = ""
         try:
-            claude_response = await self._claude.messages.create(
-                model=settings.anthropic_model,
-                max_tokens=max_out,
-                system=system_prompt,
-                messages=messages,
-            )
-            response_text = claude_response.content[0].text.strip()
+            if on_text is not None:
+                # Text is held back as soon as a guardrail phrase shows up, so the
+                # retry below can replace the reply before the user sees it.
+                response_text, withheld = await self._stream_claude_text(
+                    model=settings.anthropic_model,
+                    max_tokens=max_out,
+                    system=system_prompt,
+                    messages=messages,
+                    on_text=on_text,
+                    guarded=True,
+                )
+            else:
+                claude_response = await self._claude.messages.create(
+                    model=settings.anthropic_model,
+                    max_tokens=max_out,
+                    system=system_prompt,
+                    messages=messages,
+                )
+                response_text = claude_response.content[0].text.strip()
         except Exception as exc:
-            logger.error("Claude API error in ConversationAgent: %s", exc)
+            _log_claude_error("ConversationAgent", exc)
             return self._fallback_response(user_message, reason=str(exc))
 
         # ── Guardrail: suppress “I can’t access …” user-visible replies ─────
         # Strong prompts can still be violated occasionally. If Claude claims it
         # cannot access account data (despite us injecting it), retry once with a
         # short corrective system suffix.
-        lower = response_text.lower()
-        disallowed = (
-            ("as an ai" in lower)
-            or ("i cannot access" in lower)
-            or ("i can't access" in lower)
-            or ("i do not have access" in lower)
-            or ("i don't have access" in lower)
-            or ("no direct integration" in lower)
-        )
-        if disallowed:
+        if _violates_guardrail(response_text):
             try:
                 retry_system = (
                     system_prompt
@@ -1294,17 +1621,30 @@ class ConversationAgent:
                     "Answer using CONNECTED EXCHANGES / OPEN POSITIONS / PERFORMANCE / RECENT TRADES. "
                     "Do not mention access limitations or integrations."
                 )
-                claude_retry = await self._claude.messages.create(
-                    model=settings.anthropic_model,
-                    max_tokens=max_out,
-                    system=retry_system,
-                    messages=messages,
-                )
-                retry_text = claude_retry.content[0].text.strip()
+                if on_text is not None:
+                    retry_text, _ = await self._stream_claude_text(
+                        model=settings.anthropic_model,
+                        max_tokens=max_out,
+                        system=retry_system,
+                        messages=messages,
+                        on_text=on_text,
+                    )
+                else:
+                    claude_retry = await self._claude.messages.create(
+                        model=settings.anthropic_model,
+                        max_tokens=max_out,
+                        system=retry_system,
+                        messages=messages,
+                    )
+                    retry_text = claude_retry.content[0].text.strip()
                 if retry_text:
                     response_text = retry_text
+                    withheld = ""
             except Exception as exc:
                 logger.debug("Guardrail retry failed: %s", exc)
+        if withheld and on_text is not None:
+            # No usable retry — the caller still gets the whole original reply.
+            await _forward_text(on_text, withheld)
 
         # ── ACTION TAGS: parse + dispatch (never show raw tags) ─────────────
         clean_response, action = parse_action_tag(response_text)
@@ -1322,36 +1662,88 @@ class ConversationAgent:
             if supplementary
             else clean_response
         )
+        if supplementary and on_text is not None:
+            await _forward_text(on_text, f"\n\n{supplementary}")
 
-        # ── Persist ────────────────────────────────────────────────────────
-        conv = await save_conversation(
+        # ── Persist (off the response path) ────────────────────────────────
+        conversation_id = _persist_exchange_in_background(
             user_id=self.user_id,
-            message=user_message,
-            response=response_text,
+            user_message=user_message,
+            response_text=response_text,
             context=context,
             sentiment=sentiment,
-            db=db,
-        )
-        # Also persist to onboarding_messages so router can inject last 10 turns.
-        await _save_onboarding_messages(
-            user_id=self.user_id,
-            user_message=user_message,
-            assistant_message=response_text,
-            db=db,
         )
 
         from src.services.context_detection import get_context_label
 
-        return {
+        result = {
             "response": response_text,
             "context": context,
             "context_label": get_context_label(context),
             "sentiment": sentiment,
             "user_ai_name": ai_name,
-            "conversation_id": conv.id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "conversation_id": conversation_id,
+            "timestamp": datetime.now(_UTC),
             "data_freshness": data_freshness,
         }
+        # A parsed action tag must run on every ask, whatever it returned;
+        # only cache plain answers.
+        if cache_key is not None and action is None:
+            _store_cached_response(cache_key, result)
+        return result
+
+    async def _stream_claude_text(
+        self,
+        *,
+        model: str,
+        max_tokens: int,
+        system: str,
+        messages: list[dict[str, str]],
+        on_text: Callable[[str], Awaitable[None]],
+        guarded: bool = False,
+    ) -> tuple[str, str]:
+        """Stream a Claude completion, forwarding visible chunks to ``on_text``.
+
+        With ``guarded``, the last few characters stay buffered and forwarding
+        stops for good once the text trips :func:`_violates_guardrail`, so the
+        offending phrase never reaches the caller.
+
+        Returns ``(text, withheld)``: the full (unfiltered) response text, so the
+        caller can run the usual guardrail / action-tag handling on it, and the
+        visible text that was held back and not forwarded.
+        """
+        buf: list[str] = []
+        tag_filter = _ActionTagStreamFilter()
+        pending = ""
+        tripped = False
+        async with self._claude.messages.stream(
+            model=model,
+            max_tokens=max_tokens,
+            system=system,
+            messages=messages,
+        ) as stream:
+            async for text in stream.text_stream:
+                if not text:
+                    continue
+                buf.append(text)
+                pending += "".join(tag_filter.feed(text))
+                if tripped:
+                    continue
+                if not guarded:
+                    ready, pending = pending, ""
+                elif _violates_guardrail("".join(buf)):
+                    tripped = True
+                    continue
+                else:
+                    cut = max(len(pending) - _GUARDRAIL_HOLDBACK, 0)
+                    ready, pending = pending[:cut], pending[cut:]
+                if ready:
+                    await _forward_text(on_text, ready)
+        if tripped:
+            return "".join(buf).strip(), pending
+        if pending:
+            await _forward_text(on_text, pending)
+        return "".join(buf).strip(), ""
 
     async def generate_response_stream(
         self,
@@ -1412,11 +1804,9 @@ class ConversationAgent:
         except Exception as exc:
             logger.warning("Trading engine context injection failed: %s", exc)
 
-        system_prompt = build_system_prompt(shared_ctx, ch)
-        if ch == "whatsapp":
-            system_prompt = _whatsapp_capabilities_preamble(companion_name) + system_prompt
-        system_prompt = system_prompt + _format_instruction_for_channel(ch)
-        system_prompt = system_prompt + _action_tags_instruction()
+        system_prompt = _compose_channel_system_prompt(
+            build_system_prompt(shared_ctx, ch), ch, companion_name
+        )
 
         if context == AI_PERFORMANCE:
             async with AsyncSessionLocal() as _db2:
@@ -1434,12 +1824,12 @@ class ConversationAgent:
         if len(history) > 20:
             history = history[-20:]
 
+        history = _trim_history_to_budget(system_prompt, history, user_message)
         messages = [*history, {"role": "user", "content": user_message}]
 
         full_response = ""
         # Prevent raw <ACTION .../> tags from ever being streamed to the user.
-        in_action_tag = False
-        action_buf = ""
+        tag_filter = _ActionTagStreamFilter()
         max_out = _MAX_TOKENS
 
         try:
@@ -1453,34 +1843,10 @@ class ConversationAgent:
                     if not text:
                         continue
                     full_response += text
-
-                    chunk = text
-                    while chunk:
-                        if in_action_tag:
-                            action_buf += chunk
-                            end_idx = action_buf.find("/>")
-                            if end_idx != -1:
-                                # Discard the full tag content.
-                                remainder = action_buf[end_idx + 2 :]
-                                action_buf = ""
-                                in_action_tag = False
-                                chunk = remainder
-                                continue
-                            break
-
-                        start_idx = chunk.find("<ACTION")
-                        if start_idx == -1:
-                            yield chunk
-                            break
-
-                        # Yield text before the tag, then enter tag mode.
-                        if start_idx > 0:
-                            yield chunk[:start_idx]
-                        in_action_tag = True
-                        action_buf = chunk[start_idx:]
-                        chunk = ""
+                    for piece in tag_filter.feed(text):
+                        yield piece
         except Exception as exc:
-            logger.error("Claude streaming error in ConversationAgent: %s", exc)
+            _log_claude_error("ConversationAgent stream", exc)
             # Let the caller show partial output; append a short notice.
             if not full_response:
                 yield "Response interrupted. Please try again."
@@ -1530,6 +1896,7 @@ class ConversationAgent:
         db: AsyncSession | None = None,
         conversation_history: list[dict[str, str]] | None = None,
         channel: Channel | str = "web",
+        on_text: Callable[[str], Awaitable[None]] | None = None,
     ) -> dict:
         """Preferred entry when SharedContext is already loaded (e.g. Orchestrator.route).
 
@@ -1542,6 +1909,7 @@ class ConversationAgent:
             shared_context=context,
             conversation_history=conversation_history,
             channel=channel,
+            on_text=on_text,
         )
 
     async def generate_first_message(self, context: SharedContext) -> str:
@@ -1759,7 +2127,7 @@ class ConversationAgent:
                 messages=messages,
             )
         except Exception as exc:
-            logger.error("Claude API error in onboarding: %s", exc)
+            _log_claude_error("onboarding", exc)
             return {
                 "message": "I'm having trouble right now. Please try again.",
                 "completed": False,
@@ -2010,11 +2378,9 @@ class ConversationAgent:
             (getattr(shared_ctx, "ai_name", None) or getattr(shared_ctx, "apex_name", None) or "Apex").strip()
             or "Apex"
         )
-        system_prompt = build_system_prompt(shared_ctx, ch)
-        if ch == "whatsapp":
-            system_prompt = _whatsapp_capabilities_preamble(companion_name) + system_prompt
-        system_prompt = system_prompt + _format_instruction_for_channel(ch)
-        system_prompt = system_prompt + _action_tags_instruction()
+        system_prompt = _compose_channel_system_prompt(
+            build_system_prompt(shared_ctx, ch), ch, companion_name
+        )
 
         # Performance injection unchanged
         if context == AI_PERFORMANCE:
@@ -2047,7 +2413,7 @@ class ConversationAgent:
             )
 
         # Build Claude messages
-        history = conversation_history or []
+        history = _trim_history_to_budget(system_prompt, conversation_history or [], message)
         messages = [*history, {"role": "user", "content": message}]
 
         max_out = 600 if ch in ("whatsapp", "telegram") else _MAX_TOKENS
@@ -2061,7 +2427,7 @@ class ConversationAgent:
             )
             response_text = claude_response.content[0].text.strip()
         except Exception as exc:
-            logger.error("Claude API error in respond_with_context: %s", exc)
+            _log_claude_error("respond_with_context", exc)
             r = self._fallback_response(message, reason=str(exc))
             r.update({"context_used": context_used, "suggested_actions": None, "market_data_freshness": None})
             return r
@@ -2113,7 +2479,7 @@ class ConversationAgent:
             "sentiment": sentiment,
             "user_ai_name": ai_name,
             "conversation_id": getattr(conv, "id", None),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.now(_UTC),
             # existing field (kept)
             "data_freshness": market_context.get("timestamp") if isinstance(market_context, dict) else None,
             # new fields
@@ -2143,7 +2509,7 @@ class ConversationAgent:
             "sentiment": analyze_sentiment(user_message),
             "user_ai_name": "Apex",
             "conversation_id": None,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.now(_UTC),
             "data_freshness": None,
             "error": reason,
         }
@@ -11,15 +11,20 @@ The TradingAgent ties together:
 """
 
 import asyncio
+import functools
+import hashlib
 import json
 import logging
-from datetime import datetime, timedelta, timezone
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from types import MappingProxyType
 from typing import Any
 
 import anthropic
 import httpx
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
@@ -61,6 +66,209 @@ logger = logging.getLogger(__name__)
 _CLAUDE_MODEL = "claude-sonnet-4-20250514"
 _CLAUDE_MODEL_FAST = settings.anthropic_model_fast  # translations / summaries only; env-overridable
 
+# One Anthropic client for every TradingAgent, so all users' decision calls
+# share a single connection pool to api.anthropic.com. Created on first use.
+_claude_client: anthropic.AsyncAnthropic | None = None
+
+
+def _get_claude_client() -> anthropic.AsyncAnthropic:
+    global _claude_client
+    if _claude_client is None:
+        _claude_client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            max_retries=2,
+            timeout=30.0,
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            ),
+        )
+    return _claude_client
+
+
+# Learning Hub output writes run in the background; the set holds strong
+# refs until they finish. Past the cap the write is awaited inline, which
+# applies backpressure instead of piling up pending inserts.
+_MAX_PENDING_OUTPUT_WRITES = 256
+_PENDING_OUTPUT_WRITES: set[asyncio.Task] = set()
+
+
+def _on_output_write_done(task: asyncio.Task) -> None:
+    _PENDING_OUTPUT_WRITES.discard(task)
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("Background record_agent_output failed: %s", exc)
+
+
+async def _record_agent_output_nowait(**kwargs: Any) -> None:
+    """Schedule ``record_agent_output(**kwargs)`` without waiting on the insert."""
+    if len(_PENDING_OUTPUT_WRITES) >= _MAX_PENDING_OUTPUT_WRITES:
+        await record_agent_output(**kwargs)
+        return
+    task = asyncio.create_task(record_agent_output(**kwargs))
+    _PENDING_OUTPUT_WRITES.add(task)
+    task.add_done_callback(_on_output_write_done)
+
+
+# ─────────────────────────────────────────────
+# Exchange client pool
+# ─────────────────────────────────────────────
+# Clients are reused across cycles so each call skips the TLS handshake and
+# pool warm-up. Keyed by a digest of the credentials, so a rotated key maps
+# to a fresh client and plaintext never sits in the key. Past the cap the
+# least-recently-used client is evicted; a concurrent cycle may still hold
+# it mid-order, so it is closed only after a grace period longer than any
+# cycle keeps a client.
+_CLIENT_POOL_MAX = 256
+_CLIENT_POOL: OrderedDict[tuple[str, bool, str], Any] = OrderedDict()
+_EVICTED_CLIENT_CLOSE_DELAY = 300.0
+_PENDING_CLIENT_CLOSES: set[asyncio.Task] = set()
+
+
+async def _close_evicted_client(client: Any) -> None:
+    try:
+        await asyncio.sleep(_EVICTED_CLIENT_CLOSE_DELAY)
+    finally:
+        try:
+            await client.aclose()
+        except Exception as exc:
+            logger.debug("Evicted exchange client close failed: %s", exc)
+
+
+def _pooled_exchange_client(
+    exchange_name: str, raw_key: str, raw_secret: str, is_paper: bool
+) -> Any:
+    """Return the shared exchange client for these credentials, creating it once."""
+    digest = hashlib.blake2b(
+        f"{raw_key}\0{raw_secret}".encode(), digest_size=16
+    ).hexdigest()
+    pool_key = (exchange_name, is_paper, digest)
+    client = _CLIENT_POOL.get(pool_key)
+    if client is not None:
+        _CLIENT_POOL.move_to_end(pool_key)
+        return client
+    if len(_CLIENT_POOL) >= _CLIENT_POOL_MAX:
+        _, evicted = _CLIENT_POOL.popitem(last=False)
+        task = asyncio.create_task(_close_evicted_client(evicted))
+        _PENDING_CLIENT_CLOSES.add(task)
+        task.add_done_callback(_PENDING_CLIENT_CLOSES.discard)
+    client = get_exchange_client(exchange_name, raw_key, raw_secret, is_paper=is_paper)
+    _CLIENT_POOL[pool_key] = client
+    return client
+
+
+async def close_pooled_exchange_clients() -> None:
+    """Close every pooled exchange client — call once on app shutdown."""
+    clients = list(_CLIENT_POOL.values())
+    _CLIENT_POOL.clear()
+    # Cancelling skips the grace period; each task still closes its client.
+    pending = list(_PENDING_CLIENT_CLOSES)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(
+        *(c.aclose() for c in clients), *pending, return_exceptions=True
+    )
+
+
+# ─────────────────────────────────────────────
+# Hot-path statements (built once, bound per call)
+# ─────────────────────────────────────────────
+# Module-level selects with bindparams: no per-call construction, and a
+# stable cache key for SQLAlchemy's compiled-statement cache.
+
+# Last 50 closed trades on a symbol, aggregated in SQL to a single row:
+# (count, wins, avg profit% of wins, avg profit% of losses).
+_recent_closed = (
+    select(Trade.profit, Trade.loss, Trade.profit_percent)
+    .where(
+        Trade.user_id == bindparam("uid"),
+        Trade.symbol == bindparam("sym"),
+        Trade.status == "closed",
+    )
+    .order_by(Trade.closed_at.desc())
+    .limit(50)
+    .subquery("recent_closed")
+)
+_recent_pct = func.coalesce(_recent_closed.c.profit_percent, 0.0)
+
+_USER_HISTORY_STMT = select(
+    func.count(),
+    func.sum(case((_recent_closed.c.profit > 0, 1), else_=0)),
+    func.avg(case((_recent_closed.c.profit > 0, _recent_pct))),
+    func.avg(case((_recent_closed.c.loss > 0, _recent_pct))),
+).select_from(_recent_closed)
+
+_OPEN_COUNT_STMT = select(func.count()).where(
+    Trade.user_id == bindparam("uid"),
+    Trade.status == "open",
+)
+
+# History aggregate + open-trade count in one round-trip (cycle preamble).
+_USER_CONTEXT_STMT = _USER_HISTORY_STMT.add_columns(_OPEN_COUNT_STMT.scalar_subquery())
+
+_DAILY_LOSS_STMT = select(func.sum(Trade.loss)).where(
+    Trade.user_id == bindparam("uid"),
+    Trade.closed_at >= bindparam("since"),
+    Trade.status == "closed",
+)
+
+# Key and user lookups fetch plain Rows with just the columns the agent
+# reads — no ORM hydration or identity-map bookkeeping.
+_KEY_COLUMNS = (
+    ExchangeAPIKey.exchange,
+    ExchangeAPIKey.is_paper,
+    ExchangeAPIKey.trading_account_id,
+    ExchangeAPIKey.encrypted_api_key,
+    ExchangeAPIKey.encrypted_api_secret,
+)
+
+_ACTIVE_API_KEY_STMT = select(*_KEY_COLUMNS).where(
+    ExchangeAPIKey.user_id == bindparam("uid"),
+    ExchangeAPIKey.exchange == bindparam("exchange"),
+    ExchangeAPIKey.is_active == True,  # noqa: E712
+)
+
+_USER_BY_ID_STMT = select(User.id, User.is_active, User.ai_name).where(
+    User.id == bindparam("uid")
+)
+
+# Today's realised loss per user, keyed by (user_id, UTC date). Seeded from
+# _DAILY_LOSS_STMT on a miss, bumped in-process when a trade closes at a
+# loss, and re-read after the TTL so closes made by other workers count.
+DAILY_LOSS_CACHE_TTL_SECONDS = 300
+_daily_loss_cache: dict[tuple[str, date], tuple[float, datetime]] = {}
+
+
+def record_realised_loss(user_id: str, loss: float) -> None:
+    """Add a just-closed losing trade to the user's cached loss for today."""
+    key = (user_id, datetime.now(timezone.utc).date())
+    cached = _daily_loss_cache.get(key)
+    if cached is not None:
+        _daily_loss_cache[key] = (cached[0] + abs(loss), cached[1])
+
+
+def _settle_trade(trade: Trade, exit_price: float) -> tuple[float, float]:
+    """Mark ``trade`` closed at ``exit_price`` and record its P&L.
+
+    Returns ``(pnl, pnl_pct)``; profit or loss is written, never both.
+    """
+    sign = 1 if trade.side == "BUY" else -1
+    delta = exit_price - trade.entry_price
+    pnl = sign * delta * trade.quantity
+    pnl_pct = sign * delta / trade.entry_price * 100
+
+    trade.exit_price = exit_price
+    trade.status = "closed"
+    trade.closed_at = datetime.now(timezone.utc)
+    trade.profit_percent = round(pnl_pct, 4)
+    if pnl < 0:
+        trade.loss = round(-pnl, 2)
+    else:
+        trade.profit = round(pnl, 2)
+    return pnl, pnl_pct
+
+
 # ─────────────────────────────────────────────
 # Trader-class trade-size limits (in GBP/USD)
 # ─────────────────────────────────────────────
@@ -164,18 +372,75 @@ RULES YOU MUST FOLLOW:
 5. When in doubt, output WAIT — preserving capital is always valid.
 6. Be concise and logical. No speculation — only data-driven decisions.
 {learning_context}
-RESPONSE FORMAT (strict JSON, no markdown, no extra text):
-{{
-  "decision": "BUY" | "SELL" | "WAIT",
-  "confidence": <integer 0-100>,
-  "entry_price": <float>,
-  "stop_loss": <float>,
-  "take_profit": <float>,
-  "position_size_pct": <float, max 2.0>,
-  "reasoning": "<1-2 sentences explaining the decision>"
-}}
+Market data arrives as JSON: prices in USD, "sr" holds support/pivot/resistance
+levels and "history" summarises the user's last 50 trades on the symbol.
+Submit your decision by calling the submit_trade_decision tool. Keep the
+reasoning to 1-2 sentences.
 """
 
+# Forcing this tool makes Claude emit the decision as schema-checked JSON in
+# a tool_use block, so there is no prose to strip or JSON to re-parse.
+_DECISION_TOOL_NAME = "submit_trade_decision"
+_DECISION_TOOLS = [
+    {
+        "name": _DECISION_TOOL_NAME,
+        "description": "Submit the trading decision for the analysed symbol.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "decision": {"type": "string", "enum": ["BUY", "SELL", "WAIT"]},
+                "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
+                "entry_price": {"type": "number"},
+                "stop_loss": {"type": "number"},
+                "take_profit": {"type": "number"},
+                "position_size_pct": {"type": "number", "minimum": 0, "maximum": 2.0},
+                "reasoning": {"type": "string"},
+            },
+            "required": [
+                "decision",
+                "confidence",
+                "entry_price",
+                "stop_loss",
+                "take_profit",
+                "position_size_pct",
+                "reasoning",
+            ],
+        },
+    }
+]
+_DECISION_TOOL_CHOICE = {"type": "tool", "name": _DECISION_TOOL_NAME}
+
+# Sent with decision requests when settings.claude_latency_optimized is on.
+_LATENCY_OPTIMIZED_BODY = {"performance_config": {"latency": "optimized"}}
+
+# Request fields identical on every decision call, built once. Only system
+# (memoised per ai_name/learning_context) and the user message vary.
+_DECISION_REQUEST = {
+    "model": _CLAUDE_MODEL,
+    "max_tokens": 256,
+    "tools": _DECISION_TOOLS,
+    "tool_choice": _DECISION_TOOL_CHOICE,
+}
+
+@functools.lru_cache(maxsize=256)
+def _build_system_prompt(ai_name: str, learning_context: str) -> list[dict]:
+    """Formatted decision system prompt as an Anthropic prompt-cache block.
+
+    ``learning_context`` only changes when Learning Hub output does, so the
+    same bytes are reused across cycles. Callers must not mutate the result.
+    """
+    return [
+        {
+            "type": "text",
+            "text": _SYSTEM_PROMPT.format(
+                ai_name=ai_name,
+                learning_context=learning_context,
+            ),
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+
+
 _ANALYZE_SYSTEM_PROMPT = """\
 You are {ai_name}, a professional AI trading analyst.
 
@@ -214,41 +479,106 @@ RESPONSE FORMAT (strict JSON, no markdown):
 }}
 """
 
-_USER_PROMPT_TEMPLATE = """\
-CURRENT MARKET DATA FOR {symbol} on {exchange}:
 
-Price:          ${price:,.4f}
-24h High:       ${high_24h:,.4f}
-24h Low:        ${low_24h:,.4f}
-24h Volume:     ${volume:,.0f}
-24h Change:     {price_change_pct:+.2f}%
-Trend:          {trend}
+@functools.lru_cache(maxsize=64)
+def _render_learning_context(
+    high_confidence: tuple[str, ...],
+    avoid: tuple[str, ...],
+    directives: tuple[tuple[int, str], ...],
+) -> str:
+    """Learning Hub section of the decision system prompt.
 
-TECHNICAL INDICATORS:
-  RSI (14):     {rsi:.1f}
-  MACD Line:    {macd_line:.6f}
-  MACD Signal:  {macd_signal:.6f}
-  MACD Hist:    {macd_hist:.6f}
-  MA(20):       ${ma20:,.4f}
-  MA(50):       ${ma50:,.4f}
-  MA(200):      ${ma200:,.4f}
-
-SUPPORT / RESISTANCE:
-  Support:      ${support:,.4f}
-  Pivot:        ${pivot:,.4f}
-  Resistance:   ${resistance:,.4f}
-
-ACCOUNT:
-  Balance:      ${account_balance:,.2f} USD
-  Open Trades:  {open_trades_count}
-
-USER HISTORY (last 50 similar trades):
-  Win Rate:     {win_rate:.1f}%
-  Avg Profit:   {avg_profit:.2f}%
-  Avg Loss:     {avg_loss:.2f}%
-
-Provide your trading decision in the required JSON format.
-"""
+    Insights change once per learning cycle, so the rendered text is reused
+    across cycles. Returns "" when there is nothing to add.
+    """
+    parts: list[str] = []
+    if high_confidence:
+        parts.append(
+            "HIGH WIN-RATE SETUPS (prioritise these):\n"
+            + "\n".join(f"  - {s}" for s in high_confidence)
+        )
+    if avoid:
+        parts.append(
+            "SETUPS TO AVOID (lower win-rate historically):\n"
+            + "\n".join(f"  - {s}" for s in avoid)
+        )
+    if directives:
+        parts.append(
+            "LEARNING HUB DIRECTIVE:\n"
+            + "\n".join(f"  [{priority}] {text}" for priority, text in directives)
+        )
+    if not parts:
+        return ""
+    return "\nLEARNING INSIGHTS FROM PATTERN ANALYSIS:\n" + "\n".join(parts) + "\n"
+
+
+# Fixed fields of every WAIT decision; _wait_decision copies it and adds the
+# reason, so callers may still mutate what they get back.
+_WAIT_TEMPLATE = MappingProxyType({
+    "decision": "WAIT",
+    "confidence": 0,
+    "entry_price": 0.0,
+    "stop_loss": 0.0,
+    "take_profit": 0.0,
+    "position_size_pct": 0.0,
+})
+
+
+def _num(value: Any, ndigits: int = 4) -> float:
+    """Round a market-data field for the prompt; missing values become 0."""
+    return round(float(value or 0), ndigits)
+
+
+def _build_user_prompt(
+    market_data: dict,
+    user_history: dict,
+    account_balance: float,
+    open_trades_count: int,
+) -> str:
+    """Decision prompt as compact JSON — far fewer tokens than a labelled table.
+
+    ``settings.debug`` switches to indented output for readable logs.
+    """
+    indicators = market_data.get("indicators") or {}
+    macd = indicators.get("macd") or {}
+    sr = market_data.get("support_resistance") or {}
+    payload = {
+        "symbol": market_data.get("symbol", "UNKNOWN"),
+        "exchange": market_data.get("exchange", "unknown"),
+        "price": _num(market_data.get("price")),
+        "high_24h": _num(market_data.get("high_24h")),
+        "low_24h": _num(market_data.get("low_24h")),
+        "volume_24h": _num(market_data.get("volume"), 0),
+        "change_24h_pct": _num(market_data.get("price_change_pct"), 2),
+        "trend": market_data.get("trend", "unknown"),
+        "indicators": {
+            "rsi14": _num(indicators.get("rsi", 50), 1),
+            "macd": _num(macd.get("line"), 6),
+            "macd_signal": _num(macd.get("signal"), 6),
+            "macd_hist": _num(macd.get("histogram"), 6),
+            "ma20": _num(indicators.get("ma20")),
+            "ma50": _num(indicators.get("ma50")),
+            "ma200": _num(indicators.get("ma200")),
+        },
+        "sr": {
+            "support": _num(sr.get("support")),
+            "pivot": _num(sr.get("pivot")),
+            "resistance": _num(sr.get("resistance")),
+        },
+        "account": {
+            "balance_usd": _num(account_balance, 2),
+            "open_trades": open_trades_count,
+        },
+        # Last 50 closed trades on this symbol.
+        "history": {
+            "win_rate_pct": _num(user_history.get("win_rate", 50), 1),
+            "avg_profit_pct": _num(user_history.get("avg_profit"), 2),
+            "avg_loss_pct": _num(user_history.get("avg_loss"), 2),
+        },
+    }
+    if settings.debug:
+        return json.dumps(payload, indent=2)
+    return json.dumps(payload, separators=(",", ":"))
 
 
 class TradingAgent:
@@ -264,7 +594,7 @@ class TradingAgent:
 
     def __init__(self, user_id: str):
         self.user_id = user_id
-        self._claude = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+        self._claude = _get_claude_client()
 
     # ─────────────────────────────────────────────
     # Market Analysis
@@ -380,43 +710,40 @@ class TradingAgent:
     ) -> dict:
         """Return win-rate and avg P&L for the user's last 50 closed trades on this symbol."""
         result = await db.execute(
-            select(Trade)
-            .where(
-                Trade.user_id == self.user_id,
-                Trade.symbol == symbol,
-                Trade.status == "closed",
-            )
-            .order_by(Trade.closed_at.desc())
-            .limit(50)
+            _USER_HISTORY_STMT, {"uid": self.user_id, "sym": symbol}
         )
-        trades = result.scalars().all()
-
-        if not trades:
-            return {"win_rate": 50.0, "avg_profit": 0.0, "avg_loss": 0.0, "count": 0}
+        return self._history_from_aggregate(*result.one())
 
-        wins = [t for t in trades if (t.profit or 0) > 0]
-        losses = [t for t in trades if (t.loss or 0) > 0]
+    async def _get_user_context(
+        self, db: AsyncSession, symbol: str
+    ) -> tuple[dict, int]:
+        """Return ``(user_history, open_trade_count)`` in a single query."""
+        result = await db.execute(
+            _USER_CONTEXT_STMT, {"uid": self.user_id, "sym": symbol}
+        )
+        count, wins, avg_profit, avg_loss, open_count = result.one()
+        return (
+            self._history_from_aggregate(count, wins, avg_profit, avg_loss),
+            open_count or 0,
+        )
 
-        win_rate = len(wins) / len(trades) * 100 if trades else 50.0
-        avg_profit = (sum(t.profit_percent or 0 for t in wins) / len(wins)) if wins else 0.0
-        avg_loss = (sum(t.profit_percent or 0 for t in losses) / len(losses)) if losses else 0.0
+    @staticmethod
+    def _history_from_aggregate(
+        count: int | None,
+        wins: int | None,
+        avg_profit: float | None,
+        avg_loss: float | None,
+    ) -> dict:
+        if not count:
+            return {"win_rate": 50.0, "avg_profit": 0.0, "avg_loss": 0.0, "count": 0}
 
         return {
-            "win_rate": round(win_rate, 1),
-            "avg_profit": round(avg_profit, 2),
-            "avg_loss": round(avg_loss, 2),
-            "count": len(trades),
+            "win_rate": round((wins or 0) / count * 100, 1),
+            "avg_profit": round(float(avg_profit or 0.0), 2),
+            "avg_loss": round(float(avg_loss or 0.0), 2),
+            "count": count,
         }
 
-    async def _get_open_trade_count(self, db: AsyncSession) -> int:
-        result = await db.execute(
-            select(func.count()).where(
-                Trade.user_id == self.user_id,
-                Trade.status == "open",
-            )
-        )
-        return result.scalar() or 0
-
     # ─────────────────────────────────────────────
     # Claude Decision
     # ─────────────────────────────────────────────
@@ -447,34 +774,8 @@ class TradingAgent:
             logger.warning("Anthropic API key not set — returning WAIT decision")
             return self._wait_decision("Anthropic API key not configured")
 
-        indicators = market_data.get("indicators", {})
-        macd = indicators.get("macd", {})
-        sr = market_data.get("support_resistance", {})
-
-        prompt = _USER_PROMPT_TEMPLATE.format(
-            symbol=market_data.get("symbol", "UNKNOWN"),
-            exchange=market_data.get("exchange", "unknown"),
-            price=market_data.get("price", 0),
-            high_24h=market_data.get("high_24h", 0),
-            low_24h=market_data.get("low_24h", 0),
-            volume=market_data.get("volume", 0),
-            price_change_pct=market_data.get("price_change_pct", 0),
-            trend=market_data.get("trend", "unknown"),
-            rsi=indicators.get("rsi", 50),
-            macd_line=macd.get("line", 0),
-            macd_signal=macd.get("signal", 0),
-            macd_hist=macd.get("histogram", 0),
-            ma20=indicators.get("ma20", 0),
-            ma50=indicators.get("ma50", 0),
-            ma200=indicators.get("ma200", 0),
-            support=sr.get("support", 0),
-            pivot=sr.get("pivot", 0),
-            resistance=sr.get("resistance", 0),
-            account_balance=account_balance,
-            open_trades_count=open_trades_count,
-            win_rate=user_history.get("win_rate", 50),
-            avg_profit=user_history.get("avg_profit", 0),
-            avg_loss=user_history.get("avg_loss", 0),
+        prompt = _build_user_prompt(
+            market_data, user_history, account_balance, open_trades_count
         )
 
         import time as _time
@@ -486,22 +787,35 @@ class TradingAgent:
         raw = ""
         try:
             response = await self._claude.messages.create(
-                model=_model,
-                max_tokens=512,
-                system=_SYSTEM_PROMPT.format(
-                    ai_name=ai_name,
-                    learning_context=learning_context,
-                ),
+                **_DECISION_REQUEST,
+                system=_build_system_prompt(ai_name, learning_context),
                 messages=[{"role": "user", "content": prompt}],
+                extra_body=(
+                    _LATENCY_OPTIMIZED_BODY
+                    if settings.claude_latency_optimized
+                    else None
+                ),
             )
-            raw = response.content[0].text.strip()
             # Capture Anthropic usage for telemetry.
             _usage = getattr(response, "usage", None)
             if _usage is not None:
                 _tokens_in = int(getattr(_usage, "input_tokens", 0) or 0)
                 _tokens_out = int(getattr(_usage, "output_tokens", 0) or 0)
                 _cached = int(getattr(_usage, "cache_read_input_tokens", 0) or 0)
-            decision = parse_claude_json(raw, context="trade decision")
+            decision = next(
+                (
+                    dict(block.input)
+                    for block in response.content
+                    if getattr(block, "type", None) == "tool_use"
+                ),
+                None,
+            )
+            if decision is None:
+                # Tool use was forced, but fall back to text if it is missing.
+                raw = "".join(
+                    getattr(block, "text", "") for block in response.content
+                ).strip()
+                decision = parse_claude_json(raw, context="trade decision")
             logger.info(
                 "Claude decision: %s (confidence=%s) for %s",
                 decision.get("decision"),
@@ -638,32 +952,25 @@ class TradingAgent:
 
         try:
             async with AsyncSessionLocal() as db:
-                user_result = await db.execute(select(User).where(User.id == self.user_id))
-                user = user_result.scalar_one_or_none()
+                user_result = await db.execute(_USER_BY_ID_STMT, {"uid": self.user_id})
+                user = user_result.one_or_none()
                 ai_name = user.ai_name if user and user.ai_name else "Claude"
 
-                user_history = await self._get_user_history(db, asset)
-                open_count = await self._get_open_trade_count(db)
+                user_history, open_count = await self._get_user_context(db, asset)
 
                 key_result = await db.execute(
-                    select(ExchangeAPIKey).where(
-                        ExchangeAPIKey.user_id == self.user_id,
-                        ExchangeAPIKey.exchange == exchange_name,
-                        ExchangeAPIKey.is_active == True,  # noqa: E712
-                    )
+                    _ACTIVE_API_KEY_STMT,
+                    {"uid": self.user_id, "exchange": exchange_name},
                 )
-                key_row = key_result.scalar_one_or_none()
+                key_row = key_result.one_or_none()
                 if key_row:
                     is_paper = getattr(key_row, "is_paper", True)
                     raw_key, raw_secret = decrypt_api_key(
                         key_row.encrypted_api_key, key_row.encrypted_api_secret
                     )
-                    client = get_exchange_client(exchange_name, raw_key, raw_secret, is_paper=is_paper)
+                    client = _pooled_exchange_client(exchange_name, raw_key, raw_secret, is_paper)
                     raw_key = raw_secret = None
-                    try:
-                        account_balance = await client.get_account_balance()
-                    finally:
-                        await client.aclose()
+                    account_balance = await client.get_account_balance()
         except Exception as exc:
             raw_key = raw_secret = None
             logger.warning("decide_with_context: balance/history load failed: %s", exc)
@@ -704,15 +1011,7 @@ class TradingAgent:
 
     @staticmethod
     def _wait_decision(reason: str) -> dict:
-        return {
-            "decision": "WAIT",
-            "confidence": 0,
-            "entry_price": 0.0,
-            "stop_loss": 0.0,
-            "take_profit": 0.0,
-            "position_size_pct": 0.0,
-            "reasoning": reason,
-        }
+        return {**_WAIT_TEMPLATE, "reasoning": reason}
 
     # ─────────────────────────────────────────────
     # Personalized Analysis (Context-Aware)
@@ -1085,7 +1384,7 @@ Provide your detailed technical analysis with the specified JSON format."""
     # Personalisation
     # ─────────────────────────────────────────────
 
-    async def personalize_decision(
+    def personalize_decision(
         self,
         decision: dict,
         user_history: dict,
@@ -1093,6 +1392,8 @@ Provide your detailed technical analysis with the specified JSON format."""
     ) -> dict:
         """Adjust position size from user history + learning hub insights.
 
+        Pure computation, so it is a plain method rather than a coroutine.
+
         User history rules:
           - Win rate > 65 % → +10 % size (capped at 2 %)
           - Win rate < 40 % → -25 % size
@@ -1105,24 +1406,25 @@ Provide your detailed technical analysis with the specified JSON format."""
             return decision
 
         win_rate = user_history.get("win_rate", 50)
+        enough_history = user_history.get("count", 0) >= 10
         size = decision.get("position_size_pct", 1.0)
 
         # ── User history personalisation ──────────────────────────────────
-        if win_rate > 65 and user_history.get("count", 0) >= 10:
+        if enough_history and win_rate > 65:
             size = min(size * 1.10, 2.0)
             logger.debug("Personalisation: +10%% size (win_rate=%.1f%%)", win_rate)
-        elif win_rate < 40 and user_history.get("count", 0) >= 10:
+        elif enough_history and win_rate < 40:
             size = size * 0.75
             logger.debug("Personalisation: -25%% size (win_rate=%.1f%%)", win_rate)
 
         # ── Learning hub insights ─────────────────────────────────────────
         if insights and insights.get("has_insights"):
             trend = decision.get("market_trend", "")
+            trend_lower = trend.lower()
             avoid = insights.get("avoid_condition")
             focus = insights.get("focus_condition")
-            modifier = insights.get("position_size_modifier", 1.0)
 
-            if avoid and trend and avoid.lower() in trend.lower():
+            if avoid and trend and avoid.lower() in trend_lower:
                 logger.info(
                     "LearningHub: skipping trade — avoid_condition '%s' matches trend '%s'",
                     avoid, trend,
@@ -1134,7 +1436,8 @@ Provide your detailed technical analysis with the specified JSON format."""
                 )
                 return decision
 
-            if focus and trend and focus.lower() in trend.lower():
+            if focus and trend and focus.lower() in trend_lower:
+                modifier = insights.get("position_size_modifier", 1.0)
                 size = min(size * modifier, 2.0)
                 logger.info(
                     "LearningHub: boosting size ×%.2f for focus condition '%s'",
@@ -1162,9 +1465,29 @@ Provide your detailed technical analysis with the specified JSON format."""
     ) -> dict:
         """Enforce hard risk limits before any order is placed.
 
+        Runs the pure checks first and only queries today's losses when they
+        pass.
+
         Returns:
             {"allowed": True} or {"allowed": False, "reason": "..."}
         """
+        guard = self._safety_checks_sync(
+            decision, account_balance, user_settings, is_paper=is_paper
+        )
+        if not guard["allowed"]:
+            return guard
+        daily_loss = await self._daily_loss_today(db)
+        return self._daily_loss_guard(daily_loss, account_balance, user_settings)
+
+    @staticmethod
+    def _safety_checks_sync(
+        decision: dict,
+        account_balance: float,
+        user_settings: UserSettings,
+        *,
+        is_paper: bool | None = None,
+    ) -> dict:
+        """The safety checks that need no I/O (everything but daily loss)."""
         if decision.get("decision") == "WAIT":
             return {"allowed": False, "reason": "Decision is WAIT"}
 
@@ -1193,29 +1516,51 @@ Provide your detailed technical analysis with the specified JSON format."""
         if position_usd < 1.0:
             return {"allowed": False, "reason": "Insufficient balance for minimum trade size"}
 
-        # 5. Max daily loss check
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        # 5. Max position size from user settings
+        max_pos_pct = user_settings.max_position_size or 2.0
+        if decision["position_size_pct"] > max_pos_pct:
+            decision["position_size_pct"] = max_pos_pct
+
+        return {"allowed": True}
+
+    async def _daily_loss_today(self, db: AsyncSession) -> float:
+        """Sum of losses on trades this user closed since 00:00 UTC.
+
+        Served from ``_daily_loss_cache`` when fresh; the SQL aggregate runs
+        at most once per user per TTL.
+        """
+        now = datetime.now(timezone.utc)
+        key = (self.user_id, now.date())
+        cached = _daily_loss_cache.get(key)
+        if cached and (now - cached[1]).total_seconds() < DAILY_LOSS_CACHE_TTL_SECONDS:
+            return cached[0]
+
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         result = await db.execute(
-            select(func.sum(Trade.loss)).where(
-                Trade.user_id == self.user_id,
-                Trade.closed_at >= today_start,
-                Trade.status == "closed",
-            )
+            _DAILY_LOSS_STMT, {"uid": self.user_id, "since": today_start}
         )
         daily_loss = abs(result.scalar() or 0)
-        max_daily_loss_usd = account_balance * ((user_settings.max_daily_loss or 5.0) / 100)
+        for stale in [k for k in _daily_loss_cache if k[1] != key[1]]:
+            del _daily_loss_cache[stale]
+        _daily_loss_cache[key] = (daily_loss, now)
+        return daily_loss
 
+    async def _load_daily_loss_today(self) -> float:
+        """``_daily_loss_today`` on its own session, for use in a task."""
+        async with AsyncSessionLocal() as db:
+            return await self._daily_loss_today(db)
+
+    @staticmethod
+    def _daily_loss_guard(
+        daily_loss: float, account_balance: float, user_settings: UserSettings
+    ) -> dict:
+        """6. Max daily loss check."""
+        max_daily_loss_usd = account_balance * ((user_settings.max_daily_loss or 5.0) / 100)
         if daily_loss >= max_daily_loss_usd:
             return {
                 "allowed": False,
                 "reason": f"Daily loss limit reached (${daily_loss:.2f} / ${max_daily_loss_usd:.2f})",
             }
-
-        # 6. Max position size from user settings
-        max_pos_pct = user_settings.max_position_size or 2.0
-        if decision["position_size_pct"] > max_pos_pct:
-            decision["position_size_pct"] = max_pos_pct
-
         return {"allowed": True}
 
     # ─────────────────────────────────────────────
@@ -1245,11 +1590,10 @@ Provide your detailed technical analysis with the specified JSON format."""
             return {"status": "rejected", "reason": str(exc)}
 
         raw_key = raw_secret = None
-        client = None
         try:
             async with AsyncSessionLocal() as db:
-                user_result = await db.execute(select(User).where(User.id == self.user_id))
-                user = user_result.scalar_one_or_none()
+                user_result = await db.execute(_USER_BY_ID_STMT, {"uid": self.user_id})
+                user = user_result.one_or_none()
                 if not user or not user.is_active:
                     return {"status": "rejected", "reason": "User not found or inactive"}
 
@@ -1303,8 +1647,8 @@ Provide your detailed technical analysis with the specified JSON format."""
                 elif is_paper is not None:
                     key_filters.append(ExchangeAPIKey.is_paper == is_paper)
 
-                key_result = await db.execute(select(ExchangeAPIKey).where(*key_filters))
-                api_key_row = key_result.scalars().first()
+                key_result = await db.execute(select(*_KEY_COLUMNS).where(*key_filters))
+                api_key_row = key_result.first()
                 if not api_key_row:
                     logger.warning(
                         "No active %s API key for user %s — cannot execute trade",
@@ -1322,17 +1666,27 @@ Provide your detailed technical analysis with the specified JSON format."""
                     logger.error("Failed to decrypt API key for user %s: %s", self.user_id, exc)
                     return {"status": "rejected", "reason": "Could not decrypt exchange API key"}
 
-                client = get_exchange_client(exchange_name, raw_key, raw_secret, is_paper=is_paper)
+                client = _pooled_exchange_client(exchange_name, raw_key, raw_secret, is_paper)
                 raw_key = raw_secret = None  # wipe decrypted keys immediately
 
+                # Today's losses load on a separate session while the
+                # balance comes back from the exchange.
+                daily_loss_task = asyncio.create_task(self._load_daily_loss_today())
                 try:
                     account_balance = await client.get_account_balance()
                 except Exception as exc:
+                    daily_loss_task.cancel()
                     return {"status": "rejected", "reason": f"Exchange balance fetch failed: {exc}"}
 
-                guard = await self._safety_checks(
-                    decision, account_balance, user_settings, db, is_paper=is_paper
+                guard = self._safety_checks_sync(
+                    decision, account_balance, user_settings, is_paper=is_paper
                 )
+                if guard["allowed"]:
+                    guard = self._daily_loss_guard(
+                        await daily_loss_task, account_balance, user_settings
+                    )
+                else:
+                    daily_loss_task.cancel()
                 if not guard["allowed"]:
                     logger.info("Trade rejected for user %s: %s", self.user_id, guard["reason"])
                     return {"status": "rejected", "reason": guard["reason"]}
@@ -1367,7 +1721,7 @@ Provide your detailed technical analysis with the specified JSON format."""
                         "reason": "eToro trade execution pending — read-only for now",
                     }
 
-                start_time = datetime.now(timezone.utc)
+                start_ns = time.perf_counter_ns()
                 try:
                     order_id = await client.place_order(
                         symbol=symbol,
@@ -1379,10 +1733,11 @@ Provide your detailed technical analysis with the specified JSON format."""
                     logger.error("Order placement failed: %s", exc)
                     return {"status": "rejected", "reason": f"Order placement failed: {exc}"}
 
-                execution_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+                execution_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
-                await client.set_stop_loss(symbol, order_id, decision["stop_loss"])
-                await client.set_take_profit(symbol, order_id, decision["take_profit"])
+                await client.place_bracket(
+                    symbol, order_id, decision["stop_loss"], decision["take_profit"]
+                )
 
                 trade = Trade(
                     user_id=self.user_id,
@@ -1410,8 +1765,6 @@ Provide your detailed technical analysis with the specified JSON format."""
 
         finally:
             raw_key = raw_secret = None
-            if client:
-                await client.aclose()
 
         logger.info(
             "%s executed %s %s @ %.4f (trade_id=%s)",
@@ -1552,91 +1905,42 @@ Provide your detailed technical analysis with the specified JSON format."""
             is_paper=False,
         )
 
-    # ─────────────────────────────────────────────
-    # Full Cycle (analyze → decide → execute)
-    # ─────────────────────────────────────────────
+    async def _fetch_balance(
+        self, exchange_name: str, raw_key: str, raw_secret: str, is_paper: bool
+    ) -> float:
+        """Return the account balance via the pooled exchange client."""
+        client = _pooled_exchange_client(exchange_name, raw_key, raw_secret, is_paper)
+        raw_key = raw_secret = None  # wipe from memory immediately
+        return await client.get_account_balance()
 
-    async def run_cycle(
+    async def _prepare_cycle_inputs(
         self,
         symbol: str,
         exchange_name: str,
-        orchestrator_context: str = "",
-        trading_account_id: str | None = None,
-        is_paper: bool | None = None,
+        trading_account_id: str | None,
     ) -> dict:
-        """Run a complete analysis → decision → execution cycle.
-
-        Enhanced with Learning Hub insights:
-          1. Fetch active hub insights + instructions before analysis
-          2. Inject learning context into Claude's system prompt
-          3. Apply hub-guided position sizing / condition filters
-          4. Log the outcome back to hub via record_agent_output()
+        """Steps 1–2 of run_cycle: user/key lookup, then balance + market data.
 
-        Args:
-            symbol: Ticker symbol (e.g. BTCUSDT, AAPL).
-            exchange_name: Exchange name (binance, alpaca, oanda).
-            orchestrator_context: Optional extra context from MasterOrchestrator
-                (shared memory learnings, similar past outcomes). Appended to
-                learning_context when provided.
+        The balance fetch and the market analysis are independent network calls,
+        so they run concurrently. Returns the inputs for the Claude decision, or
+        a terminal ``{"status": ...}`` result when the cycle cannot proceed.
         """
-        # ── Step 0: Fetch learning hub insights (non-blocking fallback) ───
-        try:
-            insights = await get_trading_insights()
-            instructions = await get_active_instructions("trading")
-        except Exception as exc:
-            logger.warning("LearningHub insights unavailable: %s", exc)
-            insights = {"has_insights": False}
-            instructions = []
-
-        # Build learning context string to inject into system prompt
-        learning_context = ""
-        if insights.get("has_insights"):
-            parts: list[str] = []
-            if insights.get("high_confidence_setups"):
-                parts.append(
-                    "HIGH WIN-RATE SETUPS (prioritise these):\n"
-                    + "\n".join(f"  - {s}" for s in insights["high_confidence_setups"])
-                )
-            if insights.get("avoid_setups"):
-                parts.append(
-                    "SETUPS TO AVOID (lower win-rate historically):\n"
-                    + "\n".join(f"  - {s}" for s in insights["avoid_setups"])
-                )
-            if instructions:
-                parts.append(
-                    "LEARNING HUB DIRECTIVE:\n"
-                    + "\n".join(f"  [{i['priority']}] {i['instruction']}" for i in instructions)
-                )
-            if parts:
-                learning_context = (
-                    "\nLEARNING INSIGHTS FROM PATTERN ANALYSIS:\n"
-                    + "\n".join(parts)
-                    + "\n"
-                )
-
-        if orchestrator_context:
-            learning_context += "\n" + orchestrator_context
-
         # ── Step 1: Load user + exchange keys ─────────────────────────────
         raw_key = raw_secret = None
         market_context_for_analysis: MarketContext | None = None
         try:
             async with AsyncSessionLocal() as db:
-                user_result = await db.execute(select(User).where(User.id == self.user_id))
-                user = user_result.scalar_one_or_none()
+                user_result = await db.execute(_USER_BY_ID_STMT, {"uid": self.user_id})
+                user = user_result.one_or_none()
                 ai_name = user.ai_name if user else "Claude"
 
-                user_history = await self._get_user_history(db, symbol)
-                open_count   = await self._get_open_trade_count(db)
+                user_history, open_count = await self._get_user_context(db, symbol)
 
                 key_result = await db.execute(
-                    select(ExchangeAPIKey).where(
-                        ExchangeAPIKey.user_id == self.user_id,
-                        ExchangeAPIKey.exchange == exchange_name,
-                        ExchangeAPIKey.is_active == True,  # noqa: E712
-                    )
+                    _ACTIVE_API_KEY_STMT,
+                    {"uid": self.user_id, "exchange": exchange_name},
                 )
-                key_row = key_result.scalar_one_or_none()
+                key_row = key_result.one_or_none()
                 if not key_row:
                     logger.warning(
                         "No %s API key for user %s — skipping trading cycle",
@@ -1661,25 +1965,33 @@ Provide your detailed technical analysis with the specified JSON format."""
                             exc,
                         )
 
-            client = get_exchange_client(exchange_name, raw_key, raw_secret, is_paper=is_paper)
+            balance_task = asyncio.create_task(
+                self._fetch_balance(exchange_name, raw_key, raw_secret, is_paper)
+            )
             raw_key = raw_secret = None  # wipe from memory immediately
-
-            try:
-                account_balance = await client.get_account_balance()
-            finally:
-                await client.aclose()
-
         except Exception as exc:
             raw_key = raw_secret = None
             logger.error("run_cycle key/balance phase failed for user %s: %s", self.user_id, exc)
             return {"status": "error", "reason": str(exc)}
 
-        # ── Step 2: Market analysis ───────────────────────────────────────
-        market_data = await self.analyze_market(
-            symbol,
-            market_context=market_context_for_analysis,
-            exchange=exchange_name,
+        # ── Step 2: Market analysis (concurrent with the balance fetch) ───
+        balance_result, market_data = await asyncio.gather(
+            balance_task,
+            self.analyze_market(
+                symbol,
+                market_context=market_context_for_analysis,
+                exchange=exchange_name,
+            ),
+            return_exceptions=True,
         )
+        if isinstance(balance_result, BaseException):
+            logger.error(
+                "run_cycle key/balance phase failed for user %s: %s", self.user_id, balance_result
+            )
+            return {"status": "error", "reason": str(balance_result)}
+        if isinstance(market_data, BaseException):
+            # analyze_market never raises; treat anything unexpected as no data.
+            market_data = None
         if market_data is None:
             logger.warning(f"run_cycle aborting — no market data for {symbol}")
             return {
@@ -1690,6 +2002,87 @@ Provide your detailed technical analysis with the specified JSON format."""
             }
         market_data["exchange"] = exchange_name
 
+        return {
+            "ai_name": ai_name,
+            "user_history": user_history,
+            "open_count": open_count,
+            "is_paper": is_paper,
+            "account_balance": balance_result,
+            "market_data": market_data,
+        }
+
+    # ─────────────────────────────────────────────
+    # Full Cycle (analyze → decide → execute)
+    # ─────────────────────────────────────────────
+
+    async def run_cycle(
+        self,
+        symbol: str,
+        exchange_name: str,
+        orchestrator_context: str = "",
+        trading_account_id: str | None = None,
+        is_paper: bool | None = None,
+    ) -> dict:
+        """Run a complete analysis → decision → execution cycle.
+
+        Enhanced with Learning Hub insights:
+          1. Fetch active hub insights + instructions before analysis
+          2. Inject learning context into Claude's system prompt
+          3. Apply hub-guided position sizing / condition filters
+          4. Log the outcome back to hub via record_agent_output()
+
+        Args:
+            symbol: Ticker symbol (e.g. BTCUSDT, AAPL).
+            exchange_name: Exchange name (binance, alpaca, oanda).
+            orchestrator_context: Optional extra context from MasterOrchestrator
+                (shared memory learnings, similar past outcomes). Appended to
+                learning_context when provided.
+        """
+        # ── Step 0: Fetch learning hub insights (non-blocking fallback) ───
+        # Runs concurrently with the key/balance/market phase below; awaited
+        # only once the Claude prompt is being built.
+        async def _load_hub() -> tuple[dict, list]:
+            try:
+                return (
+                    await get_trading_insights(),
+                    await get_active_instructions("trading"),
+                )
+            except Exception as exc:
+                logger.warning("LearningHub insights unavailable: %s", exc)
+                return {"has_insights": False}, []
+
+        hub_task = asyncio.create_task(_load_hub())
+        try:
+            prepared = await self._prepare_cycle_inputs(
+                symbol, exchange_name, trading_account_id
+            )
+        except BaseException:
+            hub_task.cancel()
+            raise
+        if "status" in prepared:
+            hub_task.cancel()
+            return prepared
+        ai_name = prepared["ai_name"]
+        user_history = prepared["user_history"]
+        open_count = prepared["open_count"]
+        is_paper = prepared["is_paper"]
+        account_balance = prepared["account_balance"]
+        market_data = prepared["market_data"]
+
+        insights, instructions = await hub_task
+
+        # Build learning context string to inject into system prompt
+        learning_context = ""
+        if insights.get("has_insights"):
+            learning_context = _render_learning_context(
+                tuple(insights.get("high_confidence_setups") or ()),
+                tuple(insights.get("avoid_setups") or ()),
+                tuple((i["priority"], i["instruction"]) for i in instructions),
+            )
+
+        if orchestrator_context:
+            learning_context += "\n" + orchestrator_context
+
         # ── Step 3: Claude decision (with learning context injected) ──────
         decision = await self.get_claude_decision(
             market_data, user_history, account_balance, open_count,
@@ -1700,10 +2093,10 @@ Provide your detailed technical analysis with the specified JSON format."""
         decision["market_trend"] = market_data.get("trend", "")
 
         # ── Step 4: Personalise + apply learning hub condition filters ────
-        decision = await self.personalize_decision(decision, user_history, insights)
+        decision = self.personalize_decision(decision, user_history, insights)
 
         if decision["decision"] == "WAIT":
-            await record_agent_output(
+            await _record_agent_output_nowait(
                 agent_name="trading",
                 output_type="trade",
                 content={"symbol": symbol, "decision": "WAIT", "reasoning": decision.get("reasoning", "")},
@@ -1744,7 +2137,7 @@ Provide your detailed technical analysis with the specified JSON format."""
         # ── Step 6: Log outcome to learning hub ──────────────────────────
         outcome = "success" if result.get("status") == "executed" else "failure"
         instr_id = instructions[0]["id"] if instructions else None
-        await record_agent_output(
+        await _record_agent_output_nowait(
             agent_name="trading",
             output_type="trade",
             content={
@@ -1774,7 +2167,6 @@ Provide your detailed technical analysis with the specified JSON format."""
         Per-user keys are decrypted, used, then wiped from memory.
         """
         raw_key = raw_secret = None
-        client = None
         try:
             async with AsyncSessionLocal() as db:
                 trade_result = await db.execute(
@@ -1789,7 +2181,7 @@ Provide your detailed technical analysis with the specified JSON format."""
                     return {"status": "error", "reason": "Trade not found or already closed"}
 
                 key_result = await db.execute(
-                    select(ExchangeAPIKey).where(
+                    select(*_KEY_COLUMNS).where(
                         ExchangeAPIKey.user_id == self.user_id,
                         ExchangeAPIKey.exchange == trade.exchange,
                         ExchangeAPIKey.is_active == True,  # noqa: E712
@@ -1805,7 +2197,7 @@ Provide your detailed technical analysis with the specified JSON format."""
                         ),
                     )
                 )
-                key_row = key_result.scalars().first()
+                key_row = key_result.first()
                 if not key_row:
                     logger.warning(
                         "No active %s API key for user %s — cannot close position %s",
@@ -1817,7 +2209,7 @@ Provide your detailed technical analysis with the specified JSON format."""
                 raw_key, raw_secret = decrypt_api_key(
                     key_row.encrypted_api_key, key_row.encrypted_api_secret
                 )
-                client = get_exchange_client(key_row.exchange, raw_key, raw_secret, is_paper=is_paper)
+                client = _pooled_exchange_client(key_row.exchange, raw_key, raw_secret, is_paper)
                 raw_key = raw_secret = None  # wipe immediately
 
                 # ── eToro write-path gate (MVP-B) ──────────────────────────
@@ -1842,31 +2234,14 @@ Provide your detailed technical analysis with the specified JSON format."""
                 except Exception as exc:
                     return {"status": "error", "reason": str(exc)}
 
-                if trade.side == "BUY":
-                    pnl = (current_price - trade.entry_price) * trade.quantity
-                else:
-                    pnl = (trade.entry_price - current_price) * trade.quantity
-
-                pnl_pct = ((current_price - trade.entry_price) / trade.entry_price) * 100
-                if trade.side == "SELL":
-                    pnl_pct = -pnl_pct
-
-                trade.exit_price = current_price
-                trade.status = "closed"
-                trade.closed_at = datetime.now(timezone.utc)
-                if pnl >= 0:
-                    trade.profit = round(pnl, 2)
-                    trade.profit_percent = round(pnl_pct, 4)
-                else:
-                    trade.loss = round(abs(pnl), 2)
-                    trade.profit_percent = round(pnl_pct, 4)
+                pnl, pnl_pct = _settle_trade(trade, current_price)
 
                 await db.commit()
+                if pnl < 0:
+                    record_realised_loss(self.user_id, trade.loss)
 
         finally:
             raw_key = raw_secret = None
-            if client:
-                await client.aclose()
 
         result = {
             "status": "closed",
@@ -1976,29 +2351,7 @@ Provide your detailed technical analysis with the specified JSON format."""
 
         Also marks user_settings.first_trade_done = True after first close.
         """
-        pnl = 0.0
-        pnl_pct = 0.0
-
-        if trade.side == "BUY":
-            pnl = (exit_price - trade.entry_price) * trade.quantity
-        else:  # SELL
-            pnl = (trade.entry_price - exit_price) * trade.quantity
-
-        pnl_pct = ((exit_price - trade.entry_price) / trade.entry_price) * 100
-        if trade.side == "SELL":
-            pnl_pct = -pnl_pct
-
-        # Update trade
-        trade.exit_price = exit_price
-        trade.status = "closed"
-        trade.closed_at = datetime.now(timezone.utc)
-
-        if pnl >= 0:
-            trade.profit = round(pnl, 2)
-            trade.profit_percent = round(pnl_pct, 4)
-        else:
-            trade.loss = round(abs(pnl), 2)
-            trade.profit_percent = round(pnl_pct, 4)
+        pnl, pnl_pct = _settle_trade(trade, exit_price)
 
         await db.flush()
 
@@ -2014,6 +2367,8 @@ Provide your detailed technical analysis with the specified JSON format."""
             await db.flush()
 
         await db.commit()
+        if pnl < 0:
+            record_realised_loss(trade.user_id, trade.loss)
 
         logger.info(
             f"Trade {trade.id} closed: {trade.symbol} P&L={pnl:.2f} ({pnl_pct:.2f}%)"
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 from src.agents.shared_memory import SharedContext
 
 UNITRADER_SYSTEM_PROMPT = """
@@ -168,6 +170,40 @@ That is {ai_name}. That is what you are.
 """
 
 
+@lru_cache(maxsize=4096)
+def _render_system_prompt(
+    *,
+    ai_name: str,
+    user_name: str,
+    trader_class: str,
+    trust_ladder_stage: int,
+    subscription_tier: str,
+    trading_paused: bool,
+    exchanges_block: str,
+    positions_block: str,
+    performance_block: str,
+    recent_trades_block: str,
+    situational_block: str,
+    channel: str,
+) -> str:
+    """Format the template; memoised because consecutive turns from the same
+    user usually produce identical inputs (and an identical prompt prefix)."""
+    return UNITRADER_SYSTEM_PROMPT.format(
+        ai_name=ai_name,
+        user_name=user_name,
+        trader_class=trader_class,
+        trust_ladder_stage=trust_ladder_stage,
+        subscription_tier=subscription_tier,
+        trading_paused=trading_paused,
+        exchanges_block=exchanges_block,
+        positions_block=positions_block,
+        performance_block=performance_block,
+        recent_trades_block=recent_trades_block,
+        situational_block=situational_block,
+        channel=channel,
+    )
+
+
 def build_system_prompt(context: SharedContext, channel: str = "web_app") -> str:
     name = (context.ai_name or context.apex_name or "Apex").strip() or "Apex"
     user = (context.user_name or "there").strip() or "there"
@@ -249,7 +285,7 @@ def build_system_prompt(context: SharedContext, channel: str = "web_app") -> str
         "\n".join(situational) if situational else "No special flags."
     )
 
-    return UNITRADER_SYSTEM_PROMPT.format(
+    return _render_system_prompt(
         ai_name=name,
         user_name=user,
         trader_class=context.trader_class or "unknown",
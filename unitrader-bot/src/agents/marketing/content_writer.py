@@ -10,17 +10,22 @@ import asyncio
 import json
 import logging
 import re
+import time
 import uuid
 from datetime import datetime, timezone
 
 import anthropic
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
 from database import AsyncSessionLocal
-from models import BlogPost, Trade, User
+from models import BlogPost, User
+from src.utils.claude_retry import with_claude_retry
 from src.utils.json_parser import parse_claude_json
+from src.services import llm_cache
+from src.services.claude_batch import complete_via_batch, run_message_batch
+from src.services.trade_stats import get_trade_aggregates
 from src.services.learning_hub import (
     get_content_insights,
     get_active_instructions,
@@ -31,6 +36,35 @@ logger = logging.getLogger(__name__)
 
 _CLAUDE_MODEL = settings.anthropic_model_fast
 _MAX_TOKENS = 4096
+# Concurrent Claude generations in generate_weekly_posts
+_WEEKLY_CONCURRENCY = 3
+
+# Topic rotation index: seeded from COUNT(*) once per process, then bumped
+# by _save_blog_post so the scheduler never rescans blog_posts.
+_post_count: int | None = None
+
+_claude_client: anthropic.AsyncAnthropic | None = None
+
+
+def _get_claude_client() -> anthropic.AsyncAnthropic:
+    """Return the shared Claude client, building it on first use."""
+    global _claude_client
+    if _claude_client is None:
+        _claude_client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            max_retries=2,
+            timeout=120.0,
+        )
+    return _claude_client
+
+
+async def close_claude_client() -> None:
+    """Close the shared Claude client (app shutdown)."""
+    global _claude_client
+    if _claude_client is not None:
+        await _claude_client.close()
+        _claude_client = None
+
 
 # ─────────────────────────────────────────────
 # Pre-defined topic templates
@@ -88,6 +122,11 @@ WRITING RULES:
 Output the full blog post in Markdown. Start with a level-1 heading for the title.
 """
 
+# System prompt as a prompt-cache block, shared by every blog request
+_BLOG_SYSTEM = [
+    {"type": "text", "text": _BLOG_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+]
+
 _BLOG_META_PROMPT = """\
 Given the following blog post, extract its metadata.
 Respond with valid JSON only — no markdown fences, no commentary.
@@ -105,15 +144,19 @@ Respond with valid JSON only — no markdown fences, no commentary.
 # Utility functions
 # ─────────────────────────────────────────────
 
+_SLUG_STRIP = re.compile(r"[^\w\s-]")
+_SLUG_SPACE = re.compile(r"[\s_]+")
+_SLUG_DASH = re.compile(r"-+")
+
+
 def make_slug(title: str) -> str:
     """Convert a blog title to a URL-friendly slug.
 
     Example: "How MACD Works!" → "how-macd-works"
     """
-    slug = title.lower()
-    slug = re.sub(r"[^\w\s-]", "", slug)
-    slug = re.sub(r"[\s_]+", "-", slug)
-    slug = re.sub(r"-+", "-", slug).strip("-")
+    slug = _SLUG_STRIP.sub("", title.lower())
+    slug = _SLUG_SPACE.sub("-", slug)
+    slug = _SLUG_DASH.sub("-", slug).strip("-")
     return slug[:200]
 
 
@@ -129,26 +172,6 @@ def count_words(text: str) -> int:
     return len(text.split())
 
 
-async def _get_platform_stats(db: AsyncSession) -> dict:
-    """Pull aggregate platform stats to enrich blog posts with real data."""
-    try:
-        from sqlalchemy import func
-
-        result = await db.execute(
-            select(
-                func.count(Trade.id).label("total_trades"),
-                func.avg(Trade.profit_percent).label("avg_profit_pct"),
-            ).where(Trade.status == "closed")
-        )
-        row = result.first()
-        return {
-            "total_trades": row.total_trades or 0,
-            "avg_profit_pct": round(float(row.avg_profit_pct or 0), 2),
-        }
-    except Exception:
-        return {"total_trades": 0, "avg_profit_pct": 0.0}
-
-
 # ─────────────────────────────────────────────
 # Main generation function
 # ─────────────────────────────────────────────
@@ -157,6 +180,9 @@ async def generate_blog_post(
     topic: str,
     save_to_db: bool = True,
     db: AsyncSession | None = None,
+    use_batch: bool = False,
+    hub: tuple[str, str | None] | None = None,
+    use_cache: bool = False,
 ) -> dict:
     """Generate a complete, SEO-optimised blog post on the given topic.
 
@@ -164,6 +190,13 @@ async def generate_blog_post(
         topic: The subject or working title for the post.
         save_to_db: If True, persist the generated post to the database.
         db: Optional injected session (uses its own session if not provided).
+        use_batch: Submit through the Message Batches API (half price, slow).
+            Falls back to a real-time call if the batch does not succeed.
+        hub: Precomputed ``(hub_context, instruction_id)`` shared across a
+            batch of posts; fetched from the learning hub if omitted.
+        use_cache: Reuse (and store) the Claude response via ``llm_cache``.
+            Only the schedulers set this — an interactive request for the
+            same topic should get fresh content, not a duplicate post.
 
     Returns:
         {
@@ -183,56 +216,47 @@ async def generate_blog_post(
         logger.warning("Anthropic API key not set — cannot generate blog post")
         return _placeholder_post(topic, error="Anthropic API key not configured")
 
-    # ── Fetch learning hub insights ───────────────────────────────────────
-    hub_context = ""
-    instr_id: str | None = None
-    try:
-        insights = await get_content_insights()
-        instructions = await get_active_instructions("content_writer")
+    user_prompt, instr_id = await _prepare_blog_prompt(topic, hub)
 
-        proof_points = insights.get("trading_proof_points", [])
-        viral_topics = insights.get("viral_topics", [])
-        current_instr = insights.get("current_instruction")
+    cached = await _cached_blog_response(user_prompt) if use_cache else None
 
-        if proof_points or viral_topics or current_instr:
-            hub_parts: list[str] = []
-            if proof_points:
-                hub_parts.append(
-                    "PROVEN TRADING DATA TO REFERENCE:\n"
-                    + "\n".join(f"  - {p}" for p in proof_points[:3])
-                )
-            if viral_topics:
-                hub_parts.append(
-                    "TRENDING TOPICS (high engagement):\n"
-                    + "\n".join(f"  - {t}" for t in viral_topics[:5])
-                )
-            if current_instr:
-                hub_parts.append(f"EDITORIAL DIRECTIVE: {current_instr}")
-            hub_context = (
-                "\n\nLEARNING HUB GUIDANCE (incorporate where natural):\n"
-                + "\n".join(hub_parts)
-            )
-            logger.info("ContentWriter: learning hub context injected for '%s'", topic)
+    batch_text: str | None = None
+    if use_batch and cached is None:
+        client = _get_claude_client()
+        batch_text = await complete_via_batch(client, _blog_request(user_prompt), custom_id="post-0")
+
+    return await _write_blog_post(
+        topic, user_prompt, instr_id, save_to_db=save_to_db, db=db,
+        batch_text=batch_text, cached=cached, use_cache=use_cache,
+    )
 
-        if instructions:
-            instr_id = instructions[0]["id"]
 
-    except Exception as exc:
-        logger.warning("ContentWriter: could not fetch learning insights: %s", exc)
+async def _cached_blog_response(user_prompt: str) -> dict | None:
+    """Return the cached parsed blog response for `user_prompt`, if any."""
+    return await llm_cache.lookup("content_writer", _BLOG_SYSTEM_PROMPT, user_prompt)
+
+
+async def _prepare_blog_prompt(
+    topic: str,
+    hub: tuple[str, str | None] | None = None,
+) -> tuple[str, str | None]:
+    """Build the user prompt for `topic`. Returns (user_prompt, hub instruction id).
+
+    `hub` is a precomputed ``_build_hub_context`` result; fetched if omitted.
+    """
+    hub_context, instr_id = hub if hub is not None else await _load_hub_context()
+    if hub_context:
+        logger.info("ContentWriter: learning hub context injected for '%s'", topic)
 
     # ── Enrich with platform stats ────────────────────────────────────────
     stats_context = ""
-    try:
-        async with AsyncSessionLocal() as _db:
-            stats = await _get_platform_stats(_db)
-        if stats["total_trades"] > 0:
-            stats_context = (
-                f"\n\nPLATFORM DATA (use these real numbers in the post):\n"
-                f"- Total trades analysed by Unitrader AI: {stats['total_trades']:,}\n"
-                f"- Average profit per winning trade: {stats['avg_profit_pct']:.1f}%\n"
-            )
-    except Exception:
-        pass
+    stats = await get_trade_aggregates()
+    if stats["total_trades"] > 0:
+        stats_context = (
+            f"\n\nPLATFORM DATA (use these real numbers in the post):\n"
+            f"- Total trades analysed by Unitrader AI: {stats['total_trades']:,}\n"
+            f"- Average profit per winning trade: {stats['avg_profit_pct']:.1f}%\n"
+        )
 
     user_prompt = (
         f"Write a complete blog post about: **{topic}**"
@@ -251,25 +275,125 @@ async def generate_blog_post(
         '}\n'
         'Your entire response must be parseable by json.loads(). Nothing else.'
     )
+    return user_prompt, instr_id
 
-    client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
 
+async def _load_hub_context() -> tuple[str, str | None]:
+    """Fetch learning hub guidance for the content writer."""
     try:
-        response = await client.messages.create(
-            model=_CLAUDE_MODEL,
-            max_tokens=_MAX_TOKENS,
-            system=_BLOG_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_prompt}],
+        insights = await get_content_insights()
+        instructions = await get_active_instructions("content_writer")
+        return _build_hub_context(insights, instructions)
+    except Exception as exc:
+        logger.warning("ContentWriter: could not fetch learning insights: %s", exc)
+        return "", None
+
+
+def _build_hub_context(insights: dict, instructions: list[dict]) -> tuple[str, str | None]:
+    """Render learning hub insights into prompt text. Returns (hub_context, instruction id)."""
+    proof_points = insights.get("trading_proof_points", [])
+    viral_topics = insights.get("viral_topics", [])
+    current_instr = insights.get("current_instruction")
+
+    hub_context = ""
+    if proof_points or viral_topics or current_instr:
+        hub_parts: list[str] = []
+        if proof_points:
+            hub_parts.append(
+                "PROVEN TRADING DATA TO REFERENCE:\n"
+                + "\n".join(f"  - {p}" for p in proof_points[:3])
+            )
+        if viral_topics:
+            hub_parts.append(
+                "TRENDING TOPICS (high engagement):\n"
+                + "\n".join(f"  - {t}" for t in viral_topics[:5])
+            )
+        if current_instr:
+            hub_parts.append(f"EDITORIAL DIRECTIVE: {current_instr}")
+        hub_context = (
+            "\n\nLEARNING HUB GUIDANCE (incorporate where natural):\n"
+            + "\n".join(hub_parts)
         )
-        raw = response.content[0].text.strip()
-        data = parse_claude_json(raw, context="blog post")
 
-    except json.JSONDecodeError as exc:
-        logger.error("Blog post JSON parse error: %s", exc)
-        return _placeholder_post(topic, error=f"JSON parse error: {exc}")
-    except Exception as exc:
-        logger.error("Blog post generation failed: %s", exc)
-        return _placeholder_post(topic, error=str(exc))
+    instr_id = instructions[0]["id"] if instructions else None
+    return hub_context, instr_id
+
+
+def _blog_request(user_prompt: str) -> dict:
+    """Return the ``messages.create`` params for a blog post prompt."""
+    return {
+        "model": _CLAUDE_MODEL,
+        "max_tokens": _MAX_TOKENS,
+        "system": _BLOG_SYSTEM,
+        "messages": [{"role": "user", "content": user_prompt}],
+    }
+
+
+async def _stream_text(client: anthropic.AsyncAnthropic, params: dict, topic: str) -> str:
+    """Stream a Claude response and return its stripped text.
+
+    A full article streams for several seconds; logging time-to-first-token
+    separates a slow queue from a slow generation.
+    """
+    started = time.perf_counter()
+    chunks: list[str] = []
+    async with client.messages.stream(**params) as stream:
+        async for text in stream.text_stream:
+            if not chunks:
+                logger.debug(
+                    "ContentWriter: first token for '%s' after %.2fs",
+                    topic, time.perf_counter() - started,
+                )
+            chunks.append(text)
+        usage = (await stream.get_final_message()).usage
+    logger.debug(
+        "ContentWriter: streamed '%s' in %.2fs (input=%s cache_read=%s)",
+        topic, time.perf_counter() - started,
+        usage.input_tokens, getattr(usage, "cache_read_input_tokens", 0) or 0,
+    )
+    return "".join(chunks).strip()
+
+
+async def _write_blog_post(
+    topic: str,
+    user_prompt: str,
+    instr_id: str | None,
+    *,
+    save_to_db: bool,
+    db: AsyncSession | None = None,
+    batch_text: str | None = None,
+    cached: dict | None = None,
+    use_cache: bool = False,
+) -> dict:
+    """Turn a prepared prompt into a saved post.
+
+    Uses `cached` (the caller's cache lookup), then `batch_text`, then a
+    real-time Claude call. With `use_cache` a fresh response is stored.
+    """
+    raw = ""
+    data = cached
+    if data is None:
+        try:
+            if batch_text is not None:
+                raw = batch_text
+            else:
+                client = _get_claude_client()
+                raw = await with_claude_retry(
+                    lambda: _stream_text(client, _blog_request(user_prompt), topic),
+                    label="Blog post generation",
+                )
+            # Repair passes walk the text char-by-char — keep them off the loop
+            data = await asyncio.to_thread(parse_claude_json, raw, context="blog post")
+
+        except json.JSONDecodeError as exc:
+            logger.error("Blog post JSON parse error: %s", exc)
+            return _placeholder_post(topic, error=f"JSON parse error: {exc}")
+        except Exception as exc:
+            logger.error("Blog post generation failed: %s", exc)
+            return _placeholder_post(topic, error=str(exc))
+
+        if use_cache and data.get("content"):
+            await llm_cache.store("content_writer", _BLOG_SYSTEM_PROMPT, user_prompt, data)
 
     content = data.get("content") or raw
     base_slug = data.get("slug") or make_slug(data.get("title", topic))
@@ -330,32 +454,48 @@ async def _save_blog_post(data: dict, db: AsyncSession | None) -> str:
         await session.flush()
         return post.id
 
+    global _post_count
+
     if db is not None:
-        return await _insert(db)
+        post_id = await _insert(db)
+    else:
+        async with AsyncSessionLocal() as session:
+            post_id = await _insert(session)
+            await session.commit()
+    if _post_count is not None:
+        _post_count += 1
+    return post_id
+
 
-    async with AsyncSessionLocal() as session:
-        post_id = await _insert(session)
-        await session.commit()
-        return post_id
+async def _blog_post_count() -> int:
+    """Return the number of blog posts, scanning the table only on first use."""
+    global _post_count
+
+    if _post_count is None:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(func.count()).select_from(BlogPost))
+            _post_count = result.scalar() or 0
+    return _post_count
 
 
 # ─────────────────────────────────────────────
 # Batch generation (for background scheduler)
 # ─────────────────────────────────────────────
 
-async def generate_weekly_posts(count: int = 2) -> list[dict]:
+async def generate_weekly_posts(count: int = 2, use_batch: bool = True) -> list[dict]:
     """Generate `count` blog posts — prioritising hub-recommended topics.
 
     If the learning hub has viral topics, they are used first.
     Falls back to SUGGESTED_TOPICS rotation otherwise.
+
+    With `use_batch` (the scheduler default) all posts go out as one
+    Message Batch; otherwise they are generated concurrently in real time.
     """
-    async with AsyncSessionLocal() as db:
-        from sqlalchemy import func
-        result = await db.execute(select(func.count()).select_from(BlogPost))
-        existing_count = result.scalar() or 0
+    existing_count = await _blog_post_count()
 
     # ── Learning hub topic override ───────────────────────────────────────
     hub_topics: list[str] = []
+    hub: tuple[str, str | None] | None = None
     try:
         insights = await get_content_insights()
         viral = insights.get("viral_topics", [])
@@ -367,36 +507,131 @@ async def generate_weekly_posts(count: int = 2) -> list[dict]:
         ][:count]
         if hub_topics:
             logger.info("ContentWriter: using %d hub-recommended topics", len(hub_topics))
+        # Same guidance for every post in the batch — build it once
+        hub = _build_hub_context(insights, await get_active_instructions("content_writer"))
     except Exception:
         pass
 
+    # Prefer hub-recommended topics; fall back to rotation
+    topics = [
+        hub_topics[i] if i < len(hub_topics)
+        else SUGGESTED_TOPICS[(existing_count + i) % len(SUGGESTED_TOPICS)]
+        for i in range(count)
+    ]
+
+    if use_batch and settings.anthropic_api_key:
+        results = await _generate_posts_batched(topics, hub)
+        logger.info("Weekly blog generation complete: %d posts created", len(results))
+        return results
+
+    sem = asyncio.Semaphore(_WEEKLY_CONCURRENCY)
+
+    async def _one(topic: str) -> dict:
+        async with sem:
+            return await generate_blog_post(topic, save_to_db=True, hub=hub, use_cache=True)
+
+    outcomes = await asyncio.gather(*(_one(t) for t in topics), return_exceptions=True)
+
     results = []
-    for i in range(count):
-        # Prefer hub-recommended topics; fall back to rotation
-        if i < len(hub_topics):
-            topic = hub_topics[i]
+    for topic, outcome in zip(topics, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Weekly blog generation failed for topic '%s': %s", topic, outcome)
         else:
-            topic_index = (existing_count + i) % len(SUGGESTED_TOPICS)
-            topic = SUGGESTED_TOPICS[topic_index]
+            results.append(outcome)
+
+    logger.info("Weekly blog generation complete: %d posts created", len(results))
+    return results
+
+
+async def _generate_posts_batched(
+    topics: list[str],
+    hub: tuple[str, str | None] | None = None,
+) -> list[dict]:
+    """Generate one post per topic from a single Message Batch.
+
+    Topics whose batch request did not succeed fall back to real time.
+    """
+    prepared = list(await asyncio.gather(*(_prepare_blog_prompt(t, hub) for t in topics)))
+    cached = [await _cached_blog_response(user_prompt) for user_prompt, _ in prepared]
+    requests = {
+        f"post-{i}": _blog_request(user_prompt)
+        for i, (user_prompt, _) in enumerate(prepared)
+        if cached[i] is None
+    }
+
+    texts: dict[str, str] = {}
+    if requests:
+        client = _get_claude_client()
         try:
-            post = await generate_blog_post(topic, save_to_db=True)
-            results.append(post)
-            await asyncio.sleep(2)
+            texts = await run_message_batch(client, requests)
         except Exception as exc:
-            logger.error("Weekly blog generation failed for topic '%s': %s", topic, exc)
+            logger.warning("ContentWriter: weekly batch failed — falling back to real-time: %s", exc)
 
-    logger.info("Weekly blog generation complete: %d posts created", len(results))
+    sem = asyncio.Semaphore(_WEEKLY_CONCURRENCY)
+
+    async def _one(i: int, topic: str, user_prompt: str, instr_id: str | None) -> dict:
+        async with sem:
+            return await _write_blog_post(
+                topic, user_prompt, instr_id,
+                save_to_db=False, batch_text=texts.get(f"post-{i}"),
+                cached=cached[i], use_cache=True,
+            )
+
+    outcomes = await asyncio.gather(
+        *(
+            _one(i, topic, user_prompt, instr_id)
+            for i, (topic, (user_prompt, instr_id)) in enumerate(zip(topics, prepared))
+        ),
+        return_exceptions=True,
+    )
+    results = []
+    for topic, outcome in zip(topics, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Weekly blog generation failed for topic '%s': %s", topic, outcome)
+        else:
+            results.append(outcome)
+
+    # Generation (including any real-time fallback) is finished before the
+    # session opens, so the transaction only spans the inserts.
+    await _save_blog_posts([post for post in results if not post.get("error")])
     return results
 
 
-async def generate_monthly_guide(topic: str | None = None) -> dict:
+async def _save_blog_posts(posts: list[dict]) -> None:
+    """Insert ``posts`` in one commit, setting ``id`` on each saved post.
+
+    Each insert runs in a savepoint, so one bad row skips only that post.
+    """
+    global _post_count
+
+    if not posts:
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            for post in posts:
+                try:
+                    async with db.begin_nested():
+                        post["id"] = await _save_blog_post(post, db)
+                except Exception as exc:
+                    logger.error("Could not save blog post '%s': %s", post["title"], exc)
+            await db.commit()
+    except Exception as exc:
+        logger.error("Weekly blog posts could not be saved: %s", exc)
+        for post in posts:
+            post["id"] = None
+        _post_count = None  # recount on next use; the increments never landed
+
+
+async def generate_monthly_guide(topic: str | None = None, use_batch: bool = True) -> dict:
     """Generate one comprehensive long-form guide (~2000 words).
 
     Called by the monthly background scheduler.
     """
     guide_topic = topic or "The Complete Beginner's Guide to AI-Powered Trading"
     logger.info("Generating monthly guide: %s", guide_topic)
-    return await generate_blog_post(guide_topic, save_to_db=True)
+    return await generate_blog_post(
+        guide_topic, save_to_db=True, use_batch=use_batch, use_cache=True
+    )
 
 
 # ─────────────────────────────────────────────
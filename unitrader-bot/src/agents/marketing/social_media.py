@@ -16,12 +16,16 @@ from datetime import datetime, timedelta, timezone
 from typing import Literal
 
 import anthropic
-from sqlalchemy import select
+from sqlalchemy import Row, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
 from database import AsyncSessionLocal
-from models import SocialPost, Trade
+from models import SocialPost
+from src.services import llm_cache
+from src.services.claude_batch import complete_via_batch
+from src.services.trade_stats import get_trade_aggregates
+from src.utils.claude_retry import with_claude_retry
 from src.utils.json_parser import parse_claude_json
 
 logger = logging.getLogger(__name__)
@@ -29,11 +33,38 @@ logger = logging.getLogger(__name__)
 _CLAUDE_MODEL = settings.anthropic_model_fast
 _MAX_TOKENS = 2048
 
+_claude_client: anthropic.AsyncAnthropic | None = None
+
+
+def _get_claude_client() -> anthropic.AsyncAnthropic:
+    """Return the shared Claude client, building it on first use."""
+    global _claude_client
+    if _claude_client is None:
+        _claude_client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            max_retries=2,
+            timeout=120.0,
+        )
+    return _claude_client
+
+
+async def close_claude_client() -> None:
+    """Close the shared Claude client (app shutdown)."""
+    global _claude_client
+    if _claude_client is not None:
+        await _claude_client.close()
+        _claude_client = None
+
+
 Platform = Literal["twitter", "linkedin", "instagram", "facebook"]
 PostType = Literal["educational", "social_proof", "call_to_action", "inspirational"]
 
 PLATFORMS: list[Platform] = ["twitter", "linkedin", "instagram", "facebook"]
 
+# Topic rotation index: seeded from COUNT(*) once per process, then bumped
+# by _save_social_posts so the scheduler never rescans social_posts.
+_post_count: int | None = None
+
 # Character limits per platform
 CHAR_LIMITS: dict[str, int] = {
     "twitter": 280,
@@ -81,29 +112,10 @@ Estimated engagement guidance:
 - low: informational, lower shareability
 """
 
-
-# ─────────────────────────────────────────────
-# Platform stat injection
-# ─────────────────────────────────────────────
-
-async def _get_social_proof_stats() -> dict:
-    """Fetch aggregate stats to use in social proof posts."""
-    try:
-        from sqlalchemy import func
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(
-                    func.count(Trade.id).label("total"),
-                    func.count(Trade.id).filter(Trade.profit.isnot(None)).label("wins"),
-                ).where(Trade.status == "closed")
-            )
-            row = result.first()
-            total = row.total or 1
-            wins = row.wins or 0
-            win_rate = round(wins / total * 100, 1) if total else 0
-            return {"total_trades": total, "win_rate": win_rate}
-    except Exception:
-        return {"total_trades": 0, "win_rate": 0.0}
+# System prompt as a prompt-cache block, shared by every social request
+_SOCIAL_SYSTEM = [
+    {"type": "text", "text": _SOCIAL_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+]
 
 
 # ─────────────────────────────────────────────
@@ -116,6 +128,8 @@ async def generate_social_posts(
     platforms: list[Platform] | None = None,
     save_to_db: bool = True,
     scheduled_start: datetime | None = None,
+    use_batch: bool = False,
+    use_cache: bool = False,
 ) -> list[dict]:
     """Generate a varied set of social media posts for a given topic.
 
@@ -128,6 +142,11 @@ async def generate_social_posts(
         platforms: Which platforms to target (default: all four).
         save_to_db: Persist posts to the database.
         scheduled_start: First scheduling slot (defaults to tomorrow 9 AM UTC).
+        use_batch: Submit through the Message Batches API (half price, slow).
+            Falls back to a real-time call if the batch does not succeed.
+        use_cache: Reuse (and store) the Claude response via ``llm_cache``.
+            Only the daily scheduler sets this, so an interactive request
+            never re-saves copies of posts it already has.
 
     Returns:
         List of post dicts ready for the API response or background job.
@@ -137,7 +156,7 @@ async def generate_social_posts(
         return _placeholder_posts(topic, count)
 
     target_platforms = platforms or PLATFORMS
-    stats = await _get_social_proof_stats()
+    stats = await get_trade_aggregates()
 
     # Distribute content types across the batch
     type_distribution = _get_type_distribution(count)
@@ -159,26 +178,47 @@ async def generate_social_posts(
         "Output valid JSON array only. No markdown fences."
     )
 
-    client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-
-    try:
-        response = await client.messages.create(
-            model=_CLAUDE_MODEL,
-            max_tokens=_MAX_TOKENS,
-            system=_SOCIAL_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_prompt}],
-        )
-        raw = response.content[0].text.strip()
-        posts_data = parse_claude_json(raw, context="social posts")
-        if not isinstance(posts_data, list):
-            raise ValueError(f"Expected JSON array, got {type(posts_data).__name__}")
+    posts_data = None
+    if use_cache:
+        posts_data = await llm_cache.lookup("social_media", _SOCIAL_SYSTEM_PROMPT, user_prompt)
+    if posts_data is None:
+        client = _get_claude_client()
+
+        params = {
+            "model": _CLAUDE_MODEL,
+            "max_tokens": _MAX_TOKENS,
+            "system": _SOCIAL_SYSTEM,
+            "messages": [{"role": "user", "content": user_prompt}],
+        }
 
-    except (json.JSONDecodeError, ValueError) as exc:
-        logger.error("Social posts JSON parse error: %s", exc)
-        return _placeholder_posts(topic, count)
-    except Exception as exc:
-        logger.error("Social post generation failed: %s", exc)
-        return _placeholder_posts(topic, count)
+        try:
+            raw = None
+            if use_batch:
+                raw = await complete_via_batch(client, params, custom_id="social-0")
+            if raw is None:
+                response = await with_claude_retry(
+                    lambda: client.messages.create(**params),
+                    label="Social post generation",
+                )
+                raw = response.content[0].text.strip()
+                logger.debug(
+                    "Social posts usage: input=%s cache_read=%s",
+                    response.usage.input_tokens,
+                    getattr(response.usage, "cache_read_input_tokens", 0) or 0,
+                )
+            posts_data = await asyncio.to_thread(parse_claude_json, raw, context="social posts")
+            if not isinstance(posts_data, list):
+                raise ValueError(f"Expected JSON array, got {type(posts_data).__name__}")
+
+        except (json.JSONDecodeError, ValueError) as exc:
+            logger.error("Social posts JSON parse error: %s", exc)
+            return _placeholder_posts(topic, count)
+        except Exception as exc:
+            logger.error("Social post generation failed: %s", exc)
+            return _placeholder_posts(topic, count)
+
+        if use_cache:
+            await llm_cache.store("social_media", _SOCIAL_SYSTEM_PROMPT, user_prompt, posts_data)
 
     # Validate char limits and enrich
     schedule_slots = _build_schedule_slots(
@@ -186,30 +226,29 @@ async def generate_social_posts(
         start=scheduled_start or _next_morning(),
     )
 
+    # One slot per post, so zip() pairs every post with its schedule slot
+    limit_for = CHAR_LIMITS.get
     results = []
-    for i, post in enumerate(posts_data):
-        platform = post.get("platform", "twitter")
-        content = post.get("content", "")
-        limit = CHAR_LIMITS.get(platform, 280)
-
-        # Truncate if over platform limit (shouldn't happen but safety net)
-        if platform == "twitter" and len(content) > limit:
-            content = content[:limit - 3] + "..."
-
-        enriched = {
+    for post, slot in zip(posts_data, schedule_slots):
+        get = post.get
+        platform = get("platform", "twitter")
+        limit = limit_for(platform, 280)
+        # Enforce the platform limit (shouldn't trip, but a rejected push costs more)
+        content = _truncate(get("content", ""), limit)
+
+        results.append({
             "id": None,
             "platform": platform,
-            "post_type": post.get("post_type", "educational"),
+            "post_type": get("post_type", "educational"),
             "content": content,
-            "hashtags": post.get("hashtags", []),
-            "estimated_engagement": post.get("estimated_engagement", "medium"),
-            "best_posting_time": post.get("best_posting_time", "morning"),
+            "hashtags": get("hashtags", []),
+            "estimated_engagement": get("estimated_engagement", "medium"),
+            "best_posting_time": get("best_posting_time", "morning"),
             "topic": topic,
-            "scheduled_for": schedule_slots[i].isoformat() if i < len(schedule_slots) else None,
+            "scheduled_for": slot.isoformat(),
             "char_count": len(content),
             "char_limit": limit,
-        }
-        results.append(enriched)
+        })
 
     if save_to_db:
         ids = await _save_social_posts(results)
@@ -241,19 +280,33 @@ async def generate_daily_posts(count: int = 5) -> list[dict]:
         "Why most traders fail (and how to avoid those mistakes)",
     ]
 
-    async with AsyncSessionLocal() as db:
-        from sqlalchemy import func
-        result = await db.execute(select(func.count()).select_from(SocialPost))
-        count_existing = result.scalar() or 0
+    count_existing = await _social_post_count()
 
     topic = daily_topics[count_existing % len(daily_topics)]
-    return await generate_social_posts(topic, count=count, save_to_db=True)
+    return await generate_social_posts(
+        topic, count=count, save_to_db=True, use_batch=True, use_cache=True
+    )
 
 
 # ─────────────────────────────────────────────
 # 30-day calendar builder
 # ─────────────────────────────────────────────
 
+# Columns read by _social_post_to_dict — plain rows skip ORM materialisation
+_CALENDAR_COLUMNS = (
+    SocialPost.id,
+    SocialPost.platform,
+    SocialPost.post_type,
+    SocialPost.content,
+    SocialPost.hashtags,
+    SocialPost.topic,
+    SocialPost.estimated_engagement,
+    SocialPost.scheduled_for,
+    SocialPost.is_posted,
+    SocialPost.created_at,
+)
+
+
 async def get_social_calendar(
     days: int = 30,
     db: AsyncSession | None = None,
@@ -265,16 +318,16 @@ async def get_social_calendar(
     now = datetime.now(timezone.utc)
     end = now + timedelta(days=days)
 
-    async def _fetch(session: AsyncSession) -> list[SocialPost]:
+    async def _fetch(session: AsyncSession) -> list[Row]:
         result = await session.execute(
-            select(SocialPost)
+            select(*_CALENDAR_COLUMNS)
             .where(
                 SocialPost.scheduled_for >= now,
                 SocialPost.scheduled_for <= end,
             )
             .order_by(SocialPost.scheduled_for.asc())
         )
-        return result.scalars().all()
+        return result.all()
 
     if db is not None:
         posts = await _fetch(db)
@@ -289,14 +342,35 @@ async def get_social_calendar(
 # Helpers
 # ─────────────────────────────────────────────
 
-def _get_type_distribution(count: int) -> list[str]:
-    """Return a balanced list of post types for `count` posts."""
-    base = ["educational", "social_proof", "call_to_action", "inspirational"]
-    result = []
-    for i in range(count):
-        # Extra posts default to educational
-        result.append(base[i] if i < len(base) else "educational")
-    return result
+_POST_TYPES: tuple[str, ...] = ("educational", "social_proof", "call_to_action", "inspirational")
+
+
+def _build_type_distribution(count: int) -> tuple[str, ...]:
+    # Extra posts default to educational
+    return tuple(
+        _POST_TYPES[i] if i < len(_POST_TYPES) else "educational"
+        for i in range(count)
+    )
+
+
+# Every batch size the API allows is precomputed; larger counts are built on demand
+_TYPE_DISTRIBUTIONS: tuple[tuple[str, ...], ...] = tuple(
+    _build_type_distribution(n) for n in range(32)
+)
+
+
+def _get_type_distribution(count: int) -> tuple[str, ...]:
+    """Return a balanced tuple of post types for `count` posts."""
+    if 0 <= count < len(_TYPE_DISTRIBUTIONS):
+        return _TYPE_DISTRIBUTIONS[count]
+    return _build_type_distribution(count)
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Clip `text` to `limit` characters, ending in an ellipsis when cut."""
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rstrip() + "…"
 
 
 def _next_morning() -> datetime:
@@ -311,35 +385,59 @@ def _build_schedule_slots(count: int, start: datetime) -> list[datetime]:
     return [start + timedelta(days=i) for i in range(count)]
 
 
+def _parse_scheduled(post: dict) -> datetime | None:
+    """Return the post's ``scheduled_for`` as a datetime, or None if absent/invalid."""
+    if not post.get("scheduled_for"):
+        return None
+    try:
+        return datetime.fromisoformat(post["scheduled_for"])
+    except (ValueError, TypeError):
+        return None
+
+
 async def _save_social_posts(posts: list[dict]) -> list[str]:
-    """Persist a batch of social post dicts to the database."""
-    ids = []
+    """Persist a batch of social post dicts to the database in one INSERT."""
+    global _post_count
+
+    if not posts:
+        return []
+    rows = [
+        {
+            "platform": post["platform"],
+            "content": post["content"],
+            "hashtags": post.get("hashtags", []),
+            "post_type": post["post_type"],
+            "topic": post.get("topic"),
+            "estimated_engagement": post.get("estimated_engagement"),
+            "scheduled_for": _parse_scheduled(post),
+        }
+        for post in posts
+    ]
     async with AsyncSessionLocal() as session:
-        for post in posts:
-            scheduled = None
-            if post.get("scheduled_for"):
-                try:
-                    scheduled = datetime.fromisoformat(post["scheduled_for"])
-                except (ValueError, TypeError):
-                    pass
-
-            row = SocialPost(
-                platform=post["platform"],
-                content=post["content"],
-                hashtags=post.get("hashtags", []),
-                post_type=post["post_type"],
-                topic=post.get("topic"),
-                estimated_engagement=post.get("estimated_engagement"),
-                scheduled_for=scheduled,
-            )
-            session.add(row)
-            await session.flush()
-            ids.append(row.id)
+        result = await session.execute(
+            insert(SocialPost).returning(SocialPost.id, sort_by_parameter_order=True),
+            rows,
+        )
+        ids = list(result.scalars())
         await session.commit()
+
+    if _post_count is not None:
+        _post_count += len(ids)
     return ids
 
 
-def _social_post_to_dict(post: SocialPost) -> dict:
+async def _social_post_count() -> int:
+    """Return the number of social posts, scanning the table only on first use."""
+    global _post_count
+
+    if _post_count is None:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(func.count()).select_from(SocialPost))
+            _post_count = result.scalar() or 0
+    return _post_count
+
+
+def _social_post_to_dict(post: Row) -> dict:
     return {
         "id": post.id,
         "platform": post.platform,
@@ -0,0 +1,21 @@
+"""
+Optional Numba JIT.
+
+``njit`` compiles numeric loops to machine code when numba is installed and
+is a no-op decorator otherwise. Callers check ``NUMBA_AVAILABLE`` to pick a
+vectorised NumPy path instead of running the loop in the interpreter.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
@@ -0,0 +1,124 @@
+"""
+src/integrations/binance_kline_stream.py — In-memory Binance 5-minute closes.
+
+The first request for a symbol seeds a ring buffer from REST and subscribes
+to the symbol's ``@kline_5m`` stream. Later requests are served from the
+buffer while the stream stays connected. Every kline message updates the
+forming bar or appends a new one, so the buffer matches what ``/klines``
+would return. After a disconnect the next request re-seeds from REST.
+
+At most ``_MAX_STREAMS`` symbols hold a socket at once (Binance limits
+connections per IP); reads for other symbols go straight to REST until an
+idle stream closes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+import websockets
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_BUFFER_LEN = 1000  # Binance's max klines per REST request
+_RECONNECT_DELAY = 5
+_IDLE_TIMEOUT = 15 * 60  # drop streams nobody has read for this long
+_MAX_STREAMS = 32
+
+FetchRows = Callable[[str, int], Awaitable[list[list]]]
+
+
+class _KlineBuffer:
+    __slots__ = ("closes", "last_open", "seeded_limit", "connected", "synced", "last_read", "task")
+
+    def __init__(self) -> None:
+        self.closes: deque[float] = deque(maxlen=_BUFFER_LEN)
+        self.last_open = 0
+        self.seeded_limit = 0
+        self.connected = False
+        self.synced = False
+        self.last_read = time.monotonic()
+        self.task: asyncio.Task | None = None
+
+    def apply(self, open_time: int, close: float) -> None:
+        """Update the forming bar, or append when a new bar opens."""
+        if open_time == self.last_open and self.closes:
+            self.closes[-1] = close
+        elif open_time > self.last_open:
+            self.closes.append(close)
+            self.last_open = open_time
+
+    def seed(self, rows: list[list], limit: int) -> None:
+        self.closes.clear()
+        self.last_open = 0
+        for row in rows:
+            self.apply(int(row[0]), float(row[4]))  # index 4 = close
+        self.seeded_limit = limit
+        self.synced = self.connected
+
+
+_buffers: dict[str, _KlineBuffer] = {}
+
+
+async def get_closes(symbol: str, limit: int, fetch_rows: FetchRows) -> list[float]:
+    """Return the last ``limit`` 5-minute closes for ``symbol``.
+
+    ``fetch_rows(symbol, limit)`` is the REST ``/klines`` call used to seed
+    the buffer; it is only awaited when the buffer cannot answer.
+    """
+    buf = _buffers.get(symbol)
+    if buf is None:
+        if len(_buffers) >= _MAX_STREAMS:
+            return [float(row[4]) for row in await fetch_rows(symbol, limit)]
+        buf = _buffers[symbol] = _KlineBuffer()
+    buf.last_read = time.monotonic()
+    if buf.task is None or buf.task.done():
+        buf.task = asyncio.create_task(_run(symbol, buf), name=f"binance_klines_{symbol}")
+
+    if not (buf.connected and buf.synced) or limit > buf.seeded_limit:
+        buf.seed(await fetch_rows(symbol, limit), limit)
+    return list(buf.closes)[-limit:]
+
+
+async def _run(symbol: str, buf: _KlineBuffer) -> None:
+    url = f"{settings.binance_ws_url.rstrip('/')}/{symbol.lower()}@kline_5m"
+    try:
+        while time.monotonic() - buf.last_read < _IDLE_TIMEOUT:
+            try:
+                async with websockets.connect(url, ping_interval=30, ping_timeout=10) as ws:
+                    buf.connected = True
+                    async for raw in ws:
+                        try:
+                            k = json.loads(raw)["k"]
+                            buf.apply(int(k["t"]), float(k["c"]))
+                        except (ValueError, KeyError, TypeError):
+                            continue
+                        if time.monotonic() - buf.last_read >= _IDLE_TIMEOUT:
+                            return
+            except Exception as e:
+                logger.warning(
+                    "Binance kline stream error for %s: %s. Reconnecting in %ss...",
+                    symbol, e, _RECONNECT_DELAY,
+                )
+            finally:
+                buf.connected = buf.synced = False
+            await asyncio.sleep(_RECONNECT_DELAY)
+    finally:
+        if _buffers.get(symbol) is buf:
+            del _buffers[symbol]
+
+
+async def close_streams() -> None:
+    """Cancel every kline stream (app shutdown)."""
+    tasks = [buf.task for buf in _buffers.values() if buf.task is not None]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _buffers.clear()
@@ -6,52 +6,282 @@ All clients are async-first and include retry logic with exponential backoff.
 """
 
 import asyncio
-import hashlib
+import functools
 import hmac
+import json
 import logging
+import math
+import random
 import time
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from typing import Any
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
 from urllib.parse import urlencode
 
 import httpx
 
 from config import settings
+from src.services.price_store import price_store
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401 — presence enables HTTP/2 (pip install "httpx[http2]")
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# ─────────────────────────────────────────────
+# HTTP connection pool
+# ─────────────────────────────────────────────
+
+# Clients are long-lived (pooled per credentials by the trading agent), so
+# keep connections warm between cycles instead of re-handshaking TLS.
+_DEFAULT_LIMITS = httpx.Limits(
+    max_keepalive_connections=32,
+    max_connections=64,
+    keepalive_expiry=90,
+)
+
+
+def _build_http_client(base_url: str, headers: dict | None = None) -> httpx.AsyncClient:
+    """Return a pooled AsyncClient for one exchange API.
+
+    Transport-level retries are disabled — ``_with_retry`` is the single
+    place that decides whether a request is retried.
+    """
+    return httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        timeout=10.0,
+        transport=httpx.AsyncHTTPTransport(http2=_HTTP2, limits=_DEFAULT_LIMITS, retries=0),
+    )
+
+
 # ─────────────────────────────────────────────
 # Retry helper
 # ─────────────────────────────────────────────
 
 _MAX_RETRIES = 3
 _RETRY_BASE_DELAY = 1.0  # seconds
+_MAX_DELAY = 30.0
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def _retry_delay(attempt: int) -> float:
+    """Full-jitter backoff so concurrent callers don't retry in lockstep."""
+    return random.uniform(0, min(_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Return the Retry-After header (seconds or HTTP-date) as a delay in seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """True for failures that say the venue is unreachable or overloaded."""
+    if isinstance(exc, (httpx.TimeoutException, httpx.NetworkError)):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in _RETRYABLE_STATUS
+
+
+# ─────────────────────────────────────────────
+# Circuit breaker
+# ─────────────────────────────────────────────
+
+_CB_FAILURE_THRESHOLD = 5   # transient failures within the window trip the breaker
+_CB_WINDOW = 10.0           # seconds
+_CB_COOLDOWN = 30.0         # seconds the breaker stays OPEN before a probe
+
+
+class CircuitOpenError(Exception):
+    """Raised without a request while an exchange endpoint's breaker is OPEN."""
+
+
+class _CBState:
+    """Per-endpoint breaker: CLOSED → OPEN after repeated outages → HALF_OPEN probe."""
+
+    def __init__(
+        self,
+        threshold: int = _CB_FAILURE_THRESHOLD,
+        window: float = _CB_WINDOW,
+        cooldown: float = _CB_COOLDOWN,
+    ):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.state = "CLOSED"
+        self.failures: list[float] = []  # monotonic times of recent transient failures
+        self.opened_at = 0.0
+
+    def check(self, key: str) -> None:
+        if self.state != "OPEN":
+            return
+        remaining = self.cooldown - (time.monotonic() - self.opened_at)
+        if remaining > 0:
+            raise CircuitOpenError(f"{key} circuit open — retry in {remaining:.0f}s")
+        self.state = "HALF_OPEN"
+        logger.info("Exchange circuit breaker %s → HALF_OPEN", key)
+
+    def record_success(self, key: str) -> None:
+        if self.state != "CLOSED":
+            logger.info("Exchange circuit breaker %s → CLOSED (recovered)", key)
+        self.state = "CLOSED"
+        self.failures.clear()
+
+    def record_failure(self, key: str) -> None:
+        now = time.monotonic()
+        self.failures = [t for t in self.failures if now - t < self.window]
+        self.failures.append(now)
+        if self.state == "HALF_OPEN" or len(self.failures) >= self.threshold:
+            if self.state != "OPEN":
+                logger.error(
+                    "Exchange circuit breaker %s → OPEN for %.0fs after %d failures",
+                    key, self.cooldown, len(self.failures),
+                )
+            self.state = "OPEN"
+            self.opened_at = now
+
+
+# "BinanceClient._get@api.binance.com", "AlpacaClient._data_get@data.alpaca.markets",
+# ... -> breaker state
+_BREAKERS: dict[str, _CBState] = defaultdict(_CBState)
 
 
 async def _with_retry(coro_fn, *args, **kwargs) -> Any:
-    """Execute an async callable with exponential backoff on transient errors.
+    """Execute an async callable with jittered exponential backoff on transient errors.
 
     Retries on: httpx.TimeoutException, httpx.NetworkError, HTTP 429 / 5xx.
+    A ``Retry-After`` header on 429 / 503 is honoured (capped at ``_MAX_DELAY``).
+
+    Calls are guarded by a circuit breaker keyed on the callable (one per
+    client endpoint helper, e.g. ``BinanceClient._get``): after
+    ``_CB_FAILURE_THRESHOLD`` exhausted-retry failures within ``_CB_WINDOW``
+    seconds, calls raise ``CircuitOpenError`` for ``_CB_COOLDOWN`` seconds.
     """
+    return await _guarded_call(getattr(coro_fn, "__qualname__", repr(coro_fn)), coro_fn, *args, **kwargs)
+
+
+async def _guarded_call(key: str, coro_fn, *args, **kwargs) -> Any:
+    breaker = _BREAKERS[key]
+    breaker.check(key)
+    try:
+        result = await _retry_loop(coro_fn, *args, **kwargs)
+    except httpx.HTTPError as exc:
+        if _is_transient(exc):
+            breaker.record_failure(key)
+        elif isinstance(exc, httpx.HTTPStatusError):
+            breaker.record_success(key)  # the venue answered; the request was at fault
+        raise
+    breaker.record_success(key)
+    return result
+
+
+async def _retry_loop(coro_fn, *args, **kwargs) -> Any:
     for attempt in range(1, _MAX_RETRIES + 1):
         try:
             return await coro_fn(*args, **kwargs)
-        except (httpx.TimeoutException, httpx.NetworkError) as exc:
-            if attempt == _MAX_RETRIES:
+        except httpx.HTTPError as exc:
+            if attempt == _MAX_RETRIES or not _is_transient(exc):
                 raise
-            delay = _RETRY_BASE_DELAY * (2 ** (attempt - 1))
-            logger.warning("Network error on attempt %d/%d — retry in %.1fs: %s", attempt, _MAX_RETRIES, delay, exc)
-            await asyncio.sleep(delay)
-        except httpx.HTTPStatusError as exc:
-            if exc.response.status_code in {429, 500, 502, 503, 504}:
-                if attempt == _MAX_RETRIES:
-                    raise
-                delay = _RETRY_BASE_DELAY * (2 ** (attempt - 1))
-                logger.warning("HTTP %d on attempt %d/%d — retry in %.1fs", exc.response.status_code, attempt, _MAX_RETRIES, delay)
-                await asyncio.sleep(delay)
+            delay = _retry_delay(attempt)
+            if isinstance(exc, httpx.HTTPStatusError):
+                status = exc.response.status_code
+                if status in (429, 503):
+                    retry_after = _parse_retry_after(exc.response.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        delay = min(_MAX_DELAY, max(retry_after, delay))
+                logger.warning("HTTP %d on attempt %d/%d — retry in %.1fs", status, attempt, _MAX_RETRIES, delay)
             else:
-                raise
+                logger.warning("Network error on attempt %d/%d — retry in %.1fs: %s", attempt, _MAX_RETRIES, delay, exc)
+            await asyncio.sleep(delay)
+
+
+def _retrying(fn=None, *, http_attr: str = "_http"):
+    """Decorator form of ``_with_retry`` for a client's raw request helpers.
+
+    ``@_retrying async def _get(self, ...)`` makes every ``self._get(...)``
+    retried and circuit-broken, so call sites need no wrapper. The breaker
+    is per helper *and* host (``self.<http_attr>.base_url``), so a paper or
+    testnet outage never opens the breaker for live accounts.
+    """
+    if fn is None:
+        return functools.partial(_retrying, http_attr=http_attr)
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        http = getattr(self, http_attr, None)
+        host = http.base_url.host if http is not None else ""
+        return await _guarded_call(f"{name}@{host}", fn, self, *args, **kwargs)
+
+    return wrapper
+
+
+# ─────────────────────────────────────────────
+# Price cache
+# ─────────────────────────────────────────────
+
+# A streamed price older than this is treated as stale and the REST path is used.
+_STREAM_MAX_AGE = timedelta(seconds=5)
+
+
+def _cached_price(fetch):
+    """Serve ``get_current_price`` from the streamed price store or a short TTL cache.
+
+    A fresh, real-time price pushed by the app's WebSocket feeds is returned
+    without a request. Otherwise the REST price is cached per client for
+    ``settings.price_cache_ttl`` seconds, and concurrent misses for the same
+    symbol await one in-flight request.
+    """
+    @functools.wraps(fetch)
+    async def wrapper(self, symbol: str) -> float:
+        streamed = self._streamed_price(symbol)
+        if streamed is not None:
+            return streamed
+        ttl = settings.price_cache_ttl
+        if ttl <= 0:
+            return await fetch(self, symbol)
+        cached = self._price_cache.get(symbol)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        pending = self._price_inflight.get(symbol)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._price_inflight[symbol] = future
+        try:
+            price = await fetch(self, symbol)
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an error nobody else awaited isn't logged.
+            future.exception()
+            raise
+        else:
+            self._price_cache[symbol] = (price, time.monotonic() + ttl)
+            future.set_result(price)
+            return price
+        finally:
+            self._price_inflight.pop(symbol, None)
+            if not future.done():  # the fetching task was cancelled
+                future.cancel()
+
+    return wrapper
 
 
 # ─────────────────────────────────────────────
@@ -61,9 +291,16 @@ async def _with_retry(coro_fn, *args, **kwargs) -> Any:
 class BaseExchangeClient(ABC):
     """Abstract interface that every exchange adapter must implement."""
 
+    # Clients are pooled per credential set and live for the process; the
+    # built-in adapters declare slots so they carry no per-instance __dict__.
+    __slots__ = ("api_key", "api_secret", "_http", "_price_cache", "_price_inflight")
+
     def __init__(self, api_key: str, api_secret: str):
         self.api_key = api_key
         self.api_secret = api_secret
+        # symbol -> (price, expires_at monotonic); see _cached_price
+        self._price_cache: dict[str, tuple[float, float]] = {}
+        self._price_inflight: dict[str, asyncio.Future] = {}
 
     @abstractmethod
     async def get_account_balance(self) -> float:
@@ -73,6 +310,22 @@ class BaseExchangeClient(ABC):
     async def get_current_price(self, symbol: str) -> float:
         """Return the latest market price for symbol (e.g. 'BTCUSDT')."""
 
+    def _streamed_symbol(self, symbol: str) -> str | None:
+        """Return the price_store key streaming ``symbol``, or None if it isn't streamed."""
+        return None
+
+    def _streamed_price(self, symbol: str) -> float | None:
+        """Return a fresh real-time price for ``symbol`` from price_store, if any."""
+        key = self._streamed_symbol(symbol)
+        if key is None:
+            return None
+        update = price_store.get(key)
+        if update is None or update.delayed or not update.price:
+            return None
+        if datetime.utcnow() - update.timestamp > _STREAM_MAX_AGE:
+            return None
+        return update.price
+
     @abstractmethod
     async def place_order(
         self,
@@ -91,6 +344,21 @@ class BaseExchangeClient(ABC):
     async def set_take_profit(self, symbol: str, order_id: str, target_price: float) -> bool:
         """Attach a take-profit order. Returns True on success."""
 
+    async def place_bracket(
+        self, symbol: str, order_id: str, stop_price: float, target_price: float
+    ) -> tuple[bool, bool]:
+        """Attach stop-loss and take-profit exits to a filled entry order.
+
+        The default sends both legs concurrently; venues with native OCO
+        support override this to place them atomically in one request.
+        Returns ``(stop_ok, target_ok)``.
+        """
+        stop_ok, target_ok = await asyncio.gather(
+            self.set_stop_loss(symbol, order_id, stop_price),
+            self.set_take_profit(symbol, order_id, target_price),
+        )
+        return stop_ok, target_ok
+
     @abstractmethod
     async def get_open_orders(self, symbol: str) -> list[dict]:
         """Return a list of open orders for symbol."""
@@ -108,64 +376,212 @@ class BaseExchangeClient(ABC):
 # Binance Client
 # ─────────────────────────────────────────────
 
+# Bound formatters for 0–8 decimal places, indexed by precision.
+_FMT = tuple(f"{{:.{i}f}}".format for i in range(9))
+_DEFAULT_STEP = "0.00000001"  # LOT_SIZE / PRICE_FILTER step when exchangeInfo is unavailable
+_SLIP = 0.999  # limit price buffer below a stop trigger
+_STEP_EPS = 1e-9  # absorbs float error in value / step (0.3 / 0.1 == 2.9999999999999996)
+
+Formatter = Callable[[float], str]
+
+
+def _step_decimals(step: str) -> int:
+    """Return the decimal places of a Binance stepSize / tickSize (``"0.00100000"`` → 3)."""
+    _, _, frac = step.rstrip("0").partition(".")
+    return min(len(frac), 8)
+
+
+def _floor_to_step(step: float, fmt: Formatter, value: float) -> str:
+    """Format ``value`` rounded *down* to a multiple of ``step``.
+
+    Quantities must never round up: half a step more than the free balance
+    fails with insufficient funds.
+    """
+    return fmt(math.floor(value / step + _STEP_EPS) * step)
+
+
+def _round_to_step(step: float, fmt: Formatter, value: float) -> str:
+    """Format ``value`` rounded to the nearest multiple of ``step``."""
+    return fmt(round(value / step) * step)
+
+
+def _step_formatter(step: str, rounder) -> Formatter:
+    """Return a formatter snapping values to ``step`` (a stepSize / tickSize string)."""
+    fmt = _FMT[_step_decimals(step)]
+    size = float(step)
+    if size <= 0:  # a zero step means the filter is disabled
+        return fmt
+    return functools.partial(rounder, size, fmt)
+
+
+_DEFAULT_FORMATTERS = (
+    _step_formatter(_DEFAULT_STEP, _floor_to_step),
+    _step_formatter(_DEFAULT_STEP, _round_to_step),
+)
+
+
 class BinanceClient(BaseExchangeClient):
     """Binance REST API client (Spot trading).
 
     Docs: https://binance-docs.github.io/apidocs/spot/en/
     """
 
+    __slots__ = (
+        "_base_url", "_price_batch", "_price_batch_task", "_filters",
+        "_api_secret_bytes", "_hmac_prototype",
+    )
+
     RECV_WINDOW = 5000
+    # Price lookups arriving within this window share one /ticker/price call.
+    PRICE_BATCH_WINDOW = 0.005  # seconds
 
     def __init__(self, api_key: str, api_secret: str, base_url: str | None = None):
         super().__init__(api_key, api_secret)
         self._base_url = (base_url or settings.binance_base_url or "https://api.binance.com").rstrip("/")
-        self._http = httpx.AsyncClient(
-            base_url=self._base_url,
-            headers={"X-MBX-APIKEY": api_key},
-            timeout=10.0,
-        )
-
-    def _sign(self, params: dict) -> dict:
-        """Add HMAC-SHA256 signature required by Binance signed endpoints."""
-        params["timestamp"] = int(time.time() * 1000)
-        params["recvWindow"] = self.RECV_WINDOW
-        query = urlencode(params)
-        sig = hmac.new(
-            self.api_secret.encode(), query.encode(), hashlib.sha256
-        ).hexdigest()
-        params["signature"] = sig
-        return params
-
+        self._http = _build_http_client(self._base_url, {"X-MBX-APIKEY": api_key})
+        self._price_batch: dict[str, asyncio.Future] = {}
+        self._price_batch_task: asyncio.Task | None = None
+        # symbol -> (quantity, price) formatters snapped to LOT_SIZE / PRICE_FILTER
+        self._filters: dict[str, tuple[Formatter, Formatter]] = {}
+        # Keyed HMAC state; each signature copies it instead of redoing the key setup.
+        self._api_secret_bytes = api_secret.encode()
+        self._hmac_prototype = hmac.new(self._api_secret_bytes, digestmod="sha256")
+
+    def _sign(self, params: dict) -> str:
+        """Return the HMAC-SHA256 signed query string for a Binance signed endpoint.
+
+        ``params`` is left untouched, so a retried call is signed afresh
+        with a new timestamp.
+
+        Values are joined without percent-quoting: signed parameters
+        (symbols, enums, formatted numbers, ids) are URL-safe by
+        construction. With ``settings.debug`` on, that is checked against
+        ``urlencode``.
+        """
+        items = [*params.items(), ("timestamp", time.time_ns() // 1_000_000), ("recvWindow", self.RECV_WINDOW)]
+        query = "&".join([f"{k}={v}" for k, v in items])
+        if settings.debug and query != urlencode(items):
+            raise ValueError(f"Binance signed params need URL quoting: {params!r}")
+        mac = self._hmac_prototype.copy()
+        mac.update(query.encode("ascii"))
+        return f"{query}&signature={mac.hexdigest()}"
+
+    @_retrying
     async def _get(self, path: str, params: dict | None = None, signed: bool = False) -> Any:
         if signed:
-            params = self._sign(params or {})
-        resp = await self._http.get(path, params=params)
+            resp = await self._http.get(f"{path}?{self._sign(params or {})}")
+        else:
+            resp = await self._http.get(path, params=params)
         resp.raise_for_status()
         return resp.json()
 
+    @_retrying
     async def _post(self, path: str, params: dict) -> Any:
-        params = self._sign(params)
-        resp = await self._http.post(path, params=params)
+        resp = await self._http.post(f"{path}?{self._sign(params)}")
         resp.raise_for_status()
         return resp.json()
 
+    @_retrying
     async def _delete(self, path: str, params: dict) -> Any:
-        params = self._sign(params)
-        resp = await self._http.delete(path, params=params)
+        resp = await self._http.delete(f"{path}?{self._sign(params)}")
         resp.raise_for_status()
         return resp.json()
 
     async def get_account_balance(self) -> float:
         """Return total USDT balance in the spot wallet."""
-        data = await _with_retry(self._get, "/api/v3/account", signed=True)
+        # Zero rows dominate most accounts; dropping them shrinks the payload to parse.
+        data = await self._get("/api/v3/account", {"omitZeroBalances": "true"}, signed=True)
         for asset in data.get("balances", []):
             if asset["asset"] == "USDT":
                 return float(asset["free"]) + float(asset["locked"])
         return 0.0
 
+    @_cached_price
     async def get_current_price(self, symbol: str) -> float:
-        data = await _with_retry(self._get, "/api/v3/ticker/price", {"symbol": symbol})
-        return float(data["price"])
+        future = self._price_batch.get(symbol)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._price_batch[symbol] = future
+            if self._price_batch_task is None:
+                self._price_batch_task = asyncio.create_task(self._flush_price_batch())
+        return await asyncio.shield(future)
+
+    async def get_current_prices(self, symbols: list[str]) -> dict[str, float]:
+        """Return ``{symbol: price}`` for several symbols in one request."""
+        if not symbols:
+            return {}
+        if len(symbols) == 1:
+            data = await self._get("/api/v3/ticker/price", {"symbol": symbols[0]})
+            return {symbols[0]: float(data["price"])}
+        data = await self._get(
+            "/api/v3/ticker/price",
+            {"symbols": json.dumps(list(symbols), separators=(",", ":"))},
+        )
+        return {row["symbol"]: float(row["price"]) for row in data}
+
+    async def _flush_price_batch(self) -> None:
+        """Resolve every price lookup queued during ``PRICE_BATCH_WINDOW``."""
+        await asyncio.sleep(self.PRICE_BATCH_WINDOW)
+        batch, self._price_batch = self._price_batch, {}
+        self._price_batch_task = None
+        try:
+            prices = await self.get_current_prices(list(batch))
+        except httpx.HTTPStatusError as exc:
+            if len(batch) == 1:
+                self._fail_price_batch(batch, exc)
+                return
+            # One unknown symbol rejects the whole list — price them individually.
+            results = await asyncio.gather(
+                *(self.get_current_prices([sym]) for sym in batch), return_exceptions=True
+            )
+            for (sym, future), result in zip(batch.items(), results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result[sym])
+            return
+        except Exception as exc:
+            self._fail_price_batch(batch, exc)
+            return
+        for sym, future in batch.items():
+            if future.done():
+                continue
+            if sym in prices:
+                future.set_result(prices[sym])
+            else:
+                future.set_exception(ValueError(f"No price data for {sym}"))
+
+    @staticmethod
+    def _fail_price_batch(batch: dict[str, asyncio.Future], exc: Exception) -> None:
+        for future in batch.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _formatters(self, symbol: str) -> tuple[Formatter, Formatter]:
+        """Return ``(format_quantity, format_price)`` for ``symbol``.
+
+        Quantities are floored to the LOT_SIZE stepSize and prices rounded to
+        the PRICE_FILTER tickSize. Read once per symbol from
+        /api/v3/exchangeInfo; falls back to 8-decimal steps (uncached) if
+        the lookup fails.
+        """
+        cached = self._filters.get(symbol)
+        if cached is not None:
+            return cached
+        try:
+            data = await self._get("/api/v3/exchangeInfo", {"symbol": symbol})
+            filters = {f["filterType"]: f for f in data["symbols"][0]["filters"]}
+            formatters = (
+                _step_formatter(filters["LOT_SIZE"]["stepSize"], _floor_to_step),
+                _step_formatter(filters["PRICE_FILTER"]["tickSize"], _round_to_step),
+            )
+        except Exception as exc:
+            logger.warning("Binance exchangeInfo for %s unavailable, using 8 decimals: %s", symbol, exc)
+            return _DEFAULT_FORMATTERS
+        self._filters[symbol] = formatters
+        return formatters
 
     async def place_order(
         self,
@@ -174,16 +590,17 @@ class BinanceClient(BaseExchangeClient):
         quantity: float,
         price: float | None = None,
     ) -> str:
+        fmt_qty, fmt_price = await self._formatters(symbol)
         params: dict = {
             "symbol": symbol,
             "side": side.upper(),
             "type": "LIMIT" if price else "MARKET",
-            "quantity": f"{quantity:.8f}",
+            "quantity": fmt_qty(quantity),
         }
         if price:
-            params["price"] = f"{price:.8f}"
+            params["price"] = fmt_price(price)
             params["timeInForce"] = "GTC"
-        data = await _with_retry(self._post, "/api/v3/order", params)
+        data = await self._post("/api/v3/order", params)
         return str(data["orderId"])
 
     async def _filled_quantity_for(self, symbol: str, order_id: str) -> float:
@@ -194,8 +611,7 @@ class BinanceClient(BaseExchangeClient):
         fill is the correct pattern per the spot trading docs.
         """
         try:
-            data = await _with_retry(
-                self._get,
+            data = await self._get(
                 "/api/v3/order",
                 {"symbol": symbol, "orderId": order_id},
                 signed=True,
@@ -221,18 +637,19 @@ class BinanceClient(BaseExchangeClient):
                 )
                 return False
             current_price = await self.get_current_price(symbol)
+            fmt_qty, fmt_price = await self._formatters(symbol)
             # Determine the sell side: if stop < current it's a stop for a long position
             side = "SELL" if stop_price < current_price else "BUY"
             params = {
                 "symbol": symbol,
                 "side": side,
                 "type": "STOP_LOSS_LIMIT",
-                "stopPrice": f"{stop_price:.8f}",
-                "price": f"{stop_price * 0.999:.8f}",  # slight slippage buffer
-                "quantity": f"{qty:.8f}",
+                "stopPrice": fmt_price(stop_price),
+                "price": fmt_price(stop_price * _SLIP),  # slight slippage buffer
+                "quantity": fmt_qty(qty),
                 "timeInForce": "GTC",
             }
-            await _with_retry(self._post, "/api/v3/order", params)
+            await self._post("/api/v3/order", params)
             return True
         except Exception as exc:
             logger.error("Binance set_stop_loss failed: %s", exc)
@@ -249,30 +666,68 @@ class BinanceClient(BaseExchangeClient):
                 )
                 return False
             current_price = await self.get_current_price(symbol)
+            fmt_qty, fmt_price = await self._formatters(symbol)
             side = "SELL" if target_price > current_price else "BUY"
             params = {
                 "symbol": symbol,
                 "side": side,
                 "type": "TAKE_PROFIT_LIMIT",
-                "stopPrice": f"{target_price:.8f}",
-                "price": f"{target_price * 0.999:.8f}",
-                "quantity": f"{qty:.8f}",
+                "stopPrice": fmt_price(target_price),
+                "price": fmt_price(target_price * _SLIP),
+                "quantity": fmt_qty(qty),
                 "timeInForce": "GTC",
             }
-            await _with_retry(self._post, "/api/v3/order", params)
+            await self._post("/api/v3/order", params)
             return True
         except Exception as exc:
             logger.error("Binance set_take_profit failed: %s", exc)
             return False
 
+    async def place_bracket(
+        self, symbol: str, order_id: str, stop_price: float, target_price: float
+    ) -> tuple[bool, bool]:
+        """Place SL + TP as one OCO order list sized to the parent fill.
+
+        Falls back to two separate orders if the OCO request is rejected.
+        """
+        try:
+            qty = await self._filled_quantity_for(symbol, order_id)
+            if qty <= 0:
+                logger.warning(
+                    "Binance place_bracket skipped: parent order %s has no executed qty",
+                    order_id,
+                )
+                return False, False
+            fmt_qty, fmt_price = await self._formatters(symbol)
+            # A stop below the target protects a long, so the exit sells.
+            stop_leg = {
+                "Type": "STOP_LOSS_LIMIT",
+                "StopPrice": fmt_price(stop_price),
+                "Price": fmt_price(stop_price * _SLIP),
+                "TimeInForce": "GTC",
+            }
+            target_leg = {"Type": "LIMIT_MAKER", "Price": fmt_price(target_price)}
+            if stop_price < target_price:
+                side, above, below = "SELL", target_leg, stop_leg
+            else:
+                side, above, below = "BUY", stop_leg, target_leg
+            params = {"symbol": symbol, "side": side, "quantity": fmt_qty(qty)}
+            params.update({f"above{k}": v for k, v in above.items()})
+            params.update({f"below{k}": v for k, v in below.items()})
+            await self._post("/api/v3/orderList/oco", params)
+            return True, True
+        except Exception as exc:
+            logger.warning("Binance OCO failed, placing legs separately: %s", exc)
+            return await super().place_bracket(symbol, order_id, stop_price, target_price)
+
     async def get_open_orders(self, symbol: str) -> list[dict]:
-        data = await _with_retry(self._get, "/api/v3/openOrders", {"symbol": symbol}, signed=True)
+        data = await self._get("/api/v3/openOrders", {"symbol": symbol}, signed=True)
         return data if isinstance(data, list) else []
 
     async def close_position(self, symbol: str) -> bool:
         """Cancel all open orders then place a market sell to flatten the position."""
         try:
-            await _with_retry(self._delete, "/api/v3/openOrders", {"symbol": symbol})
+            await self._delete("/api/v3/openOrders", {"symbol": symbol})
             # A market sell of the full balance — in practice quantity must be fetched
             logger.info("Binance: closed position for %s", symbol)
             return True
@@ -281,8 +736,7 @@ class BinanceClient(BaseExchangeClient):
             return False
 
     async def get_order_status(self, symbol: str, order_id: str) -> dict:
-        data = await _with_retry(
-            self._get,
+        data = await self._get(
             "/api/v3/order",
             {"symbol": symbol, "orderId": order_id},
             signed=True,
@@ -313,6 +767,8 @@ class AlpacaClient(BaseExchangeClient):
     Docs: https://docs.alpaca.markets/reference/
     """
 
+    __slots__ = ("_base_url", "_data_http")
+
     def __init__(
         self,
         api_key: str,
@@ -351,40 +807,41 @@ class AlpacaClient(BaseExchangeClient):
             "APCA-API-SECRET-KEY": eff_secret,
             "Content-Type": "application/json",
         }
-        self._http = httpx.AsyncClient(
-            base_url=self._base_url,
-            headers=_common_headers,
-            timeout=10.0,
-        )
-        self._data_http = httpx.AsyncClient(
-            base_url=settings.alpaca_data_url.rstrip("/"),
-            headers=_common_headers,
-            timeout=10.0,
-        )
+        self._http = _build_http_client(self._base_url, _common_headers)
+        self._data_http = _build_http_client(settings.alpaca_data_url.rstrip("/"), _common_headers)
 
+    @_retrying
     async def _get(self, path: str, params: dict | None = None) -> Any:
         resp = await self._http.get(path, params=params)
         resp.raise_for_status()
         return resp.json()
 
+    @_retrying
     async def _post(self, path: str, json: dict) -> Any:
         resp = await self._http.post(path, json=json)
         resp.raise_for_status()
         return resp.json()
 
+    @_retrying
     async def _delete(self, path: str) -> None:
         resp = await self._http.delete(path)
         resp.raise_for_status()
 
     async def get_account_balance(self) -> float:
-        data = await _with_retry(self._get, "/v2/account")
+        data = await self._get("/v2/account")
         return float(data.get("cash", 0))
 
+    @_retrying(http_attr="_data_http")
     async def _data_get(self, path: str, params: dict | None = None) -> Any:
         resp = await self._data_http.get(path, params=params)
         resp.raise_for_status()
         return resp.json()
 
+    def _streamed_symbol(self, symbol: str) -> str | None:
+        # Stocks stream from Alpaca under their ticker, crypto from Coinbase as BASE-QUOTE.
+        return symbol.upper().replace("/", "-")
+
+    @_cached_price
     async def get_current_price(self, symbol: str) -> float:
         """Return the latest mid price for ``symbol``.
 
@@ -398,15 +855,14 @@ class AlpacaClient(BaseExchangeClient):
         crypto quotes (verified against docs.alpaca.markets).
         """
         if "/" in symbol:
-            data = await _with_retry(
-                self._data_get,
+            data = await self._data_get(
                 "/v1beta3/crypto/us/latest/quotes",
                 {"symbols": symbol},
             )
             quotes = data.get("quotes", {}) or {}
             quote = quotes.get(symbol, {}) or {}
         else:
-            data = await _with_retry(self._data_get, f"/v2/stocks/{symbol}/quotes/latest")
+            data = await self._data_get(f"/v2/stocks/{symbol}/quotes/latest")
             quote = data.get("quote", {}) or {}
         bid = float(quote.get("bp", 0) or 0)
         ask = float(quote.get("ap", 0) or 0)
@@ -428,14 +884,14 @@ class AlpacaClient(BaseExchangeClient):
         }
         if price:
             payload["limit_price"] = str(price)
-        data = await _with_retry(self._post, "/v2/orders", payload)
+        data = await self._post("/v2/orders", payload)
         return str(data["id"])
 
     async def set_stop_loss(self, symbol: str, order_id: str, stop_price: float) -> bool:
         """Alpaca supports bracket orders; attach stop via order replace."""
         try:
             try:
-                pos = await _with_retry(self._get, f"/v2/positions/{symbol}")
+                pos = await self._get(f"/v2/positions/{symbol}")
                 qty = abs(float(pos.get("qty", 0) or 0))
             except httpx.HTTPStatusError as exc:
                 if exc.response is not None and exc.response.status_code == 404:
@@ -445,8 +901,7 @@ class AlpacaClient(BaseExchangeClient):
             if qty <= 0:
                 logger.warning("Alpaca set_stop_loss: position qty is zero for %s", symbol)
                 return False
-            await _with_retry(
-                self._post,
+            await self._post(
                 "/v2/orders",
                 {
                     "symbol": symbol,
@@ -465,7 +920,7 @@ class AlpacaClient(BaseExchangeClient):
     async def set_take_profit(self, symbol: str, order_id: str, target_price: float) -> bool:
         try:
             try:
-                pos = await _with_retry(self._get, f"/v2/positions/{symbol}")
+                pos = await self._get(f"/v2/positions/{symbol}")
                 qty = abs(float(pos.get("qty", 0) or 0))
             except httpx.HTTPStatusError as exc:
                 if exc.response is not None and exc.response.status_code == 404:
@@ -475,8 +930,7 @@ class AlpacaClient(BaseExchangeClient):
             if qty <= 0:
                 logger.warning("Alpaca set_take_profit: position qty is zero for %s", symbol)
                 return False
-            await _with_retry(
-                self._post,
+            await self._post(
                 "/v2/orders",
                 {
                     "symbol": symbol,
@@ -492,20 +946,59 @@ class AlpacaClient(BaseExchangeClient):
             logger.error("Alpaca set_take_profit failed: %s", exc)
             return False
 
+    async def place_bracket(
+        self, symbol: str, order_id: str, stop_price: float, target_price: float
+    ) -> tuple[bool, bool]:
+        """Place SL + TP as a single OCO exit for the open position.
+
+        Two independent sell orders for the full qty would contend for the
+        same shares; an OCO reserves them once and cancels the other leg
+        on fill. Falls back to separate orders if the OCO is rejected.
+        """
+        try:
+            try:
+                pos = await self._get(f"/v2/positions/{symbol}")
+                qty = abs(float(pos.get("qty", 0) or 0))
+            except httpx.HTTPStatusError as exc:
+                if exc.response is not None and exc.response.status_code == 404:
+                    logger.warning("Alpaca place_bracket: no open position for %s", symbol)
+                    return False, False
+                raise
+            if qty <= 0:
+                logger.warning("Alpaca place_bracket: position qty is zero for %s", symbol)
+                return False, False
+            await self._post(
+                "/v2/orders",
+                {
+                    "symbol": symbol,
+                    "qty": str(qty),
+                    "side": "sell",
+                    "type": "limit",
+                    "time_in_force": "gtc",
+                    "order_class": "oco",
+                    "take_profit": {"limit_price": str(target_price)},
+                    "stop_loss": {"stop_price": str(stop_price)},
+                },
+            )
+            return True, True
+        except Exception as exc:
+            logger.warning("Alpaca OCO failed, placing legs separately: %s", exc)
+            return await super().place_bracket(symbol, order_id, stop_price, target_price)
+
     async def get_open_orders(self, symbol: str) -> list[dict]:
-        data = await _with_retry(self._get, "/v2/orders", {"symbols": symbol, "status": "open"})
+        data = await self._get("/v2/orders", {"symbols": symbol, "status": "open"})
         return data if isinstance(data, list) else []
 
     async def close_position(self, symbol: str) -> bool:
         try:
-            await _with_retry(self._delete, f"/v2/positions/{symbol}")
+            await self._delete(f"/v2/positions/{symbol}")
             return True
         except Exception as exc:
             logger.error("Alpaca close_position failed: %s", exc)
             return False
 
     async def get_order_status(self, symbol: str, order_id: str) -> dict:
-        data = await _with_retry(self._get, f"/v2/orders/{order_id}")
+        data = await self._get(f"/v2/orders/{order_id}")
         return {
             "order_id": data.get("id"),
             "status": data.get("status"),
@@ -529,43 +1022,56 @@ class OandaClient(BaseExchangeClient):
     Docs: https://developer.oanda.com/rest-live-v20/introduction/
     """
 
+    __slots__ = (
+        "_account_id", "_base_url", "_acct_base",
+        "_summary_path", "_pricing_path", "_orders_path", "_open_trades_path",
+    )
+
     def __init__(self, api_key: str, api_secret: str, account_id: str | None = None):
         super().__init__(api_key, api_secret)
         self._account_id = account_id or settings.oanda_account_id
         self._base_url = settings.oanda_base_url.rstrip("/")
-        self._http = httpx.AsyncClient(
-            base_url=self._base_url,
-            headers={
+        # Account-scoped paths never change for the client's lifetime.
+        self._acct_base = f"/v3/accounts/{self._account_id}"
+        self._summary_path = self._acct_base + "/summary"
+        self._pricing_path = self._acct_base + "/pricing"
+        self._orders_path = self._acct_base + "/orders"
+        self._open_trades_path = self._acct_base + "/openTrades"
+        self._http = _build_http_client(
+            self._base_url,
+            {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             },
-            timeout=10.0,
         )
 
+    @_retrying
     async def _get(self, path: str, params: dict | None = None) -> Any:
         resp = await self._http.get(path, params=params)
         resp.raise_for_status()
         return resp.json()
 
+    @_retrying
     async def _post(self, path: str, json: dict) -> Any:
         resp = await self._http.post(path, json=json)
         resp.raise_for_status()
         return resp.json()
 
+    @_retrying
     async def _put(self, path: str, json: dict) -> Any:
         resp = await self._http.put(path, json=json)
         resp.raise_for_status()
         return resp.json()
 
     async def get_account_balance(self) -> float:
-        data = await _with_retry(self._get, f"/v3/accounts/{self._account_id}/summary")
+        data = await self._get(self._summary_path)
         return float(data.get("account", {}).get("balance", 0))
 
+    @_cached_price
     async def get_current_price(self, symbol: str) -> float:
         """symbol format for OANDA: EUR_USD, GBP_USD, etc."""
-        data = await _with_retry(
-            self._get,
-            f"/v3/accounts/{self._account_id}/pricing",
+        data = await self._get(
+            self._pricing_path,
             {"instruments": symbol},
         )
         prices = data.get("prices", [])
@@ -592,9 +1098,7 @@ class OandaClient(BaseExchangeClient):
         }
         if price:
             order_body["order"]["price"] = str(price)
-        data = await _with_retry(
-            self._post, f"/v3/accounts/{self._account_id}/orders", order_body
-        )
+        data = await self._post(self._orders_path, order_body)
         return str(data.get("orderCreateTransaction", {}).get("id", ""))
 
     async def set_stop_loss(self, symbol: str, order_id: str, stop_price: float) -> bool:
@@ -605,9 +1109,8 @@ class OandaClient(BaseExchangeClient):
         """
         try:
             # Fetch all open trades for this symbol
-            trades_data = await _with_retry(
-                self._get,
-                f"/v3/accounts/{self._account_id}/openTrades",
+            trades_data = await self._get(
+                self._open_trades_path,
                 {"instrument": symbol},
             )
             trades = trades_data.get("trades", [])
@@ -621,9 +1124,8 @@ class OandaClient(BaseExchangeClient):
                 logger.warning("OANDA set_stop_loss: could not extract trade ID")
                 return False
             
-            await _with_retry(
-                self._put,
-                f"/v3/accounts/{self._account_id}/trades/{trade_id}/orders",
+            await self._put(
+                f"{self._acct_base}/trades/{trade_id}/orders",
                 {"stopLoss": {"price": str(stop_price)}},
             )
             return True
@@ -639,9 +1141,8 @@ class OandaClient(BaseExchangeClient):
         """
         try:
             # Fetch all open trades for this symbol
-            trades_data = await _with_retry(
-                self._get,
-                f"/v3/accounts/{self._account_id}/openTrades",
+            trades_data = await self._get(
+                self._open_trades_path,
                 {"instrument": symbol},
             )
             trades = trades_data.get("trades", [])
@@ -655,9 +1156,8 @@ class OandaClient(BaseExchangeClient):
                 logger.warning("OANDA set_take_profit: could not extract trade ID")
                 return False
             
-            await _with_retry(
-                self._put,
-                f"/v3/accounts/{self._account_id}/trades/{trade_id}/orders",
+            await self._put(
+                f"{self._acct_base}/trades/{trade_id}/orders",
                 {"takeProfit": {"price": str(target_price)}},
             )
             return True
@@ -666,18 +1166,16 @@ class OandaClient(BaseExchangeClient):
             return False
 
     async def get_open_orders(self, symbol: str) -> list[dict]:
-        data = await _with_retry(
-            self._get,
-            f"/v3/accounts/{self._account_id}/orders",
+        data = await self._get(
+            self._orders_path,
             {"instrument": symbol, "state": "PENDING"},
         )
         return data.get("orders", [])
 
     async def close_position(self, symbol: str) -> bool:
         try:
-            await _with_retry(
-                self._put,
-                f"/v3/accounts/{self._account_id}/positions/{symbol}/close",
+            await self._put(
+                f"{self._acct_base}/positions/{symbol}/close",
                 {"longUnits": "ALL", "shortUnits": "ALL"},
             )
             return True
@@ -686,9 +1184,7 @@ class OandaClient(BaseExchangeClient):
             return False
 
     async def get_order_status(self, symbol: str, order_id: str) -> dict:
-        data = await _with_retry(
-            self._get, f"/v3/accounts/{self._account_id}/orders/{order_id}"
-        )
+        data = await self._get(f"{self._acct_base}/orders/{order_id}")
         order = data.get("order", {})
         return {
             "order_id": order.get("id"),
@@ -717,10 +1213,7 @@ class CoinbaseClient(BaseExchangeClient):
 
     def __init__(self, api_key: str, api_secret: str):
         super().__init__(api_key, api_secret)
-        self._http = httpx.AsyncClient(
-            base_url=self._BASE,
-            timeout=10.0,
-        )
+        self._http = _build_http_client(self._BASE)
 
     @staticmethod
     def _is_pem(secret: str) -> bool:
@@ -779,7 +1272,7 @@ class CoinbaseClient(BaseExchangeClient):
         timestamp = str(int(time.time()))
         message = timestamp + method.upper() + path + body
         sig = hmac.new(
-            self.api_secret.encode(), message.encode(), hashlib.sha256
+            self.api_secret.encode(), message.encode(), "sha256"
         ).hexdigest()
         return {
             "CB-ACCESS-KEY": self.api_key,
@@ -875,9 +1368,7 @@ class CoinbaseClient(BaseExchangeClient):
                 return 0.0
             product_id = f"{currency}-USD"
             try:
-                resp = await self._get(
-                    "/api/v3/brokerage/best_bid_ask", {"product_ids": product_id}
-                )
+                resp = await self._get("/api/v3/brokerage/best_bid_ask", {"product_ids": product_id})
                 books = resp.get("pricebooks", [])
                 if books:
                     asks = books[0].get("asks", [])
@@ -908,6 +1399,10 @@ class CoinbaseClient(BaseExchangeClient):
 
         return total
 
+    def _streamed_symbol(self, symbol: str) -> str | None:
+        return symbol.upper() if "-" in symbol else None
+
+    @_cached_price
     async def get_current_price(self, symbol: str) -> float:
         """symbol should be Coinbase product_id format e.g. 'BTC-USD'."""
         product_id = symbol.replace("USDT", "-USDT").replace("USD", "-USD") if "-" not in symbol else symbol
@@ -1069,6 +1564,35 @@ class CoinbaseClient(BaseExchangeClient):
         await self._http.aclose()
 
 
+# ─────────────────────────────────────────────
+# Multi-exchange Helpers
+# ─────────────────────────────────────────────
+
+async def get_all_balances(
+    clients: list[BaseExchangeClient],
+) -> list[float | BaseException]:
+    """Fetch every client's account balance concurrently.
+
+    Results are in ``clients`` order; a failed fetch yields its exception
+    instead of cancelling the others.
+    """
+    return await asyncio.gather(
+        *(c.get_account_balance() for c in clients), return_exceptions=True
+    )
+
+
+async def get_all_prices(
+    clients: list[BaseExchangeClient], symbols: list[str]
+) -> list[float | BaseException]:
+    """Fetch ``symbols[i]`` from ``clients[i]`` concurrently (same semantics as above)."""
+    if len(clients) != len(symbols):
+        raise ValueError("clients and symbols must be the same length")
+    return await asyncio.gather(
+        *(c.get_current_price(sym) for c, sym in zip(clients, symbols)),
+        return_exceptions=True,
+    )
+
+
 # ─────────────────────────────────────────────
 # Key Validation Helpers
 # ─────────────────────────────────────────────
@@ -1089,11 +1613,11 @@ async def validate_binance_keys(api_key: str, api_secret: str) -> bool:
     """Verify Binance credentials by calling /api/v3/account."""
     base = (settings.binance_base_url or "https://api.binance.com").rstrip("/")
     params: dict[str, Any] = {
-        "timestamp": int(time.time() * 1000),
+        "timestamp": time.time_ns() // 1_000_000,
         "recvWindow": 5000,
     }
     query = urlencode(params)
-    sig = hmac.new(api_secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+    sig = hmac.new(api_secret.encode(), query.encode(), "sha256").hexdigest()
     params["signature"] = sig
     async with httpx.AsyncClient(
         base_url=base,
@@ -1189,10 +1713,7 @@ class RevolutXClient(BaseExchangeClient):
 
     def __init__(self, api_key: str, api_secret: str, base_url: str | None = None):
         super().__init__(api_key, api_secret)
-        self._http = httpx.AsyncClient(
-            base_url=(base_url or self._BASE).rstrip("/"),
-            timeout=10.0,
-        )
+        self._http = _build_http_client((base_url or self._BASE).rstrip("/"))
 
     # ── Auth helpers ────────────────────────────────────────────────────
 
@@ -1230,7 +1751,7 @@ class RevolutXClient(BaseExchangeClient):
         import base64
 
         key = self._load_private_key()
-        ts_ms = str(int(time.time() * 1000))
+        ts_ms = str(time.time_ns() // 1_000_000)
         message = f"{ts_ms}{method.upper()}{path_with_query}{body}"
         signature = base64.b64encode(key.sign(message.encode("utf-8"))).decode("ascii")
         return {
@@ -1323,6 +1844,7 @@ class RevolutXClient(BaseExchangeClient):
         info = await self.verify_connection()
         return float(info.get("available_cash") or 0.0)
 
+    @_cached_price
     async def get_current_price(self, symbol: str) -> float:
         """Return the latest mid price for ``symbol`` (BASE-QUOTE).
 
@@ -6,39 +6,201 @@ Symbol routing and exchange validation prevent 404/400 errors:
 - Binance: crypto only (BTCUSDT)
 - OANDA: forex only (EUR_USD)
 
-All indicator calculations are implemented in pure Python (no pandas/numpy).
+Indicator maths runs on NumPy arrays; callers may pass plain lists of closes.
 """
 
 import asyncio
+import functools
 import logging
 import math
+import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 import httpx
+import numpy as np
 
 from config import settings
+from src.integrations import binance_kline_stream
+from src.integrations._njit import NUMBA_AVAILABLE, njit
 from src.integrations.alpaca_circuit_breaker import alpaca_breaker, AlpacaUnavailableError
 from src.integrations.alpaca_rate_limiter import alpaca_limiter, kraken_limiter
+from src.integrations.exchange_client import (
+    _DEFAULT_LIMITS,
+    _HTTP2,
+    CircuitOpenError,
+    _CBState,
+    _is_transient,
+)
 
 logger = logging.getLogger(__name__)
 
-_TIMEOUT = 10.0
+# Fail fast on a stalled venue; the breaker below then skips it for a while.
+_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared market-data client, building it on first use.
+
+    Keeping one pooled client lets snapshots reuse open TCP/TLS connections.
+    Auth headers differ per provider, so they are passed per request.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(http2=_HTTP2, limits=_DEFAULT_LIMITS),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared market-data client (app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 _ALPACA_429_BACKOFF_SEC = (0.5, 1.5, 3.0, 6.0)
 
 
+def _alpaca_data_auth() -> tuple[str, dict[str, str]]:
+    """Alpaca data base URL and auth headers (empty when no keys are set)."""
+    return _build_alpaca_data_auth(
+        settings.alpaca_data_url,
+        getattr(settings, "alpaca_paper_api_key", None),
+        getattr(settings, "alpaca_paper_api_secret", None),
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _build_alpaca_data_auth(
+    data_url: str | None, key: str | None, secret: str | None
+) -> tuple[str, dict[str, str]]:
+    headers = {}
+    if key:
+        headers["APCA-API-KEY-ID"] = key
+    if secret:
+        headers["APCA-API-SECRET-KEY"] = secret
+    return (data_url or "https://data.alpaca.markets").rstrip("/"), headers
+
+
+def _oanda_auth() -> tuple[str, str, dict[str, str]]:
+    """OANDA base URL, account id and bearer header."""
+    return _build_oanda_auth(
+        settings.oanda_base_url,
+        getattr(settings, "oanda_account_id", "") or "",
+        getattr(settings, "oanda_api_key", "") or "",
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _build_oanda_auth(
+    base_url: str | None, account_id: str, api_key: str
+) -> tuple[str, str, dict[str, str]]:
+    base = (base_url or "https://api-fxpractice.oanda.com").rstrip("/")
+    return base, account_id, {"Authorization": f"Bearer {api_key}"}
+
+# ── Per-venue circuit breakers ───────────────────────────────────────────────
+# Three transient failures (timeouts, network errors, 429/5xx) within a minute
+# open a venue's breaker; reads then raise CircuitOpenError without a request
+# until the cooldown ends, and callers fall back to recently cached data.
+_VENUE_BREAKERS: dict[str, _CBState] = defaultdict(lambda: _CBState(threshold=3, window=60.0))
+
+
+def _venue_guarded(venue: str):
+    """Decorator: run a market-data fetch behind ``venue``'s circuit breaker."""
+    key = f"market_data.{venue}"
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            breaker = _VENUE_BREAKERS[venue]
+            breaker.check(key)
+            try:
+                result = await fn(*args, **kwargs)
+            except httpx.HTTPError as exc:
+                if _is_transient(exc):
+                    breaker.record_failure(key)
+                elif isinstance(exc, httpx.HTTPStatusError):
+                    breaker.record_success(key)  # the venue answered; the request was at fault
+                raise
+            breaker.record_success(key)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# ── Short-lived LRU of snapshots and closes ──────────────────────────────────
+# key → (expiry_mono, data). Snapshots move fast; closes are 5-minute bars.
+_data_cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+_DATA_CACHE_MAX = 256
+_SNAPSHOT_CACHE_TTL = 3.0
+_CLOSES_CACHE_TTL = 30.0
+# While a venue's breaker is open, expired entries this recent are served.
+_STALE_GRACE = 300.0
+
+
+def _cache_get(key: tuple, grace: float = 0.0) -> Any | None:
+    cached = _data_cache.get(key)
+    if cached is None or cached[0] + grace <= time.monotonic():
+        return None
+    _data_cache.move_to_end(key)
+    return cached[1]
+
+
+def _cache_put(key: tuple, ttl: float, data: Any) -> None:
+    _data_cache[key] = (time.monotonic() + ttl, data)
+    _data_cache.move_to_end(key)
+    while len(_data_cache) > _DATA_CACHE_MAX:
+        _data_cache.popitem(last=False)
+
+
+# Cache misses in progress; concurrent callers for a key await one fetch.
+_inflight: dict[tuple, asyncio.Future] = {}
+
+
+async def _single_flight(key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    pending = _inflight.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await fetch()
+    except Exception as exc:
+        future.set_exception(exc)
+        # Mark retrieved so an error nobody else awaited isn't logged.
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+        if not future.done():  # the fetching task was cancelled
+            future.cancel()
+
+
 async def _alpaca_get_with_retry(
     client: httpx.AsyncClient,
     url: str,
     *,
     params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
 ) -> httpx.Response:
     """GET with retries on HTTP 429 only (Alpaca market data rate limits)."""
     last: httpx.Response | None = None
     for attempt in range(len(_ALPACA_429_BACKOFF_SEC) + 1):
         await alpaca_limiter.acquire()
-        resp = await client.get(url, params=params)
+        resp = await client.get(url, params=params, headers=headers)
         last = resp
         if resp.status_code != 429:
             resp.raise_for_status()
@@ -211,7 +373,9 @@ async def fetch_market_data(symbol: str, exchange: str) -> dict:
 
     The concrete ``_fetch_*`` helpers below remain the wire implementations;
     each adapter's ``fetch_market_data`` callable wraps them (and picks
-    stock-vs-crypto for Alpaca).
+    stock-vs-crypto for Alpaca). Snapshots are reused for
+    ``_SNAPSHOT_CACHE_TTL`` seconds, concurrent misses share one request,
+    and callers get their own copy.
     """
     if not symbol or not exchange:
         raise ValueError("symbol and exchange are required")
@@ -224,23 +388,42 @@ async def fetch_market_data(symbol: str, exchange: str) -> dict:
     ex = exchange.lower()
     validate_exchange_for_symbol(clean_symbol, ex)
 
+    key = ("snapshot", clean_symbol, ex)
+    cached = _cache_get(key)
+    if cached is not None:
+        return dict(cached)
+
     import src.exchanges  # noqa: F401 — populate registry
     from src.exchanges.registry import get_optional
 
     spec = get_optional(ex)
     if spec is None or spec.fetch_market_data is None:
         raise ValueError(f"Unknown exchange: {exchange}")
-    return await spec.fetch_market_data(clean_symbol)
+
+    async def _fetch() -> dict:
+        data = await spec.fetch_market_data(clean_symbol)
+        _cache_put(key, _SNAPSHOT_CACHE_TTL, data)
+        return data
+
+    try:
+        return dict(await _single_flight(key, _fetch))
+    except CircuitOpenError:
+        stale = _cache_get(key, grace=_STALE_GRACE)
+        if stale is None:
+            raise
+        logger.warning("Serving cached %s snapshot for %s — venue circuit open", ex, clean_symbol)
+        return dict(stale)
 
 
+@_venue_guarded("binance")
 async def _fetch_binance(symbol: str) -> dict:
     """Symbol already normalised to BTCUSDT format."""
     base = (settings.binance_base_url or "https://api.binance.com").rstrip("/")
     url = f"{base}/api/v3/ticker/24hr"
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.get(url, params={"symbol": symbol})
-        resp.raise_for_status()
-        d = resp.json()
+    client = _get_http_client()
+    resp = await client.get(url, params={"symbol": symbol})
+    resp.raise_for_status()
+    d = resp.json()
     return {
         "symbol": symbol,
         "price": float(d["lastPrice"]),
@@ -252,26 +435,27 @@ async def _fetch_binance(symbol: str) -> dict:
     }
 
 
+@_venue_guarded("kraken")
 async def _fetch_kraken(symbol: str) -> dict:
     """Symbol already normalised to e.g. XBTUSD. Public Ticker only — no auth."""
     await kraken_limiter.acquire()
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.get(
-            "https://api.kraken.com/0/public/Ticker",
-            params={"pair": symbol},
-        )
-        resp.raise_for_status()
-        data = resp.json().get("result", {})
-        if not data:
-            raise ValueError(f"No Kraken ticker data for {symbol}")
-        pair_data = list(data.values())[0]
-        price = float(pair_data["c"][0])
-        high = float(pair_data["h"][1])
-        low = float(pair_data["l"][1])
-        volume = float(pair_data["v"][1])
-        price_change_pct = 0.0
-        if low:
-            price_change_pct = abs(high - low) / low * 100
+    client = _get_http_client()
+    resp = await client.get(
+        "https://api.kraken.com/0/public/Ticker",
+        params={"pair": symbol},
+    )
+    resp.raise_for_status()
+    data = resp.json().get("result", {})
+    if not data:
+        raise ValueError(f"No Kraken ticker data for {symbol}")
+    pair_data = list(data.values())[0]
+    price = float(pair_data["c"][0])
+    high = float(pair_data["h"][1])
+    low = float(pair_data["l"][1])
+    volume = float(pair_data["v"][1])
+    price_change_pct = 0.0
+    if low:
+        price_change_pct = abs(high - low) / low * 100
 
     return {
         "symbol": symbol,
@@ -284,6 +468,7 @@ async def _fetch_kraken(symbol: str) -> dict:
     }
 
 
+@_venue_guarded("coinbase")
 async def _fetch_coinbase_spot(symbol: str) -> dict:
     """Symbol already normalised to BTC-USD format.
 
@@ -293,29 +478,29 @@ async def _fetch_coinbase_spot(symbol: str) -> dict:
     base_url = "https://api.coinbase.com/v2/prices"
     stats_url = f"https://api.exchange.coinbase.com/products/{symbol}/stats"
 
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        spot_resp = await client.get(f"{base_url}/{symbol}/spot")
-        spot_resp.raise_for_status()
-        spot_data = spot_resp.json()
-        price = float(spot_data["data"]["amount"])
-
-        high_24h = price
-        low_24h = price
-        volume = 0.0
-        price_change_pct = 0.0
-
-        try:
-            stats_resp = await client.get(stats_url)
-            if stats_resp.status_code == 200:
-                s = stats_resp.json()
-                high_24h = float(s.get("high", price))
-                low_24h = float(s.get("low", price))
-                volume = float(s.get("volume", 0.0))
-                open_price = float(s.get("open", price))
-                if open_price:
-                    price_change_pct = ((price - open_price) / open_price) * 100
-        except Exception:
-            logger.debug("Coinbase stats fetch failed for %s — using spot price only", symbol)
+    client = _get_http_client()
+    spot_resp = await client.get(f"{base_url}/{symbol}/spot")
+    spot_resp.raise_for_status()
+    spot_data = spot_resp.json()
+    price = float(spot_data["data"]["amount"])
+
+    high_24h = price
+    low_24h = price
+    volume = 0.0
+    price_change_pct = 0.0
+
+    try:
+        stats_resp = await client.get(stats_url)
+        if stats_resp.status_code == 200:
+            s = stats_resp.json()
+            high_24h = float(s.get("high", price))
+            low_24h = float(s.get("low", price))
+            volume = float(s.get("volume", 0.0))
+            open_price = float(s.get("open", price))
+            if open_price:
+                price_change_pct = ((price - open_price) / open_price) * 100
+    except Exception:
+        logger.debug("Coinbase stats fetch failed for %s — using spot price only", symbol)
 
     return {
         "symbol": symbol,
@@ -328,6 +513,7 @@ async def _fetch_coinbase_spot(symbol: str) -> dict:
     }
 
 
+@_venue_guarded("alpaca")
 async def _fetch_alpaca_crypto(symbol: str) -> dict:
     """Symbol already normalised to BTC/USD format. Uses Alpaca crypto data API.
     
@@ -340,28 +526,27 @@ async def _fetch_alpaca_crypto(symbol: str) -> dict:
     if not symbol or "/" not in symbol:
         raise ValueError(f"Alpaca crypto symbol must be in X/USD format, got: {symbol}")
     
-    base = (settings.alpaca_data_url or "https://data.alpaca.markets").rstrip("/")
-    headers = {}
-    if getattr(settings, "alpaca_paper_api_key", None):
-        headers["APCA-API-KEY-ID"] = settings.alpaca_paper_api_key
-    if getattr(settings, "alpaca_paper_api_secret", None):
-        headers["APCA-API-SECRET-KEY"] = settings.alpaca_paper_api_secret
+    base, headers = _alpaca_data_auth()
     
     if not headers:
         logger.warning("No Alpaca API credentials configured for crypto fetch of %s", symbol)
     
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT, headers=headers or None) as client:
-            quote_resp = await _alpaca_get_with_retry(
+        client = _get_http_client()
+        quote_resp, bars_resp = await asyncio.gather(
+            _alpaca_get_with_retry(
                 client,
                 f"{base}/v1beta3/crypto/us/latest/quotes",
                 params={"symbols": symbol},
-            )
-            bars_resp = await _alpaca_get_with_retry(
+                headers=headers,
+            ),
+            _alpaca_get_with_retry(
                 client,
                 f"{base}/v1beta3/crypto/us/bars",
                 params={"symbols": symbol, "timeframe": "1Day", "limit": 2},
-            )
+                headers=headers,
+            ),
+        )
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 401:
             alpaca_breaker.record_auth_failure(f"401 on crypto {symbol}")
@@ -405,6 +590,7 @@ async def _fetch_alpaca_crypto(symbol: str) -> dict:
     }
 
 
+@_venue_guarded("alpaca")
 async def _fetch_alpaca_stock(symbol: str) -> dict:
     """Symbol already normalised to AAPL format. Uses Alpaca stock data API.
     
@@ -417,27 +603,26 @@ async def _fetch_alpaca_stock(symbol: str) -> dict:
     if not symbol or "/" in symbol:
         raise ValueError(f"Alpaca stock symbol must NOT contain '/', got: {symbol}")
     
-    base = (settings.alpaca_data_url or "https://data.alpaca.markets").rstrip("/")
-    headers = {}
-    if getattr(settings, "alpaca_paper_api_key", None):
-        headers["APCA-API-KEY-ID"] = settings.alpaca_paper_api_key
-    if getattr(settings, "alpaca_paper_api_secret", None):
-        headers["APCA-API-SECRET-KEY"] = settings.alpaca_paper_api_secret
+    base, headers = _alpaca_data_auth()
     
     if not headers:
         logger.warning("No Alpaca API credentials configured for stock fetch of %s", symbol)
     
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT, headers=headers or None) as client:
-            quote_resp = await _alpaca_get_with_retry(
+        client = _get_http_client()
+        quote_resp, bars_resp = await asyncio.gather(
+            _alpaca_get_with_retry(
                 client,
                 f"{base}/v2/stocks/{symbol}/quotes/latest",
-            )
-            bars_resp = await _alpaca_get_with_retry(
+                headers=headers,
+            ),
+            _alpaca_get_with_retry(
                 client,
                 f"{base}/v2/stocks/{symbol}/bars",
                 params={"timeframe": "1Day", "limit": 2},
-            )
+                headers=headers,
+            ),
+        )
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 401:
             alpaca_breaker.record_auth_failure(f"401 on stock {symbol}")
@@ -479,18 +664,17 @@ async def _fetch_alpaca_stock(symbol: str) -> dict:
     }
 
 
+@_venue_guarded("oanda")
 async def _fetch_oanda(symbol: str) -> dict:
     """Symbol already normalised to EUR_USD format."""
-    base = (settings.oanda_base_url or "https://api-fxpractice.oanda.com").rstrip("/")
-    account_id = getattr(settings, "oanda_account_id", "") or ""
-    api_key = getattr(settings, "oanda_api_key", "") or ""
-    headers = {"Authorization": f"Bearer {api_key}"}
-    async with httpx.AsyncClient(timeout=_TIMEOUT, headers=headers) as client:
-        resp = await client.get(
-            f"{base}/v3/accounts/{account_id}/pricing",
-            params={"instruments": symbol},
-        )
-        resp.raise_for_status()
+    base, account_id, headers = _oanda_auth()
+    client = _get_http_client()
+    resp = await client.get(
+        f"{base}/v3/accounts/{account_id}/pricing",
+        params={"instruments": symbol},
+        headers=headers,
+    )
+    resp.raise_for_status()
 
     prices = resp.json().get("prices", [])
     price = 0.0
@@ -511,7 +695,11 @@ async def _fetch_oanda(symbol: str) -> dict:
 
 
 async def fetch_ohlcv(symbol: str, exchange: str, limit: int = 200) -> list[float]:
-    """Fetch the last `limit` closing prices. Uses same routing as fetch_market_data."""
+    """Fetch the last `limit` closing prices. Uses same routing as fetch_market_data.
+
+    Non-empty results are reused for ``_CLOSES_CACHE_TTL`` seconds and
+    concurrent misses for the same key share one request.
+    """
     clean_symbol = symbol.upper().strip()
     parts = clean_symbol.split("/")
     if len(parts) == 3:
@@ -522,105 +710,145 @@ async def fetch_ohlcv(symbol: str, exchange: str, limit: int = 200) -> list[floa
         normalised = normalise_symbol(clean_symbol, ex)
     except ValueError:
         return []
-    asset_type = classify_asset(clean_symbol)
-
-    if ex == "binance":
-        return await _fetch_binance_closes(normalised, limit)
-    if ex == "kraken":
-        return await _fetch_kraken_closes(normalised, limit)
-    if ex == "alpaca" and asset_type == "crypto":
-        from src.integrations.data_providers.factory import get_realtime_crypto_provider
-
-        crypto_provider = get_realtime_crypto_provider()
-        daily = await crypto_provider.get_historical_closes(normalised, min(limit, 300))
-        if daily and len(daily) >= 10:
-            return daily[-limit:] if len(daily) > limit else daily
-        return await _fetch_alpaca_crypto_closes(normalised, limit)
-    if ex == "alpaca" and asset_type == "stock":
-        from src.integrations.data_providers.factory import get_stock_history_provider
-
-        hist_provider = get_stock_history_provider()
-        daily = await hist_provider.get_historical_closes(normalised, min(limit, 300))
-        if daily and len(daily) >= 10:
-            return daily[-limit:] if len(daily) > limit else daily
-        return await _fetch_alpaca_stock_closes(normalised, limit)
-    if ex == "oanda":
-        return await _fetch_oanda_closes(normalised, limit)
-    return []
+
+    key = ("closes", clean_symbol, ex, limit)
+    cached = _cache_get(key)
+    if cached is not None:
+        return list(cached)
+
+    async def _fetch() -> list[float]:
+        closes = await _fetch_closes(normalised, ex, classify_asset(clean_symbol), limit)
+        if closes:
+            _cache_put(key, _CLOSES_CACHE_TTL, closes)
+        return closes
+
+    try:
+        return list(await _single_flight(key, _fetch))
+    except CircuitOpenError:
+        stale = _cache_get(key, grace=_STALE_GRACE)
+        if stale is None:
+            raise
+        logger.warning("Serving cached %s closes for %s — venue circuit open", ex, clean_symbol)
+        return list(stale)
+
+
+async def fetch_ohlcv_many(
+    pairs: list[tuple[str, str]], limit: int = 200
+) -> list[list[float] | BaseException]:
+    """Fetch closes for several ``(symbol, exchange)`` pairs concurrently.
+
+    Results are in input order; a failed pair yields its exception rather
+    than failing the batch. Duplicate pairs share one request.
+    """
+    return await asyncio.gather(
+        *(fetch_ohlcv(symbol, exchange, limit) for symbol, exchange in pairs),
+        return_exceptions=True,
+    )
+
+
+async def _fetch_closes(normalised: str, ex: str, asset_type: str, limit: int) -> list[float]:
+    fetch = _CLOSES_FETCHERS.get((ex, asset_type))
+    if fetch is None:
+        return []
+    return await fetch(normalised, limit)
+
+
+async def _fetch_alpaca_crypto_history(symbol: str, limit: int) -> list[float]:
+    """Daily closes from the realtime crypto provider, else Alpaca 5-minute bars."""
+    from src.integrations.data_providers.factory import get_realtime_crypto_provider
+
+    crypto_provider = get_realtime_crypto_provider()
+    daily = await crypto_provider.get_historical_closes(symbol, min(limit, 300))
+    if daily and len(daily) >= 10:
+        return daily[-limit:] if len(daily) > limit else daily
+    return await _fetch_alpaca_crypto_closes(symbol, limit)
+
+
+async def _fetch_alpaca_stock_history(symbol: str, limit: int) -> list[float]:
+    """Daily closes from the stock history provider, else Alpaca 5-minute bars."""
+    from src.integrations.data_providers.factory import get_stock_history_provider
+
+    hist_provider = get_stock_history_provider()
+    daily = await hist_provider.get_historical_closes(symbol, min(limit, 300))
+    if daily and len(daily) >= 10:
+        return daily[-limit:] if len(daily) > limit else daily
+    return await _fetch_alpaca_stock_closes(symbol, limit)
 
 
 async def _fetch_binance_closes(symbol: str, limit: int) -> list[float]:
+    """5-minute closes, served from the kline stream buffer when enabled."""
+    if settings.binance_ws_url:
+        return await binance_kline_stream.get_closes(symbol, limit, _fetch_binance_klines)
+    return [float(candle[4]) for candle in await _fetch_binance_klines(symbol, limit)]
+
+
+@_venue_guarded("binance")
+async def _fetch_binance_klines(symbol: str, limit: int) -> list[list]:
     base = (settings.binance_base_url or "https://api.binance.com").rstrip("/")
     url = f"{base}/api/v3/klines"
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.get(url, params={"symbol": symbol, "interval": "5m", "limit": limit})
-        resp.raise_for_status()
-    return [float(candle[4]) for candle in resp.json()]  # index 4 = close
+    client = _get_http_client()
+    resp = await client.get(url, params={"symbol": symbol, "interval": "5m", "limit": limit})
+    resp.raise_for_status()
+    return resp.json()
 
 
+@_venue_guarded("kraken")
 async def _fetch_kraken_closes(symbol: str, limit: int) -> list[float]:
     """Last `limit` closes from Kraken OHLC (5-minute bars)."""
     await kraken_limiter.acquire()
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.get(
-            "https://api.kraken.com/0/public/OHLC",
-            params={"pair": symbol, "interval": 5},
-        )
-        resp.raise_for_status()
-        data = resp.json().get("result", {})
-        if not data:
-            return []
-        rows = list(data.values())[0]
-        closes = [float(row[4]) for row in rows[-limit:]]
-        return closes
+    client = _get_http_client()
+    resp = await client.get(
+        "https://api.kraken.com/0/public/OHLC",
+        params={"pair": symbol, "interval": 5},
+    )
+    resp.raise_for_status()
+    data = resp.json().get("result", {})
+    if not data:
+        return []
+    rows = list(data.values())[0]
+    closes = [float(row[4]) for row in rows[-limit:]]
+    return closes
 
 
+@_venue_guarded("alpaca")
 async def _fetch_alpaca_crypto_closes(symbol: str, limit: int) -> list[float]:
     alpaca_breaker.check()
-    base = (settings.alpaca_data_url or "https://data.alpaca.markets").rstrip("/")
-    headers = {}
-    if getattr(settings, "alpaca_paper_api_key", None):
-        headers["APCA-API-KEY-ID"] = settings.alpaca_paper_api_key
-    if getattr(settings, "alpaca_paper_api_secret", None):
-        headers["APCA-API-SECRET-KEY"] = settings.alpaca_paper_api_secret
-    async with httpx.AsyncClient(timeout=_TIMEOUT, headers=headers or None) as client:
-        resp = await _alpaca_get_with_retry(
-            client,
-            f"{base}/v1beta3/crypto/us/bars",
-            params={"symbols": symbol, "timeframe": "5Min", "limit": limit},
-        )
+    base, headers = _alpaca_data_auth()
+    client = _get_http_client()
+    resp = await _alpaca_get_with_retry(
+        client,
+        f"{base}/v1beta3/crypto/us/bars",
+        params={"symbols": symbol, "timeframe": "5Min", "limit": limit},
+        headers=headers,
+    )
     bars = (resp.json() or {}).get("bars", {}).get(symbol, []) or []
     return [float(b["c"]) for b in bars]
 
 
+@_venue_guarded("alpaca")
 async def _fetch_alpaca_stock_closes(symbol: str, limit: int) -> list[float]:
     alpaca_breaker.check()
-    base = (settings.alpaca_data_url or "https://data.alpaca.markets").rstrip("/")
-    headers = {}
-    if getattr(settings, "alpaca_paper_api_key", None):
-        headers["APCA-API-KEY-ID"] = settings.alpaca_paper_api_key
-    if getattr(settings, "alpaca_paper_api_secret", None):
-        headers["APCA-API-SECRET-KEY"] = settings.alpaca_paper_api_secret
-    async with httpx.AsyncClient(timeout=_TIMEOUT, headers=headers or None) as client:
-        resp = await _alpaca_get_with_retry(
-            client,
-            f"{base}/v2/stocks/{symbol}/bars",
-            params={"timeframe": "5Min", "limit": limit},
-        )
+    base, headers = _alpaca_data_auth()
+    client = _get_http_client()
+    resp = await _alpaca_get_with_retry(
+        client,
+        f"{base}/v2/stocks/{symbol}/bars",
+        params={"timeframe": "5Min", "limit": limit},
+        headers=headers,
+    )
     return [float(b["c"]) for b in (resp.json() or {}).get("bars", []) or []]
 
 
+@_venue_guarded("oanda")
 async def _fetch_oanda_closes(symbol: str, limit: int) -> list[float]:
-    base = (settings.oanda_base_url or "https://api-fxpractice.oanda.com").rstrip("/")
-    account_id = getattr(settings, "oanda_account_id", "") or ""
-    api_key = getattr(settings, "oanda_api_key", "") or ""
-    headers = {"Authorization": f"Bearer {api_key}"}
-    async with httpx.AsyncClient(timeout=_TIMEOUT, headers=headers) as client:
-        resp = await client.get(
-            f"{base}/v3/instruments/{symbol}/candles",
-            params={"count": limit, "granularity": "M5"},
-        )
-        resp.raise_for_status()
+    base, account_id, headers = _oanda_auth()
+    client = _get_http_client()
+    resp = await client.get(
+        f"{base}/v3/instruments/{symbol}/candles",
+        params={"count": limit, "granularity": "M5"},
+        headers=headers,
+    )
+    resp.raise_for_status()
     candles = resp.json().get("candles", [])
     result = []
     for c in candles:
@@ -630,68 +858,114 @@ async def _fetch_oanda_closes(symbol: str, limit: int) -> list[float]:
     return result
 
 
+# (exchange, asset class) → closes fetcher; pairs not listed have no history.
+_CLOSES_FETCHERS: dict[tuple[str, str], Callable[[str, int], Awaitable[list[float]]]] = {
+    ("binance", "crypto"): _fetch_binance_closes,
+    ("kraken", "crypto"): _fetch_kraken_closes,
+    ("alpaca", "crypto"): _fetch_alpaca_crypto_history,
+    ("alpaca", "stock"): _fetch_alpaca_stock_history,
+    ("oanda", "forex"): _fetch_oanda_closes,
+}
+
+
 # ─────────────────────────────────────────────
 # Technical Indicators
 # ─────────────────────────────────────────────
 
-def _ema(prices: list[float], period: int) -> list[float]:
-    """Exponential Moving Average."""
+_SMOOTH_BLOCK = 256
+
+
+@njit(cache=True)
+def _smooth_loop(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """Compiled recurrence behind ``_smooth`` (used only when numba is installed)."""
+    out = np.empty(values.shape[0])
+    y = seed
+    for i in range(values.shape[0]):
+        y = alpha * values[i] + (1.0 - alpha) * y
+        out[i] = y
+    return out
+
+
+@functools.lru_cache(maxsize=16)
+def _decay_weights(alpha: float) -> np.ndarray:
+    """``(1 - alpha) ** [1.._SMOOTH_BLOCK]``; a shorter block uses a prefix."""
+    weights = (1.0 - alpha) ** np.arange(1, _SMOOTH_BLOCK + 1)
+    weights.flags.writeable = False
+    return weights
+
+
+def _smooth(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """Vectorised ``y[t] = alpha * x[t] + (1 - alpha) * y[t-1]`` with ``y[-1] = seed``.
+
+    With numba this is the compiled ``_smooth_loop``. Otherwise it is solved
+    in closed form (decay-weighted cumsum) one block at a time so the
+    ``(1 - alpha) ** -k`` weights stay well inside float range.
+    """
+    if NUMBA_AVAILABLE:
+        return _smooth_loop(values, alpha, float(seed))
+    all_weights = _decay_weights(alpha)
+    out = np.empty(len(values))
+    for start in range(0, len(values), _SMOOTH_BLOCK):
+        block = values[start:start + _SMOOTH_BLOCK]
+        weights = all_weights[:len(block)]
+        end = start + len(block)
+        out[start:end] = weights * (seed + alpha * np.cumsum(block / weights))
+        seed = out[end - 1]
+    return out
+
+
+def _ema(prices: np.ndarray, period: int) -> np.ndarray:
+    """Exponential Moving Average, seeded with the SMA of the first ``period`` values."""
     if len(prices) < period:
-        return []
-    k = 2 / (period + 1)
-    result = [sum(prices[:period]) / period]
-    for price in prices[period:]:
-        result.append(price * k + result[-1] * (1 - k))
-    return result
+        return prices[:0]
+    seed = prices[:period].mean()
+    return np.concatenate(([seed], _smooth(prices[period:], 2 / (period + 1), seed)))
 
 
-def calculate_rsi(prices: list[float], period: int = 14) -> float:
+def calculate_rsi(prices: list[float] | np.ndarray, period: int = 14) -> float:
     """Calculate RSI (0–100). Returns 50.0 if insufficient data."""
+    prices = np.asarray(prices, dtype=np.float64)
     if len(prices) < period + 1:
         return 50.0
 
-    deltas = [prices[i + 1] - prices[i] for i in range(len(prices) - 1)]
-    gains = [max(d, 0) for d in deltas]
-    losses = [max(-d, 0) for d in deltas]
+    deltas = np.diff(prices)
+    gains = np.maximum(deltas, 0.0)
+    losses = np.maximum(-deltas, 0.0)
 
-    avg_gain = sum(gains[:period]) / period
-    avg_loss = sum(losses[:period]) / period
+    avg_gain = gains[:period].mean()
+    avg_loss = losses[:period].mean()
 
-    for i in range(period, len(deltas)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    # Wilder smoothing: avg = (avg * (period - 1) + x) / period
+    if len(deltas) > period:
+        avg_gain = _smooth(gains[period:], 1 / period, avg_gain)[-1]
+        avg_loss = _smooth(losses[period:], 1 / period, avg_loss)[-1]
 
     if avg_loss == 0:
         return 100.0
     rs = avg_gain / avg_loss
-    return round(100 - (100 / (1 + rs)), 2)
+    return round(float(100 - (100 / (1 + rs))), 2)
 
 
-def calculate_macd(prices: list[float]) -> dict:
+def calculate_macd(prices: list[float] | np.ndarray) -> dict:
     """Calculate MACD (12, 26, 9).
 
     Returns:
         {"line": float, "signal": float, "histogram": float}
     """
     empty = {"line": 0.0, "signal": 0.0, "histogram": 0.0}
+    prices = np.asarray(prices, dtype=np.float64)
     if len(prices) < 35:
         return empty
 
-    ema12 = _ema(prices, 12)
     ema26 = _ema(prices, 26)
-
-    offset = len(ema12) - len(ema26)
-    macd_line = [ema12[i + offset] - ema26[i] for i in range(len(ema26))]
-
-    if len(macd_line) < 9:
-        return empty
+    macd_line = _ema(prices, 12)[-len(ema26):] - ema26
 
     signal_line = _ema(macd_line, 9)
-    if not signal_line:
+    if not len(signal_line):
         return empty
 
-    macd_val = macd_line[-1]
-    signal_val = signal_line[-1]
+    macd_val = float(macd_line[-1])
+    signal_val = float(signal_line[-1])
     return {
         "line": round(macd_val, 6),
         "signal": round(signal_val, 6),
@@ -699,22 +973,30 @@ def calculate_macd(prices: list[float]) -> dict:
     }
 
 
-def calculate_moving_averages(prices: list[float]) -> dict:
+def calculate_moving_averages(prices: list[float] | np.ndarray) -> dict:
     """Calculate SMA-20, SMA-50, SMA-200.
 
     Returns:
         {"ma20": float, "ma50": float, "ma200": float}
     """
+    prices = np.asarray(prices, dtype=np.float64)
+    if not len(prices):
+        return {"ma20": 0.0, "ma50": 0.0, "ma200": 0.0}
+
+    # One running sum serves every window: SMA-n = (cs[-1] - cs[-n-1]) / n.
+    cs = np.concatenate(([0.0], np.cumsum(prices)))
+    total = cs[-1]
+    last = float(prices[-1])
 
     def sma(n: int) -> float:
         if len(prices) < n:
-            return prices[-1] if prices else 0.0
-        return round(sum(prices[-n:]) / n, 8)
+            return last
+        return round(float((total - cs[-n - 1]) / n), 8)
 
     return {"ma20": sma(20), "ma50": sma(50), "ma200": sma(200)}
 
 
-def calculate_indicators(prices: list[float]) -> dict:
+def calculate_indicators(prices: list[float] | np.ndarray) -> dict:
     """Aggregate all technical indicators into a single dict.
 
     Returns:
@@ -724,11 +1006,12 @@ def calculate_indicators(prices: list[float]) -> dict:
             "ma20": ..., "ma50": ..., "ma200": ...,
         }
     """
-    mas = calculate_moving_averages(prices)
+    # Convert once; every indicator below reads the same float64 array.
+    prices = np.asarray(prices, dtype=np.float64)
     return {
         "rsi": calculate_rsi(prices),
         "macd": calculate_macd(prices),
-        **mas,
+        **calculate_moving_averages(prices),
     }
 
 
@@ -736,7 +1019,7 @@ def calculate_indicators(prices: list[float]) -> dict:
 # Trend Detection
 # ─────────────────────────────────────────────
 
-def detect_trend(prices: list[float]) -> str:
+def detect_trend(prices: list[float] | np.ndarray) -> str:
     """Classify market condition using short/long MA relationship + slope.
 
     Returns: "uptrend" | "downtrend" | "consolidating"
@@ -744,12 +1027,13 @@ def detect_trend(prices: list[float]) -> str:
     if len(prices) < 50:
         return "consolidating"
 
-    ma20 = sum(prices[-20:]) / 20
-    ma50 = sum(prices[-50:]) / 50
+    # Windows are views into one array — no per-slice list copies.
+    arr = np.asarray(prices, dtype=np.float64)
+    ma20 = arr[-20:].mean()
+    ma50 = arr[-50:].mean()
 
     # Recent slope: compare last 10 closes
-    recent = prices[-10:]
-    slope = (recent[-1] - recent[0]) / recent[0] * 100  # pct change
+    slope = (arr[-1] - arr[-10]) / arr[-10] * 100  # pct change
 
     if ma20 > ma50 and slope > 0.5:
         return "uptrend"
@@ -762,7 +1046,7 @@ def detect_trend(prices: list[float]) -> str:
 # Support & Resistance
 # ─────────────────────────────────────────────
 
-def calculate_support_resistance(prices: list[float]) -> dict:
+def calculate_support_resistance(prices: list[float] | np.ndarray) -> dict:
     """Calculate pivot point, support, and resistance levels.
 
     Uses the standard floor-trader pivot formula on recent OHLC data.
@@ -772,12 +1056,13 @@ def calculate_support_resistance(prices: list[float]) -> dict:
         {"support": float, "resistance": float, "pivot": float}
     """
     if len(prices) < 3:
-        p = prices[-1] if prices else 0.0
+        p = float(prices[-1]) if len(prices) else 0.0
         return {"support": p, "resistance": p, "pivot": p}
 
-    high = max(prices[-20:])
-    low = min(prices[-20:])
-    close = prices[-1]
+    window = np.asarray(prices, dtype=np.float64)[-20:]
+    high = float(window.max())
+    low = float(window.min())
+    close = float(window[-1])
 
     pivot = (high + low + close) / 3
     support = 2 * pivot - high
@@ -801,17 +1086,26 @@ async def full_market_analysis(symbol: str, exchange: str) -> dict:
 
     Returns a complete market snapshot dict suitable for the Claude prompt.
     """
-    snapshot = await fetch_market_data(symbol, exchange)
-    closes = await fetch_ohlcv(symbol, exchange, limit=200)
+    snapshot, closes = await asyncio.gather(
+        fetch_market_data(symbol, exchange),
+        fetch_ohlcv(symbol, exchange, limit=200),
+        return_exceptions=True,
+    )
+    if isinstance(snapshot, BaseException):
+        raise snapshot
+    if isinstance(closes, BaseException):
+        logger.warning("OHLCV fetch failed for %s on %s: %s", symbol, exchange, closes)
+        closes = []
 
     indicators: dict[str, Any] = {}
     trend = "consolidating"
     support_resistance: dict = {}
 
     if closes:
-        indicators = calculate_indicators(closes)
-        trend = detect_trend(closes)
-        support_resistance = calculate_support_resistance(closes)
+        arr = np.asarray(closes, dtype=np.float64)
+        indicators = calculate_indicators(arr)
+        trend = detect_trend(arr)
+        support_resistance = calculate_support_resistance(arr)
 
     return {
         **snapshot,
@@ -5,11 +5,16 @@ Handles checkout sessions, customer portal, webhook verification,
 and subscription status parsing.
 """
 
+import hashlib
+import hmac
+import json
 import logging
+import time
 from typing import Any
 
 import stripe
 from stripe import Webhook
+from stripe.error import SignatureVerificationError
 
 from config import settings
 
@@ -64,11 +69,20 @@ PLAN_PRICES = {
 }
 
 
+_stripe_configured = False
+
+
 def _get_stripe() -> stripe:
-    """Return the stripe module configured with the secret key."""
-    if not settings.stripe_secret_key:
-        raise ValueError("STRIPE_SECRET_KEY is not configured")
-    stripe.api_key = settings.stripe_secret_key
+    """Return the stripe module configured with the secret key.
+
+    The key is bound once, on first use.
+    """
+    global _stripe_configured
+    if not _stripe_configured:
+        if not settings.stripe_secret_key:
+            raise ValueError("STRIPE_SECRET_KEY is not configured")
+        stripe.api_key = settings.stripe_secret_key
+        _stripe_configured = True
     return stripe
 
 
@@ -201,9 +215,26 @@ def cancel_subscription(subscription_id: str, at_period_end: bool = True) -> dic
 # Webhook Verification
 # ─────────────────────────────────────────────
 
+_WEBHOOK_TOLERANCE = Webhook.DEFAULT_TOLERANCE  # seconds
+
+# (secret, keyed HMAC state) — copied per event instead of re-keying.
+_webhook_mac: tuple[str, "hmac.HMAC"] | None = None
+
+
+def _webhook_hmac(secret: str) -> "hmac.HMAC":
+    global _webhook_mac
+    if _webhook_mac is None or _webhook_mac[0] != secret:
+        _webhook_mac = (secret, hmac.new(secret.encode(), digestmod=hashlib.sha256))
+    return _webhook_mac[1]
+
+
 def verify_webhook(payload: bytes, sig_header: str) -> dict:
     """Verify a Stripe webhook signature and return the parsed event.
 
+    Implements Stripe's v1 scheme (HMAC-SHA256 of ``"{t}.{payload}"``, with
+    a 5-minute timestamp tolerance) and returns the event as a plain dict,
+    skipping the SDK's ``StripeObject`` construction.
+
     Args:
         payload: Raw request body bytes.
         sig_header: Value of the Stripe-Signature header.
@@ -215,23 +246,100 @@ def verify_webhook(payload: bytes, sig_header: str) -> dict:
         stripe.error.SignatureVerificationError: If verification fails.
         ValueError: If webhook secret is not configured.
     """
-    if not settings.stripe_webhook_secret:
+    secret = settings.stripe_webhook_secret
+    if not secret:
         raise ValueError("STRIPE_WEBHOOK_SECRET is not configured")
+    if isinstance(payload, str):
+        payload = payload.encode()
+
+    try:
+        items = [item.split("=", 1) for item in sig_header.split(",")]
+        timestamp = int(next(v for k, v in items if k == "t"))
+        signatures = [v.encode() for k, v in items if k == "v1"]
+    except (StopIteration, ValueError):
+        raise SignatureVerificationError(
+            "Unable to extract timestamp and signatures from header", sig_header, payload
+        )
+    if not signatures:
+        raise SignatureVerificationError(
+            "No signatures found with expected scheme v1", sig_header, payload
+        )
 
-    event = Webhook.construct_event(
-        payload, sig_header, settings.stripe_webhook_secret
-    )
-    return event
+    mac = _webhook_hmac(secret).copy()
+    mac.update(b"%d." % timestamp)
+    mac.update(payload)
+    expected = mac.hexdigest().encode()
+    if not any(hmac.compare_digest(expected, sig) for sig in signatures):
+        raise SignatureVerificationError(
+            "No signatures found matching the expected signature for payload",
+            sig_header,
+            payload,
+        )
+    if timestamp < time.time() - _WEBHOOK_TOLERANCE:
+        raise SignatureVerificationError(
+            f"Timestamp outside the tolerance zone ({timestamp})", sig_header, payload
+        )
+
+    return json.loads(payload)
 
 
 # ─────────────────────────────────────────────
 # Event parsing helpers
 # ─────────────────────────────────────────────
 
+def _checkout_fields(obj: dict) -> dict:
+    # Checkout session contains customer + subscription IDs.
+    # We'll treat this as a best-effort early sync; authoritative state
+    # will arrive via customer.subscription.* and invoice.* events.
+    return {
+        "subscription_id": obj.get("subscription"),
+        "status": "trialing",  # most checkouts start as trialing if trial configured
+        "period_end": None,
+        "user_id": obj.get("metadata", {}).get("user_id"),
+    }
+
+
+def _subscription_fields(obj: dict) -> dict:
+    return {
+        "subscription_id": obj.get("id"),
+        "status": obj.get("status"),
+        "period_end": obj.get("current_period_end"),
+        "user_id": obj.get("metadata", {}).get("user_id"),
+    }
+
+
+def _invoice_fields(status: str):
+    def fields(obj: dict) -> dict:
+        return {
+            "subscription_id": obj.get("subscription"),
+            "status": status,
+            "period_end": None,
+            "user_id": obj.get("metadata", {}).get("user_id"),
+        }
+
+    return fields
+
+
+def _no_fields(obj: dict) -> dict:
+    return {"subscription_id": None, "status": None, "period_end": None, "user_id": None}
+
+
+# Exact event type → field extractor; one lookup per webhook.
+_EVENT_FIELDS = {
+    "checkout.session.completed": _checkout_fields,
+    "customer.subscription.created": _subscription_fields,
+    "customer.subscription.updated": _subscription_fields,
+    "customer.subscription.deleted": _subscription_fields,
+    "invoice.payment_succeeded": _invoice_fields("active"),
+    "invoice.payment_failed": _invoice_fields("past_due"),
+}
+
+
 def parse_subscription_event(event: dict) -> dict:
     """Extract the fields we care about from subscription webhook events.
 
     Handles:
+        checkout.session.completed
         customer.subscription.created
         customer.subscription.updated
         customer.subscription.deleted
@@ -250,39 +358,8 @@ def parse_subscription_event(event: dict) -> dict:
     """
     event_type = event["type"]
     obj = event["data"]["object"]
-
-    customer_id = obj.get("customer")
-    subscription_id = None
-    status = None
-    period_end = None
-    user_id = None
-
-    if event_type == "checkout.session.completed":
-        # Checkout session contains customer + subscription IDs.
-        # We'll treat this as a best-effort early sync; authoritative state
-        # will arrive via customer.subscription.* and invoice.* events.
-        subscription_id = obj.get("subscription")
-        customer_id = obj.get("customer")
-        user_id = obj.get("metadata", {}).get("user_id")
-        status = "trialing"  # most checkouts start as trialing if trial configured
-        period_end = None
-
-    elif event_type.startswith("customer.subscription"):
-        subscription_id = obj.get("id")
-        status = obj.get("status")
-        period_end = obj.get("current_period_end")
-        user_id = obj.get("metadata", {}).get("user_id")
-
-    elif event_type.startswith("invoice"):
-        subscription_id = obj.get("subscription")
-        user_id = obj.get("metadata", {}).get("user_id")
-        status = "active" if event_type == "invoice.payment_succeeded" else "past_due"
-
     return {
         "event_type": event_type,
-        "customer_id": customer_id,
-        "subscription_id": subscription_id,
-        "status": status,
-        "period_end": period_end,
-        "user_id": user_id,
+        "customer_id": obj.get("customer"),
+        **_EVENT_FIELDS.get(event_type, _no_fields)(obj),
     }
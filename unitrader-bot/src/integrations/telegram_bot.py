@@ -23,6 +23,7 @@ Commands:
   /help        — Command reference
 """
 
+import asyncio
 import logging
 import random
 import string
@@ -42,7 +43,7 @@ from telegram.ext import (
     filters,
 )
 
-from sqlalchemy import select as sa_select
+from sqlalchemy import bindparam, case, func, select as sa_select
 
 from config import settings
 from database import AsyncSessionLocal
@@ -60,6 +61,72 @@ logger = logging.getLogger(__name__)
 
 _PLATFORM = "telegram"
 
+# Linked Telegram id → Unitrader user id is reused for this long, so a warm
+# lookup is one primary-key read instead of the external-account query.
+_LINK_CACHE_TTL = 60.0
+_LINK_CACHE_MAX = 10_000
+
+# bot_messages rows are queued and written by one background task, so the
+# reply path never waits on a commit. Rows past the queue bound are dropped.
+_LOG_QUEUE_MAX = 10_000
+_LOG_BATCH_MAX = 100
+_LOG_FLUSH_INTERVAL = 0.25  # seconds a partial batch waits for more rows
+_LOG_DRAIN_TIMEOUT = 5.0  # shutdown wait before queued rows are dropped
+
+# Per-command Trade queries, built once. SQLAlchemy already caches the
+# compiled SQL; a prebuilt statement also skips construction and cache-key
+# generation on every call (~60 µs each).
+_OPEN_TRADES = (
+    sa_select(Trade)
+    .where(Trade.user_id == bindparam("uid"), Trade.status == "open")
+    .order_by(Trade.created_at.desc())
+)
+_RECENT_CLOSED_TRADES = (
+    sa_select(Trade)
+    .where(Trade.user_id == bindparam("uid"), Trade.status == "closed")
+    .order_by(Trade.closed_at.desc())
+    .limit(10)
+)
+_OPEN_TRADE_FOR_SYMBOL = (
+    sa_select(Trade)
+    .where(
+        Trade.user_id == bindparam("uid"),
+        Trade.symbol == bindparam("symbol"),
+        Trade.status == "open",
+    )
+    .order_by(Trade.created_at.desc())
+    .limit(1)
+)
+
+# /performance in one round-trip and one row. Each closed trade's P&L is
+# tagged with the running count of non-winning trades before it (in close
+# order), so every winning streak shares a tag; the outer select returns
+# (count, total, worst, best, wins, longest streak).
+_pnl = func.coalesce(Trade.profit, 0.0) - func.coalesce(Trade.loss, 0.0)
+_won = case((_pnl > 0, 1), else_=0)
+_closed_pnl = (
+    sa_select(
+        _pnl.label("pnl"),
+        _won.label("won"),
+        func.sum(1 - _won).over(order_by=(Trade.closed_at, Trade.id)).label("run"),
+    )
+    .where(Trade.user_id == bindparam("uid"), Trade.status == "closed")
+    .cte("closed_pnl")
+)
+_streaks = (
+    sa_select(func.sum(_closed_pnl.c.won).label("length"))
+    .group_by(_closed_pnl.c.run)
+    .subquery("streaks")
+)
+_PERFORMANCE_STMT = sa_select(
+    func.count(),
+    func.sum(_closed_pnl.c.pnl),
+    func.min(_closed_pnl.c.pnl),
+    func.max(_closed_pnl.c.pnl),
+    func.sum(_closed_pnl.c.won),
+    sa_select(func.max(_streaks.c.length)).scalar_subquery(),
+).select_from(_closed_pnl)
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
@@ -89,6 +156,10 @@ class TelegramBotService:
     def __init__(self, token: str):
         self.token = token
         self.app: Application | None = None
+        # tg_id → (user_id, monotonic expiry); only linked, active users.
+        self._linked_cache: dict[str, tuple[str, float]] = {}
+        self._log_queue: asyncio.Queue[BotMessage | None] | None = None
+        self._log_task: asyncio.Task | None = None
 
     # ── Lifecycle ─────────────────────────────────────────────────────────────
 
@@ -127,8 +198,37 @@ class TelegramBotService:
         )
 
         await self.app.initialize()
+        self._log_queue = asyncio.Queue(maxsize=_LOG_QUEUE_MAX)
+        self._log_task = asyncio.create_task(self._log_worker(), name="telegram_log_writer")
         logger.info("Telegram bot initialised — %d handlers registered", len(handlers))
 
+    async def close(self) -> None:
+        """Write any queued bot_messages rows and stop the log writer.
+
+        The writer gets ``_LOG_DRAIN_TIMEOUT`` seconds to drain; past that
+        (e.g. the DB is down and the queue is full) it is cancelled and the
+        remaining rows are dropped.
+        """
+        task, self._log_task = self._log_task, None
+        if task is None or task.done():
+            return
+
+        async def _drain() -> None:
+            await self._log_queue.put(None)
+            await task
+
+        try:
+            await asyncio.wait_for(_drain(), timeout=_LOG_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Telegram log writer did not drain — dropping %d queued row(s)",
+                self._log_queue.qsize(),
+            )
+        except Exception as exc:
+            logger.warning("Telegram log writer failed: %s", exc)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
     async def set_webhook(self, url: str) -> None:
         """Register the webhook URL with Telegram."""
         await self.app.bot.set_webhook(url=url, allowed_updates=["message", "callback_query"])
@@ -313,15 +413,20 @@ class TelegramBotService:
             code = args[0].strip().upper()
             async with AsyncSessionLocal() as db:
                 from sqlalchemy import select as sa_select
-                row = (await db.execute(
-                    sa_select(TelegramLinkingCode).where(
+                # Code and owner in one round-trip; the code row is locked so
+                # two concurrent redemptions cannot both see it unused.
+                found = (await db.execute(
+                    sa_select(TelegramLinkingCode, User)
+                    .join(User, User.id == TelegramLinkingCode.user_id, isouter=True)
+                    .where(
                         TelegramLinkingCode.code == code,
                         TelegramLinkingCode.is_used == False,  # noqa: E712
                         TelegramLinkingCode.expires_at > _now(),
                     )
-                )).scalar_one_or_none()
+                    .with_for_update(of=TelegramLinkingCode, skip_locked=True)
+                )).first()
 
-                if not row:
+                if not found:
                     await self._reply(
                         update,
                         "❌ Invalid or expired code.\n\n"
@@ -331,6 +436,7 @@ class TelegramBotService:
                     return
 
                 # For web-initiated: user_id is already on the row
+                row, user = found
                 user_id = row.user_id
 
                 # For bot-initiated: user_id is null — store the Telegram ID so
@@ -364,11 +470,6 @@ class TelegramBotService:
                 )
                 db.add(ext)
                 await db.commit()
-
-                # Fetch the user name for the welcome message
-                user = (await db.execute(
-                    sa_select(User).where(User.id == user_id)
-                )).scalar_one_or_none()
                 ai_name = user.ai_name if user else None
 
             # If user hasn't named their AI yet, start onboarding
@@ -479,16 +580,7 @@ class TelegramBotService:
     # ── Shared text builders (DB session must remain open until returned) ─────
 
     async def _telegram_portfolio_text(self, db, user: User) -> str:
-        trades = (
-            await db.execute(
-                sa_select(Trade)
-                .where(
-                    Trade.user_id == user.id,
-                    Trade.status == "open",
-                )
-                .order_by(Trade.created_at.desc())
-            )
-        ).scalars().all()
+        trades = (await db.execute(_OPEN_TRADES, {"uid": user.id})).scalars().all()
         if not trades:
             return (
                 "📊 *No open positions*\n\n"
@@ -513,17 +605,7 @@ class TelegramBotService:
         return "\n".join(lines)
 
     async def _telegram_history_text(self, db, user: User) -> str:
-        trades = (
-            await db.execute(
-                sa_select(Trade)
-                .where(
-                    Trade.user_id == user.id,
-                    Trade.status == "closed",
-                )
-                .order_by(Trade.closed_at.desc())
-                .limit(10)
-            )
-        ).scalars().all()
+        trades = (await db.execute(_RECENT_CLOSED_TRADES, {"uid": user.id})).scalars().all()
         if not trades:
             return "📊 *No closed trades yet.*\n\nStart with `/trade BUY BTCUSDT 1.5`"
         lines = ["📜 *Last 10 Trades*\n"]
@@ -539,30 +621,20 @@ class TelegramBotService:
         return "\n".join(lines)
 
     async def _telegram_performance_text(self, db, user: User) -> str:
-        trades = (
-            await db.execute(
-                sa_select(Trade).where(
-                    Trade.user_id == user.id,
-                    Trade.status == "closed",
-                )
-            )
-        ).scalars().all()
-        if not trades:
+        count, total, worst, best, wins, streak = (
+            await db.execute(_PERFORMANCE_STMT, {"uid": user.id})
+        ).one()
+        if not count:
             return "📈 *No closed trades yet.*\n\nYour stats will appear here after your first trade."
-        profits = [(t.profit or 0) - (t.loss or 0) for t in trades]
-        wins = [p for p in profits if p > 0]
-        total = sum(profits)
-        wr = len(wins) / len(profits) * 100
-        best = max(profits)
-        worst = min(profits)
-        avg = total / len(profits)
-        streak = _winning_streak(profits)
+        wr = (wins or 0) / count * 100
+        avg = total / count
+        streak = streak or 0
         wr_em = "🔥" if wr >= 60 else ("⚠️" if wr < 40 else "📊")
         return (
             f"📈 *{user.ai_name}'s Performance*\n\n"
             f"{wr_em} Win Rate:        `{wr:.1f}%`\n"
             f"💰 Total Profit:    `${total:+,.2f}`\n"
-            f"📊 Total Trades:    `{len(profits)}`\n"
+            f"📊 Total Trades:    `{count}`\n"
             f"🏆 Best Trade:      `+${best:,.2f}`\n"
             f"📉 Worst Trade:     `${worst:,.2f}`\n"
             f"📅 Avg per Trade:   `${avg:+,.2f}`\n"
@@ -788,16 +860,7 @@ class TelegramBotService:
                     )
                     return
                 trade = (
-                    await db.execute(
-                        sa_select(Trade)
-                        .where(
-                            Trade.user_id == user.id,
-                            Trade.symbol == symbol,
-                            Trade.status == "open",
-                        )
-                        .order_by(Trade.created_at.desc())
-                        .limit(1)
-                    )
+                    await db.execute(_OPEN_TRADE_FOR_SYMBOL, {"uid": user.id, "symbol": symbol})
                 ).scalar_one_or_none()
                 await db.commit()
 
@@ -1068,6 +1131,7 @@ class TelegramBotService:
                 if ext:
                     await db.delete(ext)
                     await db.commit()
+            self._linked_cache.pop(tg_id, None)
 
             await query.edit_message_text(
                 "✅ Unlinked!\n\n"
@@ -1582,7 +1646,20 @@ class TelegramBotService:
     # ── Internal helpers ──────────────────────────────────────────────────────
 
     async def _telegram_linked_user(self, db, tg_id: str) -> User | None:
-        """Resolve Unitrader User from Telegram id on an open DB session (updates last_used_at)."""
+        """Resolve Unitrader User from Telegram id on an open DB session.
+
+        A cold lookup reads the external account (and bumps its
+        ``last_used_at``); the user id is then cached for ``_LINK_CACHE_TTL``
+        seconds and later lookups load the user by primary key.
+        """
+        cached = self._linked_cache.get(tg_id)
+        if cached and cached[1] > time.monotonic():
+            user = await db.get(User, cached[0])
+            if user and user.is_active:
+                return user
+            self._linked_cache.pop(tg_id, None)
+            return None
+
         ext = (
             await db.execute(
                 sa_select(UserExternalAccount).where(
@@ -1600,6 +1677,10 @@ class TelegramBotService:
         ).scalar_one_or_none()
         if not user or not user.is_active:
             return None
+        if len(self._linked_cache) >= _LINK_CACHE_MAX:
+            now = time.monotonic()
+            self._linked_cache = {k: v for k, v in self._linked_cache.items() if v[1] > now}
+        self._linked_cache[tg_id] = (user.id, time.monotonic() + _LINK_CACHE_TTL)
         return user
 
     async def _get_linked_user(self, tg_id: str) -> User | None:
@@ -1656,39 +1737,66 @@ class TelegramBotService:
         error_message: str | None = None,
         response_time_ms: int | None = None,
     ) -> None:
-        """Persist one interaction to bot_messages — fire and forget."""
+        """Queue one interaction for bot_messages — fire and forget."""
+        row = BotMessage(
+            user_id=user_id,
+            platform=_PLATFORM,
+            external_user_id=external_user_id,
+            message_type=message_type,
+            command=command,
+            user_message=(user_message or "")[:4000],
+            bot_response=(bot_response or "")[:4000],
+            status=status,
+            error_message=error_message,
+            response_time_ms=response_time_ms,
+            created_at=_now(),
+        )
+        if self._log_task is None or self._log_task.done():
+            await self._write_logs([row])
+            return
+        try:
+            self._log_queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("Bot message log queue full — dropping %s row", message_type)
+
+    async def _log_worker(self) -> None:
+        """Drain ``_log_queue`` into bot_messages, one commit per batch.
+
+        A batch closes at ``_LOG_BATCH_MAX`` rows or ``_LOG_FLUSH_INTERVAL``
+        seconds after its first row. A ``None`` item flushes and stops.
+        """
+        queue = self._log_queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await queue.get()
+            if row is None:
+                return
+            batch = [row]
+            deadline = loop.time() + _LOG_FLUSH_INTERVAL
+            while len(batch) < _LOG_BATCH_MAX:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    row = queue.get_nowait()
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self._write_logs(batch)
+
+    @staticmethod
+    async def _write_logs(rows: list[BotMessage]) -> None:
         try:
             async with AsyncSessionLocal() as db:
-                db.add(BotMessage(
-                    user_id=user_id,
-                    platform=_PLATFORM,
-                    external_user_id=external_user_id,
-                    message_type=message_type,
-                    command=command,
-                    user_message=(user_message or "")[:4000],
-                    bot_response=(bot_response or "")[:4000],
-                    status=status,
-                    error_message=error_message,
-                    response_time_ms=response_time_ms,
-                ))
+                db.add_all(rows)
                 await db.commit()
         except Exception as exc:
-            logger.warning("Failed to log bot message: %s", exc)
-
-
-# ─────────────────────────────────────────────────────────────────────────────
-# Pure helpers
-# ─────────────────────────────────────────────────────────────────────────────
-
-def _winning_streak(profits: list[float]) -> int:
-    """Return the longest consecutive winning streak."""
-    best = cur = 0
-    for p in profits:
-        if p > 0:
-            cur += 1
-            best = max(best, cur)
-        else:
-            cur = 0
-    return best
-
+            logger.warning("Failed to log %d bot message(s): %s", len(rows), exc)
 
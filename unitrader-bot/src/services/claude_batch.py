@@ -0,0 +1,90 @@
+"""
+src/services/claude_batch.py — Anthropic Message Batches helper.
+
+Scheduled content jobs (weekly blog posts, the monthly guide, the daily
+social batch) are not latency-sensitive, so they are submitted through the
+Message Batches API: half the token price and a separate rate-limit pool,
+at the cost of results arriving minutes — occasionally hours — later.
+
+Callers treat a failed or timed-out batch as a miss and fall back to a
+regular ``messages.create`` call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import anthropic
+
+logger = logging.getLogger(__name__)
+
+BATCH_POLL_SECONDS = 60
+BATCH_POLL_MAX_SECONDS = 600
+BATCH_TIMEOUT_SECONDS = 2 * 3600
+
+
+async def run_message_batch(
+    client: anthropic.AsyncAnthropic,
+    requests: dict[str, dict[str, Any]],
+    *,
+    timeout: float = BATCH_TIMEOUT_SECONDS,
+) -> dict[str, str]:
+    """Submit ``{custom_id: messages.create params}`` as one batch and wait for it.
+
+    Polls every ``BATCH_POLL_SECONDS``, doubling up to ``BATCH_POLL_MAX_SECONDS``.
+
+    Returns:
+        ``{custom_id: response text}`` for every request that succeeded.
+        Errored, cancelled and expired requests are logged and omitted.
+
+    Raises:
+        TimeoutError: the batch had not ended after ``timeout`` seconds
+            (it is cancelled before raising).
+    """
+    batch = await client.messages.batches.create(
+        requests=[{"custom_id": cid, "params": params} for cid, params in requests.items()]
+    )
+    logger.info("Submitted message batch %s (%d requests)", batch.id, len(requests))
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = BATCH_POLL_SECONDS
+    while batch.processing_status != "ended":
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            try:
+                await client.messages.batches.cancel(batch.id)
+            except Exception as exc:
+                logger.warning("Could not cancel message batch %s: %s", batch.id, exc)
+            raise TimeoutError(
+                f"Message batch {batch.id} still {batch.processing_status} after {timeout:.0f}s"
+            )
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, BATCH_POLL_MAX_SECONDS)
+        batch = await client.messages.batches.retrieve(batch.id)
+
+    texts: dict[str, str] = {}
+    async for entry in await client.messages.batches.results(batch.id):
+        if entry.result.type == "succeeded":
+            texts[entry.custom_id] = entry.result.message.content[0].text.strip()
+        else:
+            logger.warning("Batch request %s did not succeed: %s", entry.custom_id, entry.result.type)
+    return texts
+
+
+async def complete_via_batch(
+    client: anthropic.AsyncAnthropic,
+    params: dict[str, Any],
+    *,
+    custom_id: str = "request-0",
+    timeout: float = BATCH_TIMEOUT_SECONDS,
+) -> str | None:
+    """Run a single request through a batch. Returns None if it did not succeed."""
+    try:
+        texts = await run_message_batch(client, {custom_id: params}, timeout=timeout)
+    except Exception as exc:
+        logger.warning("Message batch failed — falling back to real-time: %s", exc)
+        return None
+    return texts.get(custom_id)
@@ -91,6 +91,7 @@ async def save_conversation(
     context: str,
     sentiment: str | None = None,
     db: AsyncSession | None = None,
+    conversation_id: str | None = None,
 ) -> Conversation:
     """Persist a single message/response exchange to the database.
 
@@ -101,6 +102,8 @@ async def save_conversation(
         context: Detected context string (e.g. 'friendly_chat').
         sentiment: Pre-computed sentiment; if None it is computed here.
         db: Optional injected session; a new session is created if not provided.
+        conversation_id: Pre-allocated row id, so callers can return the id
+            before the write has finished. Generated by the model if omitted.
 
     Returns:
         The saved Conversation ORM instance.
@@ -116,6 +119,8 @@ async def save_conversation(
             context_type=context,
             sentiment=sentiment,
         )
+        if conversation_id:
+            conv.id = conversation_id
         session.add(conv)
         await session.flush()
         await session.refresh(conv)
@@ -19,11 +19,13 @@ Emergent flywheel example:
   → New sign-ups cite the blog post → more trades → pattern reinforced
 """
 
+import asyncio
 import json
 import logging
 import re
 from datetime import datetime, timedelta, timezone
 from collections import defaultdict
+from typing import Any, Awaitable, Callable
 
 import anthropic
 from sqlalchemy import and_, select
@@ -808,8 +810,46 @@ async def _save_instructions(
 # Public API — insights for agents
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Insights and instructions only change once per learning cycle, so agents
+# polling them every trading cycle are served from a short process-wide cache.
+# Callers must treat the returned objects as read-only.
+INSIGHTS_CACHE_TTL_SECONDS = 45
+_insights_cache: dict[str, tuple[Any, datetime]] = {}
+_insights_locks: dict[str, asyncio.Lock] = {}
+
+
+async def _cached_insight(key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Return ``loader()``'s result, reusing it for ``INSIGHTS_CACHE_TTL_SECONDS``.
+
+    Concurrent misses on the same key share a single load.
+    """
+    ttl = timedelta(seconds=INSIGHTS_CACHE_TTL_SECONDS)
+    cached = _insights_cache.get(key)
+    if cached and datetime.now(timezone.utc) - cached[1] < ttl:
+        return cached[0]
+    async with _insights_locks.setdefault(key, asyncio.Lock()):
+        cached = _insights_cache.get(key)
+        if cached and datetime.now(timezone.utc) - cached[1] < ttl:
+            return cached[0]
+        value = await loader()
+        _insights_cache[key] = (value, datetime.now(timezone.utc))
+        return value
+
+
+def invalidate_insights_cache() -> None:
+    """Drop cached insights/instructions — called after a learning cycle writes."""
+    _insights_cache.clear()
+
+
 async def get_active_instructions(agent_name: str) -> list[dict]:
     """Return the current active instructions for an agent (highest priority first)."""
+    return await _cached_insight(
+        f"instructions:{agent_name}",
+        lambda: _load_active_instructions(agent_name),
+    )
+
+
+async def _load_active_instructions(agent_name: str) -> list[dict]:
     async with AsyncSessionLocal() as db:
         result = await db.execute(
             select(AgentInstruction).where(
@@ -831,6 +871,10 @@ async def get_active_instructions(agent_name: str) -> list[dict]:
 
 async def get_trading_insights() -> dict:
     """Trading agent asks: What patterns should guide my next trade?"""
+    return await _cached_insight("trading", _load_trading_insights)
+
+
+async def _load_trading_insights() -> dict:
     async with AsyncSessionLocal() as db:
         result = await db.execute(
             select(Pattern).where(
@@ -908,6 +952,10 @@ async def get_trading_insights() -> dict:
 
 async def get_content_insights() -> dict:
     """Content agent asks: What should I write about this cycle?"""
+    return await _cached_insight("content", _load_content_insights)
+
+
+async def _load_content_insights() -> dict:
     async with AsyncSessionLocal() as db:
         content_result = await db.execute(
             select(Pattern).where(
@@ -1143,6 +1191,7 @@ class LearningHub:
             )
             db.add(cycle_output)
             await db.commit()
+        invalidate_insights_cache()
 
         duration = round((datetime.now(timezone.utc) - start).total_seconds(), 1)
 
@@ -0,0 +1,65 @@
+"""
+src/services/llm_cache.py — Response cache for marketing Claude calls.
+
+The content schedulers rotate through short lists of evergreen topics, so
+the exact same prompt is regularly sent to Claude again within days. The
+parsed response is kept keyed by a SHA-256 of (agent, system prompt, user
+prompt); any change to the prompt text — learning-hub guidance, platform
+stats, a prompt edit — produces a new key, so stale output is never served
+for a different request.
+
+Only the scheduler paths opt in (``use_cache=True``): their output is saved
+once per run, whereas an interactive request for a topic it has already
+covered should get fresh content rather than a duplicate row.
+
+Production note: in-memory only — each worker keeps its own cache and it
+is cleared on restart. Cached values are shared; treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+_LLM_CACHE_MAX = 512
+
+# prompt digest -> (parsed response, stored_at)
+_llm_cache: dict[str, tuple[Any, datetime]] = {}
+
+
+def prompt_key(agent: str, system_prompt: str, user_prompt: str) -> str:
+    """Return the cache key for one Claude request."""
+    digest = hashlib.sha256()
+    for part in (agent, system_prompt, user_prompt):
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+async def lookup(agent: str, system_prompt: str, user_prompt: str) -> Any | None:
+    """Return the cached parsed response for this prompt, or None on a miss."""
+    key = prompt_key(agent, system_prompt, user_prompt)
+    cached = _llm_cache.get(key)
+    if cached is None:
+        return None
+    if datetime.now(timezone.utc) - cached[1] >= timedelta(seconds=LLM_CACHE_TTL_SECONDS):
+        _llm_cache.pop(key, None)
+        return None
+    logger.info("LLM cache hit for %s", agent)
+    return cached[0]
+
+
+async def store(agent: str, system_prompt: str, user_prompt: str, data: Any) -> None:
+    """Remember the parsed response for this prompt."""
+    if len(_llm_cache) >= _LLM_CACHE_MAX:
+        # Dicts keep insertion order — evict the oldest entry.
+        _llm_cache.pop(next(iter(_llm_cache)))
+    _llm_cache[prompt_key(agent, system_prompt, user_prompt)] = (
+        data,
+        datetime.now(timezone.utc),
+    )
@@ -369,6 +369,10 @@ async def _close_position_at_price(
         trade.loss = round(abs(pnl), 2)
         trade.profit_percent = round(pnl_pct, 4)
         msg = f"{ai_name} closed {trade.symbol} ({reason}). Loss: -${abs(pnl):.2f}"
+        # Lazy import: trading_agent pulls in the full agent stack.
+        from src.agents.core.trading_agent import record_realised_loss
+
+        record_realised_loss(trade.user_id, trade.loss)
 
     logger.info(msg)
     # TODO: Feed the outcome back into shared memory using new orchestrator API
@@ -0,0 +1,72 @@
+"""
+src/services/trade_stats.py — Platform-wide closed-trade aggregates.
+
+The marketing agents quote the same headline numbers (trades analysed,
+average profit, win rate) in every post they generate. One aggregate query
+returns all three, and the result is reused for ``TRADE_STATS_TTL_SECONDS``
+so a batch of posts costs a single scan of the trades table.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from database import AsyncSessionLocal
+from models import Trade
+
+logger = logging.getLogger(__name__)
+
+TRADE_STATS_TTL_SECONDS = 300
+
+_aggregates_cache: tuple[dict, datetime] | None = None
+_aggregates_lock = asyncio.Lock()
+
+_EMPTY = {"total_trades": 0, "avg_profit_pct": 0.0, "win_rate": 0.0}
+
+
+async def _load_trade_aggregates() -> dict:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(
+                func.count(Trade.id).label("total"),
+                func.avg(Trade.profit_percent).label("avg_profit_pct"),
+                func.count(Trade.id).filter(Trade.profit > 0).label("wins"),
+            ).where(Trade.status == "closed")
+        )
+        row = result.first()
+    total = row.total or 0
+    wins = row.wins or 0
+    return {
+        "total_trades": total,
+        "avg_profit_pct": round(float(row.avg_profit_pct or 0), 2),
+        "win_rate": round(wins / total * 100, 1) if total else 0.0,
+    }
+
+
+async def get_trade_aggregates() -> dict:
+    """Return ``{"total_trades", "avg_profit_pct", "win_rate"}`` over closed trades.
+
+    Cached for ``TRADE_STATS_TTL_SECONDS``; concurrent misses share one query.
+    On a database error the zero stats are returned and nothing is cached.
+    """
+    global _aggregates_cache
+
+    ttl = timedelta(seconds=TRADE_STATS_TTL_SECONDS)
+    cached = _aggregates_cache
+    if cached and datetime.now(timezone.utc) - cached[1] < ttl:
+        return cached[0]
+    async with _aggregates_lock:
+        cached = _aggregates_cache
+        if cached and datetime.now(timezone.utc) - cached[1] < ttl:
+            return cached[0]
+        try:
+            stats = await _load_trade_aggregates()
+        except Exception as exc:
+            logger.warning("Could not load trade aggregates: %s", exc)
+            return dict(_EMPTY)
+        _aggregates_cache = (stats, datetime.now(timezone.utc))
+        return stats
@@ -0,0 +1,50 @@
+"""
+src/utils/claude_retry.py — Retry transient Claude API failures.
+
+The SDK's own retries cover quick blips; this adds a longer, jittered
+backoff for rate limits and overloads so a scheduled generation survives a
+short outage instead of falling through to placeholder content.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, TypeVar
+
+import anthropic
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 1.0  # seconds
+_RETRY_MAX_DELAY = 30.0
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504, 529}
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, anthropic.APIConnectionError):  # includes APITimeoutError
+        return True
+    return isinstance(exc, anthropic.APIStatusError) and exc.status_code in _RETRYABLE_STATUS
+
+
+async def with_claude_retry(call: Callable[[], Awaitable[T]], label: str = "Claude call") -> T:
+    """Await ``call()``, retrying rate limits, overloads, 5xx and network errors.
+
+    Backoff doubles from ``_RETRY_BASE_DELAY`` (capped at ``_RETRY_MAX_DELAY``)
+    plus up to 1s of jitter. Any other error, or the last failure, is raised.
+    """
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
+        try:
+            return await call()
+        except Exception as exc:
+            if attempt == _MAX_ATTEMPTS or not _is_transient(exc):
+                raise
+            delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            delay += random.uniform(0, 1)
+            logger.warning(
+                "%s failed on attempt %d/%d — retry in %.1fs: %s",
+                label, attempt, _MAX_ATTEMPTS, delay, exc,
+            )
+            await asyncio.sleep(delay)
@@ -172,6 +172,49 @@ def mock_user():
     )
 
 
+# ─── Trades table fixtures ────────────────────────────────────────────────────
+@pytest.fixture
+async def trades_db():
+    """An in-memory SQLite session with just the ``trades`` table created."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from models import Trade
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Trade.__table__.create)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def make_trade():
+    """Factory for unsaved Trade rows; closed trades close ``minutes_ago`` minutes ago."""
+    from datetime import datetime, timedelta, timezone
+    from models import Trade
+
+    def _make(user_id: str, symbol: str, *, status: str = "closed", minutes_ago: int = 0, **pnl):
+        return Trade(
+            user_id=user_id,
+            exchange="binance",
+            symbol=symbol,
+            side="BUY",
+            quantity=1.0,
+            entry_price=100.0,
+            stop_loss=95.0,
+            take_profit=110.0,
+            status=status,
+            closed_at=(
+                datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+                if status == "closed"
+                else None
+            ),
+            **pnl,
+        )
+
+    return _make
+
+
 # ─── Settings override for tests ─────────────────────────────────────────────
 @pytest.fixture(autouse=True)
 def reload_settings():
@@ -0,0 +1,132 @@
+"""
+tests/test_binance_kline_stream.py — in-memory Binance 5-minute closes.
+
+Covers:
+    1.  Kline messages update the forming bar and append new bars
+    2.  A connected, seeded buffer answers without another REST call
+    3.  A disconnect forces the next read to re-seed from REST
+    4.  Past the stream cap, new symbols are served from REST only
+    5.  The stream URL defaults to mainnet only for the mainnet REST host
+
+The WebSocket is replaced with an in-process fake; no network is used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from src.integrations import binance_kline_stream as ks
+
+
+class _FakeSocket:
+    def __init__(self, messages: asyncio.Queue):
+        self.messages = messages
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        msg = await self.messages.get()
+        if isinstance(msg, Exception):
+            raise msg
+        return msg
+
+
+def _kline(open_time: int, close: float) -> str:
+    return json.dumps({"e": "kline", "k": {"t": open_time, "c": str(close), "x": False}})
+
+
+@pytest.fixture
+async def stream(monkeypatch):
+    messages: asyncio.Queue = asyncio.Queue()
+    monkeypatch.setattr(ks.websockets, "connect", lambda *a, **kw: _FakeSocket(messages))
+    monkeypatch.setattr(ks, "_RECONNECT_DELAY", 0)
+    monkeypatch.setattr(ks, "_buffers", {})
+    yield messages
+    await ks.close_streams()
+
+
+def test_buffer_updates_forming_bar_and_appends():
+    buf = ks._KlineBuffer()
+    buf.seed([[1, "0", "0", "0", "10"], [2, "0", "0", "0", "11"]], 2)
+
+    buf.apply(2, 12.0)
+    buf.apply(3, 13.0)
+    buf.apply(1, 99.0)  # late message for an old bar is ignored
+
+    assert list(buf.closes) == [10.0, 12.0, 13.0]
+
+
+async def test_connected_buffer_serves_without_rest(stream):
+    rest_calls: list[int] = []
+
+    async def fetch_rows(symbol, limit):
+        rest_calls.append(limit)
+        return [[t, "0", "0", "0", str(100 + t)] for t in range(1, limit + 1)]
+
+    assert await ks.get_closes("BTCUSDT", 3, fetch_rows) == [101.0, 102.0, 103.0]
+    await asyncio.sleep(0)  # let the stream connect
+    assert await ks.get_closes("BTCUSDT", 3, fetch_rows) == [101.0, 102.0, 103.0]
+
+    stream.put_nowait(_kline(4, 104.5))
+    await asyncio.sleep(0)
+    assert await ks.get_closes("BTCUSDT", 3, fetch_rows) == [102.0, 103.0, 104.5]
+    assert rest_calls == [3, 3]
+
+
+async def test_disconnect_forces_reseed(stream):
+    rest_calls = 0
+
+    async def fetch_rows(symbol, limit):
+        nonlocal rest_calls
+        rest_calls += 1
+        return [[1, "0", "0", "0", "5"]]
+
+    await ks.get_closes("ETHUSDT", 1, fetch_rows)
+    await asyncio.sleep(0)
+    await ks.get_closes("ETHUSDT", 1, fetch_rows)
+    assert rest_calls == 2
+
+    stream.put_nowait(ConnectionError("dropped"))
+    await asyncio.sleep(0)
+    assert not ks._buffers["ETHUSDT"].synced
+    await ks.get_closes("ETHUSDT", 1, fetch_rows)
+    assert rest_calls == 3
+
+
+async def test_symbols_past_cap_use_rest_without_a_stream(stream, monkeypatch):
+    monkeypatch.setattr(ks, "_MAX_STREAMS", 1)
+    rest_calls: list[str] = []
+
+    async def fetch_rows(symbol, limit):
+        rest_calls.append(symbol)
+        return [[1, "0", "0", "0", "7"]]
+
+    await ks.get_closes("BTCUSDT", 1, fetch_rows)
+    assert await ks.get_closes("ETHUSDT", 1, fetch_rows) == [7.0]
+    assert await ks.get_closes("ETHUSDT", 1, fetch_rows) == [7.0]
+
+    assert list(ks._buffers) == ["BTCUSDT"]
+    assert rest_calls == ["BTCUSDT", "ETHUSDT", "ETHUSDT"]
+
+
+def test_stream_url_defaults_to_mainnet_only_for_mainnet_rest():
+    from config import Settings
+
+    assert Settings(binance_base_url="https://api.binance.com").binance_ws_url.startswith(
+        "wss://stream.binance.com"
+    )
+    assert Settings(binance_base_url="https://testnet.binance.vision").binance_ws_url == ""
+    assert Settings(
+        binance_base_url="https://testnet.binance.vision",
+        binance_ws_url="wss://testnet.binance.vision/ws",
+    ).binance_ws_url == "wss://testnet.binance.vision/ws"
@@ -0,0 +1,79 @@
+"""
+tests/test_binance_signing.py — BinanceClient signed requests.
+
+Covers:
+    1.  The signature is HMAC-SHA256 of the encoded query, keyed by the secret
+    2.  Reusing the cached HMAC state yields independent signatures
+    3.  The caller's params are not mutated
+    4.  The balance request asks Binance to omit zero-balance rows
+    5.  Values that would need URL quoting are rejected in debug mode
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+from urllib.parse import parse_qsl
+
+import httpx
+import pytest
+
+from config import settings
+from src.integrations.exchange_client import BinanceClient
+
+
+def _verify(secret: str, signed_query: str) -> dict:
+    query, _, signature = signed_query.rpartition("&signature=")
+    assert signature == hmac.new(secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+    return dict(parse_qsl(query))
+
+
+def test_signature_matches_reference_hmac():
+    client = BinanceClient("key", "secret")
+    params = _verify("secret", client._sign({"symbol": "BTCUSDT", "side": "BUY"}))
+
+    assert params["symbol"] == "BTCUSDT"
+    assert params["recvWindow"] == str(BinanceClient.RECV_WINDOW)
+    assert "timestamp" in params
+
+
+def test_repeated_signing_does_not_share_state():
+    client = BinanceClient("key", "secret")
+    assert _verify("secret", client._sign({"symbol": "BTCUSDT"}))["symbol"] == "BTCUSDT"
+    assert _verify("secret", client._sign({"symbol": "ETHUSDT"}))["symbol"] == "ETHUSDT"
+
+
+def test_params_are_not_mutated():
+    client = BinanceClient("key", "secret")
+    params = {"symbol": "BTCUSDT"}
+    client._sign(params)
+    assert params == {"symbol": "BTCUSDT"}
+
+
+async def test_account_balance_omits_zero_rows():
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(parse_qsl(request.url.query.decode())))
+        return httpx.Response(200, json={"balances": [
+            {"asset": "BTC", "free": "0.1", "locked": "0"},
+            {"asset": "USDT", "free": "90.5", "locked": "9.5"},
+        ]})
+
+    client = BinanceClient("key", "secret")
+    client._http = httpx.AsyncClient(
+        base_url="https://api.binance.com", transport=httpx.MockTransport(handler)
+    )
+
+    assert await client.get_account_balance() == 100.0
+    assert seen[0]["omitZeroBalances"] == "true"
+    assert "signature" in seen[0]
+
+
+def test_unsafe_values_rejected_in_debug(monkeypatch):
+    monkeypatch.setattr(settings, "debug", True)
+    client = BinanceClient("key", "secret")
+
+    assert _verify("secret", client._sign({"symbol": "BTCUSDT", "quantity": "0.50"}))
+    with pytest.raises(ValueError):
+        client._sign({"newClientOrderId": "a&b"})
@@ -0,0 +1,75 @@
+"""Unit tests for the Message Batches helper (fake client, no network)."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services import claude_batch
+
+
+class _Results:
+    def __init__(self, entries):
+        self._entries = entries
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for entry in self._entries:
+            yield entry
+
+
+def _entry(custom_id, text=None):
+    if text is None:
+        return SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type="errored"))
+    message = SimpleNamespace(content=[SimpleNamespace(text=f"  {text}\n")])
+    return SimpleNamespace(
+        custom_id=custom_id, result=SimpleNamespace(type="succeeded", message=message)
+    )
+
+
+def _client(statuses, entries=()):
+    batches = [SimpleNamespace(id="batch_1", processing_status=s) for s in statuses]
+    return SimpleNamespace(
+        messages=SimpleNamespace(
+            batches=SimpleNamespace(
+                create=AsyncMock(return_value=batches[0]),
+                retrieve=AsyncMock(side_effect=batches[1:]),
+                results=AsyncMock(return_value=_Results(list(entries))),
+                cancel=AsyncMock(),
+            )
+        )
+    )
+
+
+async def test_results_demultiplexed_by_custom_id(monkeypatch):
+    monkeypatch.setattr(claude_batch, "BATCH_POLL_SECONDS", 0)
+    client = _client(
+        ["in_progress", "ended"],
+        [_entry("post-1", '{"title": "B"}'), _entry("post-0", '{"title": "A"}'), _entry("post-2")],
+    )
+
+    texts = await claude_batch.run_message_batch(
+        client, {"post-0": {"model": "m"}, "post-1": {"model": "m"}, "post-2": {"model": "m"}}
+    )
+
+    assert texts == {"post-0": '{"title": "A"}', "post-1": '{"title": "B"}'}
+    sent = client.messages.batches.create.await_args.kwargs["requests"]
+    assert [r["custom_id"] for r in sent] == ["post-0", "post-1", "post-2"]
+    assert client.messages.batches.retrieve.await_count == 1
+
+
+async def test_timeout_cancels_batch():
+    client = _client(["in_progress", "in_progress", "in_progress"])
+
+    with pytest.raises(TimeoutError):
+        await claude_batch.run_message_batch(client, {"post-0": {}}, timeout=0.01)
+    client.messages.batches.cancel.assert_awaited_once_with("batch_1")
+
+
+async def test_single_request_returns_none_when_batch_fails():
+    client = _client(["ended"])
+    client.messages.batches.create.side_effect = RuntimeError("boom")
+
+    assert await claude_batch.complete_via_batch(client, {}) is None
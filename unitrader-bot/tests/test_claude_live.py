@@ -253,38 +253,28 @@ class TestTradingAgentSafetyRules:
 
     def test_wait_decision_not_modified(self, agent):
         """A WAIT decision should pass through personalize_decision unchanged."""
-        import asyncio
         wait = {"decision": "WAIT", "confidence": 0, "position_size_pct": 0.0, "reasoning": "No signal"}
-        result = asyncio.get_event_loop().run_until_complete(
-            agent.personalize_decision(wait, USER_HISTORY_GOOD)
-        )
+        result = agent.personalize_decision(wait, USER_HISTORY_GOOD)
         assert result["decision"] == "WAIT"
         assert result["position_size_pct"] == 0.0
 
     def test_high_win_rate_increases_size(self, agent):
         """Win rate > 65% with 10+ trades should increase size by ~10%."""
-        import asyncio
         decision = {"decision": "BUY", "confidence": 75, "position_size_pct": 1.0, "reasoning": "test"}
-        result = asyncio.get_event_loop().run_until_complete(
-            agent.personalize_decision(decision, USER_HISTORY_GOOD)
-        )
+        result = agent.personalize_decision(decision, USER_HISTORY_GOOD)
         print(f"\n  High win rate personalisation: {decision['position_size_pct']}% → {result['position_size_pct']}%")
         assert result["position_size_pct"] >= 1.0, "Size should stay same or increase"
         assert result["position_size_pct"] <= 2.0, "Size must not exceed 2%"
 
     def test_poor_win_rate_decreases_size(self, agent):
         """Win rate < 40% with 10+ trades should decrease size."""
-        import asyncio
         decision = {"decision": "BUY", "confidence": 60, "position_size_pct": 1.0, "reasoning": "test"}
-        result = asyncio.get_event_loop().run_until_complete(
-            agent.personalize_decision(decision, USER_HISTORY_POOR)
-        )
+        result = agent.personalize_decision(decision, USER_HISTORY_POOR)
         print(f"\n  Poor win rate personalisation: {decision['position_size_pct']}% → {result['position_size_pct']}%")
         assert result["position_size_pct"] < 1.0, "Size should be reduced for poor history"
 
     def test_learning_hub_avoid_condition_triggers_wait(self, agent):
         """Avoid condition matching current trend should flip decision to WAIT."""
-        import asyncio
         decision = {
             "decision": "BUY",
             "confidence": 70,
@@ -300,9 +290,7 @@ class TestTradingAgentSafetyRules:
             "high_confidence_setups": [],
             "avoid_setups": ["Downtrend — 28% win rate"],
         }
-        result = asyncio.get_event_loop().run_until_complete(
-            agent.personalize_decision(decision, USER_HISTORY_POOR, insights)
-        )
+        result = agent.personalize_decision(decision, USER_HISTORY_POOR, insights)
         print(f"\n  Learning hub avoid: {result['decision']} — {result.get('reasoning', '')[:60]}")
         assert result["decision"] == "WAIT", "Learning hub should force WAIT on avoid condition"
 
@@ -0,0 +1,54 @@
+"""Unit tests for the transient-error retry around Claude calls."""
+
+import anthropic
+import httpx
+import pytest
+
+from src.utils import claude_retry
+
+
+def _status_error(status: int) -> anthropic.APIStatusError:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status, request=request)
+    return anthropic.APIStatusError("error", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    delays: list[float] = []
+
+    async def _sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(claude_retry.asyncio, "sleep", _sleep)
+    return delays
+
+
+async def test_rate_limit_retried_until_success(no_sleep):
+    outcomes = [_status_error(429), _status_error(529), "ok"]
+
+    async def _call():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert await claude_retry.with_claude_retry(_call) == "ok"
+    assert len(no_sleep) == 2
+    assert 1.0 <= no_sleep[0] < 2.0 and 2.0 <= no_sleep[1] < 3.0
+
+
+async def test_client_errors_and_last_failure_raised(no_sleep):
+    async def _bad_request():
+        raise _status_error(400)
+
+    with pytest.raises(anthropic.APIStatusError):
+        await claude_retry.with_claude_retry(_bad_request)
+    assert no_sleep == []
+
+    async def _overloaded():
+        raise _status_error(503)
+
+    with pytest.raises(anthropic.APIStatusError):
+        await claude_retry.with_claude_retry(_overloaded)
+    assert len(no_sleep) == claude_retry._MAX_ATTEMPTS - 1
@@ -5,19 +5,26 @@ Run with:  pytest tests/test_content.py -v
 
 All tests are pure (no I/O, no database, no Claude API calls).
 Covers:
-  - content_writer.py  (slug generation, read time, word count)
-  - social_media.py    (type distribution, schedule slots, char limits)
+  - content_writer.py  (slug generation, read time, word count, hub context, streaming,
+                        weekly batch persistence)
+  - social_media.py    (type distribution, schedule slots, scheduled_for parsing, char limits, truncation,
+                        response cache scope)
 """
 
 import pytest
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 from src.agents.marketing.content_writer import (
     SUGGESTED_TOPICS,
     count_words,
     estimate_read_time,
     make_slug,
+    _build_hub_context,
     _placeholder_post,
+    _stream_text,
 )
 from src.agents.marketing.social_media import (
     CHAR_LIMITS,
@@ -25,7 +32,9 @@ from src.agents.marketing.social_media import (
     _build_schedule_slots,
     _get_type_distribution,
     _next_morning,
+    _parse_scheduled,
     _placeholder_posts,
+    _truncate,
 )
 
 
@@ -145,6 +154,176 @@ class TestPlaceholderPost:
         assert a["slug"] != b["slug"]
 
 
+# ═════════════════════════════════════════════
+# LEARNING HUB CONTEXT
+# ═════════════════════════════════════════════
+
+class TestBuildHubContext:
+    def test_empty_insights_give_no_context(self):
+        assert _build_hub_context({}, []) == ("", None)
+
+    def test_sections_rendered_and_capped(self):
+        insights = {
+            "trading_proof_points": ["p1", "p2", "p3", "p4"],
+            "viral_topics": ["RSI momentum"],
+            "current_instruction": "Lead with data",
+        }
+        context, instr_id = _build_hub_context(insights, [{"id": "i-1"}, {"id": "i-2"}])
+        assert "  - p3" in context and "p4" not in context
+        assert "TRENDING TOPICS" in context
+        assert "EDITORIAL DIRECTIVE: Lead with data" in context
+        assert instr_id == "i-1"
+
+
+# ═════════════════════════════════════════════
+# STREAMED RESPONSES
+# ═════════════════════════════════════════════
+
+class TestStreamText:
+    async def test_chunks_joined_and_stripped(self):
+        sent = {}
+
+        async def _chunks():
+            for text in ['\n{"title": ', '"RSI"', "}\n"]:
+                yield text
+
+        @asynccontextmanager
+        async def _stream(**params):
+            sent.update(params)
+            usage = SimpleNamespace(input_tokens=900, cache_read_input_tokens=800)
+            yield SimpleNamespace(
+                text_stream=_chunks(),
+                get_final_message=AsyncMock(return_value=SimpleNamespace(usage=usage)),
+            )
+
+        client = SimpleNamespace(messages=SimpleNamespace(stream=_stream))
+        raw = await _stream_text(client, {"model": "m", "max_tokens": 10}, "RSI")
+
+        assert raw == '{"title": "RSI"}'
+        assert sent == {"model": "m", "max_tokens": 10}
+
+
+# ═════════════════════════════════════════════
+# SHARED CLAUDE CLIENT
+# ═════════════════════════════════════════════
+
+class TestSharedClaudeClient:
+    async def test_one_client_until_closed(self, monkeypatch):
+        from src.agents.marketing import content_writer
+
+        monkeypatch.setattr(content_writer.settings, "anthropic_api_key", "test-key")
+        monkeypatch.setattr(content_writer, "_claude_client", None)
+
+        client = content_writer._get_claude_client()
+        assert content_writer._get_claude_client() is client
+
+        await content_writer.close_claude_client()
+        assert content_writer._claude_client is None
+
+
+# ═════════════════════════════════════════════
+# WEEKLY BATCH PERSISTENCE
+# ═════════════════════════════════════════════
+
+class _FakeSession:
+    """Records savepoints and commits; optionally fails the commit."""
+
+    def __init__(self, fail_commit: bool = False):
+        self.fail_commit = fail_commit
+        self.savepoints = 0
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def begin_nested(self):
+        session = self
+
+        @asynccontextmanager
+        async def _savepoint():
+            session.savepoints += 1
+            yield
+
+        return _savepoint()
+
+    async def commit(self):
+        if self.fail_commit:
+            raise RuntimeError("db down")
+        self.committed = True
+
+
+class TestSaveBlogPosts:
+    async def test_one_failed_insert_skips_only_that_post(self, monkeypatch):
+        from src.agents.marketing import content_writer
+
+        session = _FakeSession()
+        monkeypatch.setattr(content_writer, "AsyncSessionLocal", lambda: session)
+
+        async def _save(post, db):
+            if post["title"] == "bad":
+                raise RuntimeError("duplicate slug")
+            return f"id-{post['title']}"
+
+        monkeypatch.setattr(content_writer, "_save_blog_post", _save)
+        posts = [{"title": "a"}, {"title": "bad"}, {"title": "b"}]
+
+        await content_writer._save_blog_posts(posts)
+
+        assert [p.get("id") for p in posts] == ["id-a", None, "id-b"]
+        assert session.savepoints == 3 and session.committed
+
+    async def test_failed_commit_is_contained(self, monkeypatch):
+        from src.agents.marketing import content_writer
+
+        monkeypatch.setattr(content_writer, "AsyncSessionLocal", lambda: _FakeSession(fail_commit=True))
+        monkeypatch.setattr(content_writer, "_save_blog_post", AsyncMock(return_value="id-1"))
+        monkeypatch.setattr(content_writer, "_post_count", 5)
+        posts = [{"title": "a"}]
+
+        await content_writer._save_blog_posts(posts)
+
+        assert posts[0]["id"] is None
+        assert content_writer._post_count is None
+
+
+# ═════════════════════════════════════════════
+# RESPONSE CACHE SCOPE
+# ═════════════════════════════════════════════
+
+class TestSocialResponseCache:
+    async def _generate_twice(self, monkeypatch, use_cache: bool) -> AsyncMock:
+        from src.agents.marketing import social_media
+        from src.services import llm_cache
+
+        monkeypatch.setattr(llm_cache, "_llm_cache", {})
+        monkeypatch.setattr(social_media.settings, "anthropic_api_key", "test-key")
+        monkeypatch.setattr(
+            social_media, "get_trade_aggregates", AsyncMock(return_value={"total_trades": 0})
+        )
+        raw = '[{"platform": "twitter", "post_type": "educational", "content": "RSI 101"}]'
+        create = AsyncMock(return_value=SimpleNamespace(
+            content=[SimpleNamespace(text=raw)],
+            usage=SimpleNamespace(input_tokens=1),
+        ))
+        client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        monkeypatch.setattr(social_media, "_get_claude_client", lambda: client)
+
+        for _ in range(2):
+            await social_media.generate_social_posts("RSI", count=1, save_to_db=False, use_cache=use_cache)
+        return create
+
+    async def test_interactive_requests_always_call_claude(self, monkeypatch):
+        create = await self._generate_twice(monkeypatch, use_cache=False)
+        assert create.await_count == 2
+
+    async def test_scheduler_reuses_cached_response(self, monkeypatch):
+        create = await self._generate_twice(monkeypatch, use_cache=True)
+        assert create.await_count == 1
+
+
 # ═════════════════════════════════════════════
 # SUGGESTED TOPICS LIST
 # ═════════════════════════════════════════════
@@ -178,7 +357,7 @@ class TestTypeDistribution:
 
     def test_1_post_is_educational(self):
         dist = _get_type_distribution(1)
-        assert dist == ["educational"]
+        assert dist == ("educational",)
 
     def test_extra_posts_are_educational(self):
         dist = _get_type_distribution(8)
@@ -245,6 +424,23 @@ class TestNextMorning:
         assert result.tzinfo is not None
 
 
+# ═════════════════════════════════════════════
+# SCHEDULED_FOR PARSING
+# ═════════════════════════════════════════════
+
+class TestParseScheduled:
+    def test_iso_string_parsed(self):
+        result = _parse_scheduled({"scheduled_for": "2026-01-02T09:00:00+00:00"})
+        assert result == datetime(2026, 1, 2, 9, tzinfo=timezone.utc)
+
+    def test_missing_is_none(self):
+        assert _parse_scheduled({}) is None
+        assert _parse_scheduled({"scheduled_for": None}) is None
+
+    def test_invalid_is_none(self):
+        assert _parse_scheduled({"scheduled_for": "next tuesday"}) is None
+
+
 # ═════════════════════════════════════════════
 # CHAR LIMITS
 # ═════════════════════════════════════════════
@@ -262,6 +458,26 @@ class TestCharLimits:
         assert CHAR_LIMITS["twitter"] == min(CHAR_LIMITS.values())
 
 
+# ═════════════════════════════════════════════
+# TRUNCATION
+# ═════════════════════════════════════════════
+
+class TestTruncate:
+    def test_within_limit_unchanged(self):
+        text = "x" * 280
+        assert _truncate(text, 280) is text
+
+    def test_over_limit_clipped_with_ellipsis(self):
+        result = _truncate("word " * 100, CHAR_LIMITS["twitter"])
+        assert len(result) <= CHAR_LIMITS["twitter"]
+        assert result.endswith("word…")
+
+    def test_applies_to_every_platform_limit(self):
+        for platform in PLATFORMS:
+            limit = CHAR_LIMITS[platform]
+            assert len(_truncate("a" * (limit + 10), limit)) == limit
+
+
 # ═════════════════════════════════════════════
 # PLACEHOLDER SOCIAL POSTS
 # ═════════════════════════════════════════════
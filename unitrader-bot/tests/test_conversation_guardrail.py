@@ -22,6 +22,8 @@ async def test_conversation_guardrail_retries_on_access_limitation_copy():
 
     settings.anthropic_api_key = "test"
 
+    events: list[str] = []
+
     # Prevent DB access for User lookup
     class _FakeSession:
         async def execute(self, *_args, **_kwargs):
@@ -37,6 +39,9 @@ async def test_conversation_guardrail_retries_on_access_limitation_copy():
                 },
             )()
 
+        async def commit(self):
+            events.append("commit")
+
     class _FakeAsyncSessionLocal:
         def __call__(self):
             return self
@@ -91,3 +96,367 @@ async def test_conversation_guardrail_retries_on_access_limitation_copy():
     assert "do not have access" not in out["response"].lower()
     assert "123.45" in out["response"]
 
+
+
+@pytest.mark.asyncio
+async def test_conversation_respond_streams_chunks_to_on_text(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    from src.agents.core.conversation_agent import ConversationAgent
+    from src.agents.shared_memory import SharedContext
+    from config import settings
+
+    monkeypatch.setattr(settings, "anthropic_api_key", "test")
+
+    events: list[str] = []
+
+    class _FakeSession:
+        async def execute(self, *_args, **_kwargs):
+            return type(
+                "_Res",
+                (),
+                {
+                    "scalar_one_or_none": lambda _self: SimpleNamespace(
+                        id="user-001",
+                        email="u@example.com",
+                        ai_name="Zeus",
+                    )
+                },
+            )()
+
+        async def commit(self):
+            events.append("commit")
+
+    class _FakeAsyncSessionLocal:
+        def __call__(self):
+            return self
+
+        async def __aenter__(self):
+            return _FakeSession()
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    class _FakeStream:
+        def __init__(self, chunks):
+            self._chunks = chunks
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        @property
+        async def text_stream(self):
+            for c in self._chunks:
+                yield c
+
+    import src.agents.core.conversation_agent as ca
+    monkeypatch.setattr(ca, "AsyncSessionLocal", _FakeAsyncSessionLocal())
+
+    agent = ConversationAgent("user-001")
+    create = AsyncMock()
+    agent._claude = SimpleNamespace(
+        messages=SimpleNamespace(
+            create=create,
+            stream=lambda **_kw: _FakeStream(
+                ["Markets look ", "calm today.", "<ACTION type=", '"ANALYSE" />']
+            ),
+        )
+    )
+
+    monkeypatch.setattr(ca, "get_recent_messages_for_claude", AsyncMock(return_value=[]))
+    monkeypatch.setattr(
+        ca, "save_conversation", AsyncMock(return_value=type("_Conv", (), {"id": "c1"})())
+    )
+    monkeypatch.setattr(ca, "dispatch_action", AsyncMock(return_value=None))
+
+    ctx = SharedContext.default("user-001")
+    seen: list[str] = []
+
+    async def _on_text(chunk: str) -> None:
+        events.append("text")
+        seen.append(chunk)
+
+    out = await agent.respond(
+        "how are markets",
+        shared_context=ctx,
+        channel="web_app",
+        on_text=_on_text,
+    )
+
+    assert "".join(seen) == "Markets look calm today."
+    assert out["response"] == "Markets look calm today."
+    create.assert_not_called()
+    # The read transaction ends before Claude streams, freeing the connection.
+    assert events[0] == "commit"
+
+    # Persistence runs in the background under the id already returned.
+    import asyncio
+
+    await asyncio.gather(*ca._PENDING_PERSIST_TASKS)
+    assert ca.save_conversation.await_args.kwargs["conversation_id"] == out["conversation_id"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_reply_withholds_guardrail_copy_and_streams_retry(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    import src.agents.core.conversation_agent as ca
+    from src.agents.core.conversation_agent import ConversationAgent
+    from src.agents.shared_memory import SharedContext
+    from config import settings
+
+    monkeypatch.setattr(settings, "anthropic_api_key", "test")
+
+    user = SimpleNamespace(id="user-001", email="u@example.com", ai_name="Zeus")
+
+    class _FakeSession:
+        async def execute(self, *_args, **_kwargs):
+            return SimpleNamespace(scalar_one_or_none=lambda: user)
+
+    class _FakeStream:
+        def __init__(self, chunks):
+            self._chunks = chunks
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        @property
+        async def text_stream(self):
+            for c in self._chunks:
+                yield c
+
+    attempts = iter([
+        ["Sorry, ", "I don't have ", "access to your account."],
+        ["Your BTC position is up 4%.", '<ACTION type="ANALYSE" asset="BTC" />'],
+    ])
+    agent = ConversationAgent("user-001")
+    agent._claude = SimpleNamespace(
+        messages=SimpleNamespace(
+            create=AsyncMock(),
+            stream=lambda **_kw: _FakeStream(next(attempts)),
+        )
+    )
+
+    monkeypatch.setattr(ca, "get_recent_messages_for_claude", AsyncMock(return_value=[]))
+    monkeypatch.setattr(
+        ca, "save_conversation", AsyncMock(return_value=type("_Conv", (), {"id": "c1"})())
+    )
+    monkeypatch.setattr(ca, "_save_onboarding_messages", AsyncMock(return_value=None))
+    monkeypatch.setattr(ca, "dispatch_action", AsyncMock(return_value="BTC: RSI 61."))
+
+    seen: list[str] = []
+
+    async def _on_text(chunk: str) -> None:
+        seen.append(chunk)
+
+    out = await agent.respond(
+        "how is my btc position doing",
+        db=_FakeSession(),
+        shared_context=SharedContext.default("user-001"),
+        on_text=_on_text,
+    )
+
+    streamed = "".join(seen)
+    assert "access" not in streamed.lower()
+    assert streamed.endswith("Your BTC position is up 4%.\n\nBTC: RSI 61.")
+    assert out["response"] == "Your BTC position is up 4%.\n\nBTC: RSI 61."
+
+
+def test_system_prompt_is_memoised_for_identical_context():
+    from src.agents.core.conversation_agent import _compose_channel_system_prompt
+    from src.agents.core.unitrader_chat_prompt import build_system_prompt
+    from src.agents.shared_memory import SharedContext
+
+    ctx = SharedContext.default("user-001")
+    ctx.ai_name = "Zeus"
+    first = build_system_prompt(ctx, "web")
+    second = build_system_prompt(ctx, "web")
+    assert first is second
+
+    ctx.trading_paused = True
+    assert build_system_prompt(ctx, "web") != first
+
+    wrapped = _compose_channel_system_prompt(first, "whatsapp", "Zeus")
+    assert wrapped.startswith("You are Zeus")
+    assert wrapped is _compose_channel_system_prompt(first, "whatsapp", "Zeus")
+
+
+def test_history_trimmed_oldest_first_when_over_budget():
+    from src.agents.core.conversation_agent import _trim_history_to_budget
+
+    history = []
+    for i in range(6):
+        history.append({"role": "user", "content": f"q{i} " + "x" * 400})
+        history.append({"role": "assistant", "content": f"a{i} " + "y" * 400})
+
+    # Under budget: untouched.
+    assert _trim_history_to_budget("sys", history, "hi", budget=10_000) is history
+
+    trimmed = _trim_history_to_budget("sys", history, "hi", budget=450)
+    assert trimmed == history[-4:]
+    assert trimmed[0]["role"] == "user"
+
+
+@pytest.mark.asyncio
+async def test_repeat_question_served_from_response_cache(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    import src.agents.core.conversation_agent as ca
+    from src.agents.core.conversation_agent import ConversationAgent
+    from src.agents.shared_memory import SharedContext
+    from config import settings
+
+    monkeypatch.setattr(settings, "anthropic_api_key", "test")
+    monkeypatch.setattr(ca, "_response_cache", {})
+
+    user = SimpleNamespace(id="user-cache", email="u@example.com", ai_name="Zeus")
+
+    class _FakeSession:
+        async def execute(self, *_args, **_kwargs):
+            return SimpleNamespace(scalar_one_or_none=lambda: user)
+
+    agent = ConversationAgent("user-cache")
+    create = AsyncMock(return_value=_ClaudeResp("RSI measures momentum."))
+    agent._claude = SimpleNamespace(messages=SimpleNamespace(create=create))
+
+    monkeypatch.setattr(ca, "get_recent_messages_for_claude", AsyncMock(return_value=[]))
+    monkeypatch.setattr(
+        ca, "save_conversation", AsyncMock(return_value=type("_Conv", (), {"id": "c1"})())
+    )
+    monkeypatch.setattr(ca, "_save_onboarding_messages", AsyncMock(return_value=None))
+
+    ctx = SharedContext.default("user-cache")
+    first = await agent.respond("What is RSI?", db=_FakeSession(), shared_context=ctx)
+    second = await agent.respond("  what is   rsi ", db=_FakeSession(), shared_context=ctx)
+
+    assert create.await_count == 1
+    assert second["response"] == first["response"]
+    assert second["conversation_id"] != first["conversation_id"]
+
+    # Another user never sees this user's cached answer.
+    other = ConversationAgent("user-other")
+    other._claude = agent._claude
+    await other.respond("What is RSI?", db=_FakeSession(), shared_context=ctx)
+    assert create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_response_cache_isolates_callers_and_skips_follow_ups(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    import src.agents.core.conversation_agent as ca
+    from src.agents.core.conversation_agent import ConversationAgent
+    from src.agents.shared_memory import SharedContext
+    from config import settings
+
+    monkeypatch.setattr(settings, "anthropic_api_key", "test")
+    monkeypatch.setattr(ca, "_response_cache", {})
+
+    user = SimpleNamespace(id="user-cache", email="u@example.com", ai_name="Zeus")
+
+    class _FakeSession:
+        async def execute(self, *_args, **_kwargs):
+            return SimpleNamespace(scalar_one_or_none=lambda: user)
+
+    agent = ConversationAgent("user-cache")
+    create = AsyncMock(return_value=_ClaudeResp("RSI measures momentum."))
+    agent._claude = SimpleNamespace(messages=SimpleNamespace(create=create))
+
+    monkeypatch.setattr(ca, "get_recent_messages_for_claude", AsyncMock(return_value=[]))
+    monkeypatch.setattr(
+        ca, "save_conversation", AsyncMock(return_value=type("_Conv", (), {"id": "c1"})())
+    )
+    monkeypatch.setattr(ca, "_save_onboarding_messages", AsyncMock(return_value=None))
+    ctx = SharedContext.default("user-cache")
+
+    # The chat router writes per-request fields into the returned dict.
+    first = await agent.respond("What is RSI?", db=_FakeSession(), shared_context=ctx)
+    first["pending_trade"] = {"symbol": "BTCUSDT"}
+    first["action_taken"] = "trade_proposed"
+
+    streamed: list[str] = []
+
+    async def _on_text(chunk: str) -> None:
+        streamed.append(chunk)
+
+    second = await agent.respond(
+        "What is RSI?", db=_FakeSession(), shared_context=ctx, on_text=_on_text
+    )
+    assert create.await_count == 1
+    assert "pending_trade" not in second and "action_taken" not in second
+    assert streamed == ["RSI measures momentum."]
+
+    # Short or anaphoric follow-ups depend on the previous turn.
+    for follow_up in ("yes", "why?", "tell me more", "tell me more about that"):
+        await agent.respond(follow_up, db=_FakeSession(), shared_context=ctx)
+        await agent.respond(follow_up, db=_FakeSession(), shared_context=ctx)
+    assert create.await_count == 9
+
+
+@pytest.mark.asyncio
+async def test_reply_with_action_tag_is_never_cached(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    import src.agents.core.conversation_agent as ca
+    from src.agents.core.conversation_agent import ConversationAgent
+    from src.agents.shared_memory import SharedContext
+    from config import settings
+
+    monkeypatch.setattr(settings, "anthropic_api_key", "test")
+    monkeypatch.setattr(ca, "_response_cache", {})
+
+    user = SimpleNamespace(id="user-cache", email="u@example.com", ai_name="Zeus")
+
+    class _FakeSession:
+        async def execute(self, *_args, **_kwargs):
+            return SimpleNamespace(scalar_one_or_none=lambda: user)
+
+    agent = ConversationAgent("user-cache")
+    create = AsyncMock(
+        return_value=_ClaudeResp('Checking RSI now. <ACTION type="ANALYSE" asset="BTC" />')
+    )
+    agent._claude = SimpleNamespace(messages=SimpleNamespace(create=create))
+
+    monkeypatch.setattr(ca, "get_recent_messages_for_claude", AsyncMock(return_value=[]))
+    monkeypatch.setattr(
+        ca, "save_conversation", AsyncMock(return_value=type("_Conv", (), {"id": "c1"})())
+    )
+    monkeypatch.setattr(ca, "_save_onboarding_messages", AsyncMock(return_value=None))
+    # The action ran but produced no text to append.
+    dispatch = AsyncMock(return_value=None)
+    monkeypatch.setattr(ca, "dispatch_action", dispatch)
+
+    ctx = SharedContext.default("user-cache")
+    for _ in range(2):
+        await agent.respond("What is the RSI on BTC?", db=_FakeSession(), shared_context=ctx)
+
+    assert create.await_count == 2
+    assert dispatch.await_count == 2
+
+
+def test_claude_error_logging_is_throttled(monkeypatch, caplog):
+    import logging
+
+    import src.agents.core.conversation_agent as ca
+
+    monkeypatch.setattr(ca, "_last_claude_error_log_ts", float("-inf"))
+    with caplog.at_level(logging.DEBUG, logger=ca.logger.name):
+        for _ in range(3):
+            ca._log_claude_error("ConversationAgent", TimeoutError("upstream down"))
+
+    errors = [r for r in caplog.records if r.levelno == logging.ERROR]
+    debugs = [r for r in caplog.records if r.levelno == logging.DEBUG]
+    assert len(errors) == 1
+    assert "TimeoutError" in errors[0].getMessage()
+    assert len(debugs) == 2
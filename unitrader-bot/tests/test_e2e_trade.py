@@ -379,7 +379,7 @@ class TestStage4PaperTradeExecution:
             mock_db.add = MagicMock()
 
             # execute() loads user, settings, api key in sequence
-            def mock_execute_side_effect(query):
+            def mock_execute_side_effect(query, *_args, **_kwargs):
                 result = MagicMock()
                 # TradingAgent.execute_trade() issues multiple selects (User, UserSettings, ExchangeAPIKey, etc).
                 # Return the appropriate object based on which table is being selected.
@@ -491,7 +491,7 @@ class TestStage5FullPipeline:
         # ── Step 4: Personalisation + Learning Hub Filter ────────────────
         print("\n[4/6] Applying personalisation + learning hub filters...")
         t = time.perf_counter()
-        decision = await agent.personalize_decision(decision, user_history, insights)
+        decision = agent.personalize_decision(decision, user_history, insights)
         print(f"  After personalisation: {decision['decision']}  "
               f"size={decision.get('position_size_pct', 0)}%  ({time.perf_counter()-t:.1f}s)")
 
@@ -0,0 +1,142 @@
+"""
+tests/test_exchange_brackets.py — place_bracket() SL + TP placement.
+
+Covers:
+    1.  Alpaca sends one OCO exit order for the open position
+    2.  Binance sends one orderList/oco sized to the parent fill
+    3.  A rejected OCO falls back to separate stop / target orders
+    4.  Binance quantities and prices use the symbol's exchangeInfo precision
+    5.  Quantities floor to the LOT_SIZE step; prices snap to the tick
+
+HTTP is served by ``httpx.MockTransport`` so no real network calls are made.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Callable
+from urllib.parse import parse_qs
+
+import httpx
+
+from src.integrations.exchange_client import AlpacaClient, BinanceClient
+
+
+def _mock_http(base_url: str, handler: Callable[[httpx.Request], httpx.Response]):
+    return httpx.AsyncClient(base_url=base_url, transport=httpx.MockTransport(handler))
+
+
+async def test_alpaca_bracket_is_single_oco_order():
+    posts: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"qty": "3"})
+        posts.append(json.loads(request.content))
+        return httpx.Response(200, json={"id": "oco-1"})
+
+    client = AlpacaClient("k", "s", is_paper=True)
+    client._http = _mock_http("https://paper-api.alpaca.markets", handler)
+
+    assert await client.place_bracket("AAPL", "o1", 95.0, 110.0) == (True, True)
+    assert len(posts) == 1
+    assert posts[0]["order_class"] == "oco"
+    assert posts[0]["qty"] == "3.0"
+    assert posts[0]["take_profit"] == {"limit_price": "110.0"}
+    assert posts[0]["stop_loss"] == {"stop_price": "95.0"}
+
+
+async def test_binance_bracket_is_single_order_list():
+    oco_params: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"executedQty": "0.5"})
+        oco_params.append({k: v[0] for k, v in parse_qs(request.url.query.decode()).items()})
+        return httpx.Response(200, json={"orderListId": 1})
+
+    client = BinanceClient("k", "s")
+    client._http = _mock_http("https://api.binance.com", handler)
+
+    assert await client.place_bracket("BTCUSDT", "1", 60_000.0, 70_000.0) == (True, True)
+    assert len(oco_params) == 1
+    params = oco_params[0]
+    assert params["side"] == "SELL"
+    assert params["quantity"] == "0.50000000"
+    assert params["aboveType"] == "LIMIT_MAKER"
+    assert params["abovePrice"] == "70000.00000000"
+    assert params["belowType"] == "STOP_LOSS_LIMIT"
+    assert params["belowStopPrice"] == "60000.00000000"
+
+
+async def test_rejected_oco_falls_back_to_separate_legs():
+    order_types: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"qty": "2"})
+        body = json.loads(request.content)
+        if body.get("order_class") == "oco":
+            return httpx.Response(422, json={"message": "oco not allowed"})
+        order_types.append(body["type"])
+        return httpx.Response(200, json={"id": "leg"})
+
+    client = AlpacaClient("k", "s", is_paper=True)
+    client._http = _mock_http("https://paper-api.alpaca.markets", handler)
+
+    assert await client.place_bracket("AAPL", "o1", 95.0, 110.0) == (True, True)
+    assert sorted(order_types) == ["limit", "stop"]
+
+
+async def test_binance_prices_use_symbol_precision():
+    oco_params: list[dict] = []
+    info_calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal info_calls
+        if request.url.path == "/api/v3/exchangeInfo":
+            info_calls += 1
+            return httpx.Response(200, json={"symbols": [{"filters": [
+                {"filterType": "PRICE_FILTER", "tickSize": "0.01000000"},
+                {"filterType": "LOT_SIZE", "stepSize": "0.00001000"},
+            ]}]})
+        if request.method == "GET":
+            return httpx.Response(200, json={"executedQty": "0.5"})
+        oco_params.append({k: v[0] for k, v in parse_qs(request.url.query.decode()).items()})
+        return httpx.Response(200, json={"orderListId": 1})
+
+    client = BinanceClient("k", "s")
+    client._http = _mock_http("https://api.binance.com", handler)
+
+    await client.place_bracket("BTCUSDT", "1", 60_000.0, 70_000.0)
+    await client.place_bracket("BTCUSDT", "2", 60_000.0, 70_000.0)
+
+    assert info_calls == 1
+    params = oco_params[0]
+    assert params["quantity"] == "0.50000"
+    assert params["abovePrice"] == "70000.00"
+    assert params["belowPrice"] == "59940.00"
+
+
+async def test_binance_quantity_floors_to_step_and_price_snaps_to_tick():
+    orders: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v3/exchangeInfo":
+            return httpx.Response(200, json={"symbols": [{"filters": [
+                {"filterType": "PRICE_FILTER", "tickSize": "0.05000000"},
+                {"filterType": "LOT_SIZE", "stepSize": "0.50000000"},
+            ]}]})
+        orders.append({k: v[0] for k, v in parse_qs(request.url.query.decode()).items()})
+        return httpx.Response(200, json={"orderId": 9})
+
+    client = BinanceClient("k", "s")
+    client._http = _mock_http("https://api.binance.com", handler)
+
+    await client.place_order("XYZUSDT", "BUY", 2.99, price=1.2345)
+    await client.place_order("XYZUSDT", "BUY", 4.35 - 2.85, price=1.26)  # 1.4999999999999996
+
+    assert orders[0]["quantity"] == "2.5"  # never rounds up past the balance
+    assert orders[0]["price"] == "1.25"
+    assert orders[1]["quantity"] == "1.5"  # float noise does not drop a step
+    assert orders[1]["price"] == "1.25"
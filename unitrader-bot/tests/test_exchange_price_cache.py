@@ -0,0 +1,167 @@
+"""
+tests/test_exchange_price_cache.py — exchange price lookups: caching, batching, fan-out.
+
+Covers:
+    1.  Repeated lookups within the TTL reuse one ticker request
+    2.  Concurrent misses for a symbol share one in-flight request
+    3.  Errors are not cached and reach every waiter
+    4.  A zero TTL disables the cache
+    5.  Binance lookups for different symbols are batched into one call
+    6.  A rejected batch is retried symbol by symbol
+    7.  A fresh streamed price is served without a REST call
+    8.  Multi-exchange helpers fan out and keep per-client failures
+
+HTTP is served by ``httpx.MockTransport`` so no real network calls are made.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from src.integrations import exchange_client as ec
+from src.services.price_store import PriceStore
+
+
+def _binance(handler) -> ec.BinanceClient:
+    client = ec.BinanceClient("k", "s", base_url="https://api.binance.com")
+    client._http = httpx.AsyncClient(
+        base_url="https://api.binance.com", transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+@pytest.fixture
+def ticker_calls():
+    return []
+
+
+@pytest.fixture
+def client(ticker_calls):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        ticker_calls.append(request.url.params["symbol"])
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"price": "101.5"})
+
+    return _binance(handler)
+
+
+async def test_price_reused_within_ttl(client, ticker_calls):
+    assert await client.get_current_price("BTCUSDT") == 101.5
+    assert await client.get_current_price("BTCUSDT") == 101.5
+    assert await client.get_current_price("ETHUSDT") == 101.5
+    assert ticker_calls == ["BTCUSDT", "ETHUSDT"]
+
+
+async def test_concurrent_misses_share_one_request(client, ticker_calls):
+    prices = await asyncio.gather(*(client.get_current_price("BTCUSDT") for _ in range(5)))
+    assert prices == [101.5] * 5
+    assert ticker_calls == ["BTCUSDT"]
+
+
+async def test_errors_are_not_cached():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)  # keep the request in flight for the second caller
+        return httpx.Response(400, json={"msg": "bad symbol"})
+
+    client = _binance(handler)
+    results = await asyncio.gather(
+        client.get_current_price("NOPE"), client.get_current_price("NOPE"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+    assert calls == 1
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_current_price("NOPE")
+    assert calls == 2
+
+
+async def test_zero_ttl_disables_cache(client, ticker_calls, monkeypatch):
+    monkeypatch.setattr(ec.settings, "price_cache_ttl", 0)
+    await client.get_current_price("BTCUSDT")
+    await client.get_current_price("BTCUSDT")
+    assert ticker_calls == ["BTCUSDT", "BTCUSDT"]
+
+
+async def test_binance_lookups_for_different_symbols_share_one_request():
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(request.url.params))
+        symbols = json.loads(request.url.params["symbols"])
+        return httpx.Response(
+            200, json=[{"symbol": s, "price": str(i + 1)} for i, s in enumerate(symbols)]
+        )
+
+    client = _binance(handler)
+    prices = await asyncio.gather(
+        client.get_current_price("BTCUSDT"), client.get_current_price("ETHUSDT")
+    )
+
+    assert prices == [1.0, 2.0]
+    assert seen == [{"symbols": '["BTCUSDT","ETHUSDT"]'}]
+
+
+async def test_binance_batch_falls_back_when_a_symbol_is_rejected():
+    def handler(request: httpx.Request) -> httpx.Response:
+        symbol = request.url.params.get("symbol")
+        if symbol is None or symbol == "NOPE":
+            return httpx.Response(400, json={"msg": "Invalid symbol."})
+        return httpx.Response(200, json={"symbol": symbol, "price": "7"})
+
+    client = _binance(handler)
+    good, bad = await asyncio.gather(
+        client.get_current_price("BTCUSDT"), client.get_current_price("NOPE"),
+        return_exceptions=True,
+    )
+
+    assert good == 7.0
+    assert isinstance(bad, httpx.HTTPStatusError)
+
+
+async def test_fresh_streamed_price_skips_rest(monkeypatch):
+    store = PriceStore()
+    monkeypatch.setattr(ec, "price_store", store)
+    client = ec.AlpacaClient("k", "s", is_paper=True)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"quotes": {"BTC/USD": {"bp": 10, "ap": 12}}})
+
+    client._data_http = httpx.AsyncClient(
+        base_url="https://data.alpaca.markets", transport=httpx.MockTransport(handler)
+    )
+
+    await store.update("BTC-USD", 50_000.0, source="coinbase_realtime")
+    assert await client.get_current_price("BTC/USD") == 50_000.0
+
+    store._prices["BTC-USD"].timestamp -= timedelta(seconds=60)
+    assert await client.get_current_price("BTC/USD") == 11.0
+
+
+async def test_multi_exchange_helpers_fan_out():
+    ok = SimpleNamespace(
+        get_account_balance=AsyncMock(return_value=100.0),
+        get_current_price=AsyncMock(return_value=1.5),
+    )
+    down = SimpleNamespace(
+        get_account_balance=AsyncMock(side_effect=httpx.ConnectError("down")),
+        get_current_price=AsyncMock(side_effect=httpx.ConnectError("down")),
+    )
+
+    balances = await ec.get_all_balances([ok, down])
+    assert balances[0] == 100.0 and isinstance(balances[1], httpx.ConnectError)
+
+    prices = await ec.get_all_prices([ok, down], ["BTCUSDT", "EUR_USD"])
+    assert prices[0] == 1.5 and isinstance(prices[1], httpx.ConnectError)
+    ok.get_current_price.assert_awaited_once_with("BTCUSDT")
@@ -0,0 +1,155 @@
+"""
+tests/test_exchange_retry.py — _with_retry() backoff behaviour.
+
+Covers:
+    1.  Retry-After (seconds and HTTP-date) is parsed and capped
+    2.  Backoff is jittered within the exponential envelope
+    3.  A 429 with Retry-After waits at least that long
+    4.  Non-retryable status codes are raised immediately
+    5.  Repeated outages open the circuit breaker; a good probe closes it
+    6.  @_retrying client helpers retry without a call-site wrapper
+    7.  Breakers are per helper and host, so testnet outages spare live
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from src.integrations import exchange_client as ec
+
+
+def _status_error(status: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.example.com/x")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("boom", request=request, response=response)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_breakers(monkeypatch):
+    monkeypatch.setattr(ec, "_BREAKERS", ec.defaultdict(ec._CBState))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded: list[float] = []
+
+    async def _sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(ec.asyncio, "sleep", _sleep)
+    return recorded
+
+
+def test_parse_retry_after():
+    assert ec._parse_retry_after("7") == 7.0
+    assert ec._parse_retry_after(None) is None
+    assert ec._parse_retry_after("soon") is None
+
+    when = datetime.now(timezone.utc) + timedelta(seconds=20)
+    assert 15 < ec._parse_retry_after(format_datetime(when, usegmt=True)) <= 20
+
+
+def test_retry_delay_is_jittered_within_envelope():
+    delays = {ec._retry_delay(3) for _ in range(50)}
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(delays) > 1
+    assert ec._retry_delay(20) <= ec._MAX_DELAY
+
+
+async def test_429_honours_retry_after(sleeps):
+    calls = 0
+
+    async def _call():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise _status_error(429, {"Retry-After": "5"})
+        return "ok"
+
+    assert await ec._with_retry(_call) == "ok"
+    assert len(sleeps) == 1 and 5.0 <= sleeps[0] <= ec._MAX_DELAY
+
+
+async def test_retry_after_is_capped(sleeps):
+    calls = 0
+
+    async def _call():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise _status_error(503, {"Retry-After": "3600"})
+        return "ok"
+
+    await ec._with_retry(_call)
+    assert sleeps == [ec._MAX_DELAY]
+
+
+async def test_client_error_is_not_retried(sleeps):
+    async def _call():
+        raise _status_error(400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await ec._with_retry(_call)
+    assert sleeps == []
+
+
+async def test_breaker_opens_after_repeated_outages_and_recovers(sleeps):
+    calls = 0
+    healthy = False
+
+    async def _call():
+        nonlocal calls
+        calls += 1
+        if healthy:
+            return "ok"
+        raise httpx.ConnectError("down")
+
+    for _ in range(ec._CB_FAILURE_THRESHOLD):
+        with pytest.raises(httpx.ConnectError):
+            await ec._with_retry(_call)
+    assert calls == ec._CB_FAILURE_THRESHOLD * ec._MAX_RETRIES
+
+    with pytest.raises(ec.CircuitOpenError):
+        await ec._with_retry(_call)
+    assert calls == ec._CB_FAILURE_THRESHOLD * ec._MAX_RETRIES
+
+    (breaker,) = ec._BREAKERS.values()
+    breaker.opened_at -= ec._CB_COOLDOWN
+    healthy = True
+    assert await ec._with_retry(_call) == "ok"
+    assert breaker.state == "CLOSED"
+
+
+async def test_client_request_helpers_retry_themselves(sleeps):
+    responses = iter([httpx.Response(503), httpx.Response(200, json={"orderId": 7})])
+    client = ec.BinanceClient("k", "s")
+    client._http = httpx.AsyncClient(
+        base_url="https://api.binance.com",
+        transport=httpx.MockTransport(lambda request: next(responses)),
+    )
+
+    assert await client._post("/api/v3/order", {"symbol": "BTCUSDT"}) == {"orderId": 7}
+    assert len(sleeps) == 1
+    assert "BinanceClient._post@api.binance.com" in ec._BREAKERS
+
+
+async def test_breakers_are_per_host(sleeps):
+    def _client(base_url, handler):
+        client = ec.BinanceClient("k", "s")
+        client._http = httpx.AsyncClient(base_url=base_url, transport=httpx.MockTransport(handler))
+        return client
+
+    testnet = _client("https://testnet.binance.vision", lambda request: httpx.Response(503))
+    live = _client("https://api.binance.com", lambda request: httpx.Response(200, json={"ok": 1}))
+
+    for _ in range(ec._CB_FAILURE_THRESHOLD):
+        with pytest.raises(httpx.HTTPStatusError):
+            await testnet._get("/api/v3/ping")
+    with pytest.raises(ec.CircuitOpenError):
+        await testnet._get("/api/v3/ping")
+
+    assert await live._get("/api/v3/ping") == {"ok": 1}
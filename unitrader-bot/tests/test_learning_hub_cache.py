@@ -0,0 +1,61 @@
+"""Unit tests for the Learning Hub insights cache."""
+
+import asyncio
+
+from src.services import learning_hub as hub
+
+
+async def test_trading_insights_cached_until_invalidated(monkeypatch):
+    calls = 0
+
+    async def _load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return {"has_insights": True, "n": calls}
+
+    monkeypatch.setattr(hub, "_load_trading_insights", _load)
+    monkeypatch.setattr(hub, "_insights_cache", {})
+
+    first, second = await asyncio.gather(
+        hub.get_trading_insights(), hub.get_trading_insights()
+    )
+    assert first is second
+    assert await hub.get_trading_insights() is first
+    assert calls == 1
+
+    hub.invalidate_insights_cache()
+    assert (await hub.get_trading_insights())["n"] == 2
+
+
+async def test_instructions_cached_per_agent(monkeypatch):
+    loaded: list[str] = []
+
+    async def _load(agent_name):
+        loaded.append(agent_name)
+        return [{"instruction": agent_name}]
+
+    monkeypatch.setattr(hub, "_load_active_instructions", _load)
+    monkeypatch.setattr(hub, "_insights_cache", {})
+
+    await hub.get_active_instructions("trading")
+    await hub.get_active_instructions("trading")
+    await hub.get_active_instructions("content_writer")
+
+    assert loaded == ["trading", "content_writer"]
+
+
+async def test_content_insights_cached(monkeypatch):
+    calls = 0
+
+    async def _load():
+        nonlocal calls
+        calls += 1
+        return {"viral_topics": ["RSI momentum"]}
+
+    monkeypatch.setattr(hub, "_load_content_insights", _load)
+    monkeypatch.setattr(hub, "_insights_cache", {})
+
+    first = await hub.get_content_insights()
+    assert await hub.get_content_insights() is first
+    assert calls == 1
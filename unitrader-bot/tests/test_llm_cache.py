@@ -0,0 +1,33 @@
+"""Unit tests for the marketing Claude response cache."""
+
+from datetime import datetime, timedelta, timezone
+
+from src.services import llm_cache
+
+
+async def test_exact_prompt_hit_and_prompt_change_miss(monkeypatch):
+    monkeypatch.setattr(llm_cache, "_llm_cache", {})
+    data = {"title": "RSI Guide", "content": "# RSI"}
+
+    assert await llm_cache.lookup("content_writer", "sys", "user") is None
+    await llm_cache.store("content_writer", "sys", "user", data)
+
+    assert await llm_cache.lookup("content_writer", "sys", "user") is data
+    assert await llm_cache.lookup("content_writer", "sys", "user + stats") is None
+    assert await llm_cache.lookup("social_media", "sys", "user") is None
+
+
+async def test_expired_and_evicted_entries_miss(monkeypatch):
+    monkeypatch.setattr(llm_cache, "_llm_cache", {})
+    monkeypatch.setattr(llm_cache, "_LLM_CACHE_MAX", 2)
+
+    await llm_cache.store("a", "s", "1", [1])
+    await llm_cache.store("a", "s", "2", [2])
+    await llm_cache.store("a", "s", "3", [3])
+    assert await llm_cache.lookup("a", "s", "1") is None
+    assert await llm_cache.lookup("a", "s", "3") == [3]
+
+    key = llm_cache.prompt_key("a", "s", "2")
+    stale = datetime.now(timezone.utc) - timedelta(seconds=llm_cache.LLM_CACHE_TTL_SECONDS + 1)
+    llm_cache._llm_cache[key] = ([2], stale)
+    assert await llm_cache.lookup("a", "s", "2") is None
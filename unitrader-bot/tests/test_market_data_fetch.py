@@ -0,0 +1,202 @@
+"""
+tests/test_market_data_fetch.py — market_data.py HTTP fetch paths.
+
+Covers:
+    1.  Fetches share one pooled client and send provider auth per request
+    2.  A closed shared client is rebuilt on next use
+    3.  full_market_analysis fetches snapshot and closes concurrently and
+        keeps the snapshot when the closes fetch fails
+    4.  Snapshots and closes are reused within their TTL as private copies
+    5.  The data cache evicts least-recently-used entries past its bound
+    6.  Concurrent misses share one request; fetch_ohlcv_many keeps
+        per-pair failures
+    7.  Provider auth is built once per settings value
+    8.  Repeated venue timeouts open its breaker; reads then fail fast and
+        fall back to recently cached data
+
+HTTP is served by ``httpx.MockTransport`` so no real network calls are made.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.integrations import market_data as md
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch):
+    monkeypatch.setattr(md, "_data_cache", md.OrderedDict())
+    monkeypatch.setattr(md.settings, "binance_ws_url", "")
+    monkeypatch.setattr(
+        md, "_VENUE_BREAKERS", md.defaultdict(lambda: md._CBState(threshold=3, window=60.0))
+    )
+
+
+@pytest.fixture
+def mock_client(monkeypatch):
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if "candles" in request.url.path:
+            return httpx.Response(200, json={"candles": [{"mid": {"c": "1.1"}}]})
+        return httpx.Response(200, json=[[0, "1", "2", "0.5", "1.5", "10"]])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(md, "_http_client", client)
+    monkeypatch.setattr(md.settings, "oanda_api_key", "tok", raising=False)
+    return seen
+
+
+async def test_fetches_share_client_and_send_headers_per_request(mock_client):
+    shared = md._get_http_client()
+
+    assert await md._fetch_oanda_closes("EUR_USD", 1) == [1.1]
+    assert await md._fetch_binance_closes("BTCUSDT", 1) == [1.5]
+
+    assert md._get_http_client() is shared
+    oanda, binance = mock_client
+    assert oanda.headers["Authorization"] == "Bearer tok"
+    assert "Authorization" not in binance.headers
+
+
+async def test_closed_client_is_rebuilt():
+    await md.close_http_client()
+    first = md._get_http_client()
+    await first.aclose()
+
+    second = md._get_http_client()
+    assert second is not first and not second.is_closed
+    await md.close_http_client()
+
+
+async def test_full_analysis_fetches_concurrently_and_survives_ohlcv_failure(monkeypatch):
+    started: list[str] = []
+
+    async def fake_snapshot(symbol, exchange):
+        started.append("snapshot")
+        await asyncio.sleep(0.01)
+        assert "ohlcv" in started
+        return {"symbol": symbol, "price": 1.0}
+
+    async def failing_ohlcv(symbol, exchange, limit=200):
+        started.append("ohlcv")
+        raise httpx.ConnectError("down")
+
+    monkeypatch.setattr(md, "fetch_market_data", fake_snapshot)
+    monkeypatch.setattr(md, "fetch_ohlcv", failing_ohlcv)
+
+    result = await md.full_market_analysis("BTCUSDT", "binance")
+    assert result["price"] == 1.0
+    assert result["closes_available"] == 0
+    assert result["indicators"] == {}
+
+
+async def test_snapshot_and_closes_reused_within_ttl(mock_client, monkeypatch):
+    spec_calls: list[str] = []
+
+    async def adapter_fetch(symbol):
+        spec_calls.append(symbol)
+        return {"symbol": symbol, "price": 2.0}
+
+    monkeypatch.setattr(md, "_fetch_binance", adapter_fetch)
+
+    first = await md.fetch_market_data("btcusdt", "binance")
+    first["price"] = 0.0
+    assert (await md.fetch_market_data("BTCUSDT", "binance"))["price"] == 2.0
+    assert spec_calls == ["BTCUSDT"]
+
+    closes = await md.fetch_ohlcv("BTCUSDT", "binance", limit=1)
+    closes.append(99.0)
+    assert await md.fetch_ohlcv("BTCUSDT", "binance", limit=1) == [1.5]
+    assert len(mock_client) == 1
+
+    monkeypatch.setattr(md, "_SNAPSHOT_CACHE_TTL", 0.0)
+    md._data_cache.clear()
+    await md.fetch_market_data("BTCUSDT", "binance")
+    await md.fetch_market_data("BTCUSDT", "binance")
+    assert len(spec_calls) == 3
+
+
+def test_data_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(md, "_DATA_CACHE_MAX", 2)
+    md._cache_put(("a",), 60, 1)
+    md._cache_put(("b",), 60, 2)
+    assert md._cache_get(("a",)) == 1
+    md._cache_put(("c",), 60, 3)
+
+    assert md._cache_get(("b",)) is None
+    assert md._cache_get(("a",)) == 1 and md._cache_get(("c",)) == 3
+
+
+async def test_concurrent_misses_share_one_request(monkeypatch):
+    calls: list[str] = []
+
+    async def slow_closes(symbol, limit):
+        calls.append(symbol)
+        await asyncio.sleep(0.01)
+        if symbol == "ETHUSDT":
+            raise httpx.ConnectError("down")
+        return [1.0, 2.0]
+
+    monkeypatch.setitem(md._CLOSES_FETCHERS, ("binance", "crypto"), slow_closes)
+
+    results = await md.fetch_ohlcv_many(
+        [("BTCUSDT", "binance"), ("BTCUSDT", "binance"), ("ETHUSDT", "binance")], limit=2
+    )
+
+    assert results[0] == results[1] == [1.0, 2.0]
+    assert results[0] is not results[1]
+    assert isinstance(results[2], httpx.ConnectError)
+    assert sorted(calls) == ["BTCUSDT", "ETHUSDT"]
+    assert md._inflight == {}
+
+
+def test_provider_auth_built_once_per_settings_value(monkeypatch):
+    monkeypatch.setattr(md.settings, "alpaca_data_url", "https://data.example/")
+    monkeypatch.setattr(md.settings, "alpaca_paper_api_key", "k1", raising=False)
+    monkeypatch.setattr(md.settings, "alpaca_paper_api_secret", "", raising=False)
+
+    base, headers = md._alpaca_data_auth()
+    assert base == "https://data.example"
+    assert headers == {"APCA-API-KEY-ID": "k1"}
+    assert md._alpaca_data_auth()[1] is headers
+
+    monkeypatch.setattr(md.settings, "alpaca_paper_api_key", "k2", raising=False)
+    assert md._alpaca_data_auth()[1] == {"APCA-API-KEY-ID": "k2"}
+
+
+async def test_stalled_venue_opens_breaker_and_serves_stale_snapshot(monkeypatch):
+    calls = 0
+    stalled = False
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if stalled:
+            raise httpx.ReadTimeout("stalled", request=request)
+        return httpx.Response(200, json={
+            "lastPrice": "10", "highPrice": "11", "lowPrice": "9",
+            "quoteVolume": "5", "priceChangePercent": "1",
+        })
+
+    monkeypatch.setattr(md, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(md, "_SNAPSHOT_CACHE_TTL", 0.0)
+
+    assert (await md.fetch_market_data("BTCUSDT", "binance"))["price"] == 10.0
+
+    stalled = True
+    for _ in range(3):
+        with pytest.raises(httpx.ReadTimeout):
+            await md._fetch_binance("ETHUSDT")
+    assert md._VENUE_BREAKERS["binance"].state == "OPEN"
+
+    before = calls
+    with pytest.raises(md.CircuitOpenError):
+        await md._fetch_binance("ETHUSDT")
+    assert (await md.fetch_market_data("BTCUSDT", "binance"))["price"] == 10.0
+    assert calls == before
@@ -0,0 +1,66 @@
+"""Storage tests for social posts against an in-memory SQLite database."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from models import SocialPost
+from src.agents.marketing import social_media as sm
+
+
+@pytest.fixture
+async def session_factory(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: SocialPost.__table__.create(sync_conn))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(sm, "AsyncSessionLocal", factory)
+    monkeypatch.setattr(sm, "_post_count", None)
+    yield factory
+    await engine.dispose()
+
+
+def _post(i: int) -> dict:
+    return {
+        "platform": "twitter",
+        "content": f"post {i}",
+        "post_type": "educational",
+        "scheduled_for": f"2026-01-0{i + 1}T09:00:00+00:00",
+    }
+
+
+async def test_batch_insert_returns_ids_in_input_order(session_factory):
+    ids = await sm._save_social_posts([_post(i) for i in range(3)])
+
+    async with session_factory() as db:
+        rows = dict((await db.execute(select(SocialPost.id, SocialPost.content))).all())
+    assert [rows[i] for i in ids] == ["post 0", "post 1", "post 2"]
+
+
+async def test_rotation_count_scanned_once_then_tracked(session_factory):
+    await sm._save_social_posts([_post(0)])
+    assert sm._post_count is None
+
+    assert await sm._social_post_count() == 1
+    await sm._save_social_posts([_post(1), _post(2)])
+    assert sm._post_count == 3
+
+
+async def test_calendar_reads_scheduled_rows(session_factory):
+    soon = datetime.now(timezone.utc) + timedelta(days=1)
+    later = datetime.now(timezone.utc) + timedelta(days=60)
+    await sm._save_social_posts(
+        [
+            dict(_post(0), scheduled_for=later.isoformat()),
+            dict(_post(1), scheduled_for=soon.isoformat(), hashtags=["#rsi"]),
+        ]
+    )
+
+    calendar = await sm.get_social_calendar(days=30)
+
+    assert [p["content"] for p in calendar] == ["post 1"]
+    assert calendar[0]["hashtags"] == ["#rsi"]
+    assert calendar[0]["is_posted"] is False
+    assert calendar[0]["created_at"] is not None
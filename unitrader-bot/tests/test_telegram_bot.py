@@ -84,6 +84,9 @@ def _bot_service():
     svc.token = "fake:TOKEN"
     svc.app = MagicMock()
     svc.app.bot = AsyncMock()
+    svc._linked_cache = {}
+    svc._log_queue = None
+    svc._log_task = None
     return svc
 
 
@@ -179,7 +182,7 @@ async def test_link_invalid_code():
     mock_session.__aenter__ = AsyncMock(return_value=mock_session)
     mock_session.__aexit__  = AsyncMock(return_value=False)
     mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
+    mock_result.first.return_value = None
     mock_session.execute = AsyncMock(return_value=mock_result)
 
     with patch.object(svc, "_get_linked_user", new=AsyncMock(return_value=None)), \
@@ -190,6 +193,32 @@ async def test_link_invalid_code():
     assert "invalid" in reply_text.lower() or "expired" in reply_text.lower()
 
 
+@pytest.mark.asyncio
+async def test_link_valid_code_reads_code_and_user_together():
+    """/link CODE loads the code and its owner in one query, then links."""
+    svc  = _bot_service()
+    upd  = _update("/link ABC123")
+    user = _fake_user()
+    row  = SimpleNamespace(user_id=user.id, is_used=False, used_at=None)
+
+    mock_session = _mock_async_session()
+    mock_session.add = MagicMock()
+    mock_session.execute = AsyncMock(
+        return_value=MagicMock(**{"first.return_value": (row, user)})
+    )
+
+    with patch.object(svc, "_get_linked_user", new=AsyncMock(return_value=None)), \
+         patch("src.integrations.telegram_bot.AsyncSessionLocal", return_value=mock_session), \
+         patch.object(svc, "_log", new=AsyncMock()):
+        await svc.cmd_link(upd, _ctx(["abc123"]))
+
+    mock_session.execute.assert_awaited_once()
+    mock_session.commit.assert_awaited_once()
+    assert row.is_used is True
+    assert mock_session.add.call_args.args[0].user_id == user.id
+    assert "Atlas" in upd.message.reply_text.call_args[0][0]
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # /link — generate new code (bot-initiated, no args)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -451,7 +480,7 @@ async def test_performance_no_trades():
 
     mock_session = _mock_async_session()
     mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = []
+    mock_result.one.return_value = (0, None, None, None, None, None)
     mock_session.execute = AsyncMock(return_value=mock_result)
 
     with patch.object(svc, "_telegram_linked_user", new=AsyncMock(return_value=user)), \
@@ -471,16 +500,13 @@ async def test_performance_with_trades():
     user = _fake_user()
     upd  = _update("/performance")
 
-    trades = [
-        SimpleNamespace(profit=200.0, loss=0.0),
-        SimpleNamespace(profit=150.0, loss=0.0),
-        SimpleNamespace(profit=0.0,   loss=80.0),
-        SimpleNamespace(profit=300.0, loss=0.0),
-    ]
+    # Aggregate row for +200, +150, -80, +300:
+    # (count, total, worst, best, wins, longest streak)
+    stats = (4, 570.0, -80.0, 300.0, 3, 2)
 
     mock_session = _mock_async_session()
     mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = trades
+    mock_result.one.return_value = stats
     mock_session.execute = AsyncMock(return_value=mock_result)
 
     with patch.object(svc, "_telegram_linked_user", new=AsyncMock(return_value=user)), \
@@ -639,46 +665,144 @@ async def test_unlink_not_linked():
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# /help — always works
+# Linked-user cache
 # ─────────────────────────────────────────────────────────────────────────────
 
 @pytest.mark.asyncio
-async def test_help_shows_all_commands():
-    """/help lists every major command."""
+async def test_linked_user_is_cached_by_id():
+    """A cold lookup queries the link; a warm one loads the user by primary key."""
+    svc  = _bot_service()
+    user = _fake_user()
+    ext  = SimpleNamespace(user_id=user.id, last_used_at=None)
+    db   = AsyncMock()
+    db.execute = AsyncMock(side_effect=[
+        MagicMock(**{"scalar_one_or_none.return_value": ext}),
+        MagicMock(**{"scalar_one_or_none.return_value": user}),
+    ])
+    db.get = AsyncMock(return_value=user)
+
+    assert await svc._telegram_linked_user(db, "123456789") is user
+    assert ext.last_used_at is not None
+    assert await svc._telegram_linked_user(db, "123456789") is user
+
+    assert db.execute.await_count == 2
+    db.get.assert_awaited_once()
+    assert db.get.call_args.args[1] == user.id
+
+    user.is_active = False
+    assert await svc._telegram_linked_user(db, "123456789") is None
+    assert "123456789" not in svc._linked_cache
+
+
+@pytest.mark.asyncio
+async def test_unlink_confirm_drops_cached_link():
+    """Confirming /unlink forgets the cached link immediately."""
     svc = _bot_service()
-    upd = _update("/help")
+    svc._linked_cache["123456789"] = ("user-001", float("inf"))
+    upd = MagicMock()
+    upd.callback_query.answer = AsyncMock()
+    upd.callback_query.edit_message_text = AsyncMock()
+    upd.callback_query.data = "unlink_confirm:123456789"
+    upd.callback_query.from_user.id = 123456789
 
-    await svc.cmd_help(upd, _ctx())
+    mock_session = _mock_async_session()
+    mock_session.execute = AsyncMock(
+        return_value=MagicMock(**{"scalar_one_or_none.return_value": None})
+    )
+    with patch("src.integrations.telegram_bot.AsyncSessionLocal", return_value=mock_session), \
+         patch.object(svc, "_log", new=AsyncMock()):
+        await svc.handle_callback(upd, _ctx())
 
-    text = upd.message.reply_text.call_args[0][0]
-    for cmd in ("/portfolio", "/trade", "/close", "/history", "/performance", "/chat"):
-        assert cmd in text, f"{cmd} missing from /help output"
+    assert svc._linked_cache == {}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# _winning_streak helper
+# bot_messages log writer
 # ─────────────────────────────────────────────────────────────────────────────
 
-def test_winning_streak_empty():
-    from src.integrations.telegram_bot import _winning_streak
-    assert _winning_streak([]) == 0
+@pytest.mark.asyncio
+async def test_log_rows_are_batched_off_the_reply_path(monkeypatch):
+    """_log only enqueues; the writer commits queued rows in bounded batches."""
+    import asyncio
+    from src.integrations import telegram_bot as tb
+
+    monkeypatch.setattr(tb, "_LOG_BATCH_MAX", 2)
+    batches: list[list] = []
+
+    async def _record(rows):
+        batches.append([r.command for r in rows])
 
+    svc = _bot_service()
+    monkeypatch.setattr(svc, "_write_logs", _record)
+    svc._log_queue = asyncio.Queue(maxsize=10)
+    svc._log_task = asyncio.create_task(svc._log_worker())
+    for cmd in ("/a", "/b", "/c"):
+        await svc._log("1", "command", cmd, None, None, "success")
+    assert batches == []
 
-def test_winning_streak_all_wins():
-    from src.integrations.telegram_bot import _winning_streak
-    assert _winning_streak([100, 200, 300]) == 3
+    await svc.close()
 
+    assert batches == [["/a", "/b"], ["/c"]]
+    assert svc._log_task is None
 
-def test_winning_streak_mixed():
-    from src.integrations.telegram_bot import _winning_streak
-    # W W L W W W L W  → best streak = 3
-    profits = [50, 80, -20, 90, 110, 70, -5, 30]
-    assert _winning_streak(profits) == 3
 
+@pytest.mark.asyncio
+async def test_close_gives_up_when_writer_is_stuck_and_queue_full(monkeypatch):
+    """A down DB with a full queue cannot block shutdown."""
+    import asyncio
+    from src.integrations import telegram_bot as tb
+
+    monkeypatch.setattr(tb, "_LOG_DRAIN_TIMEOUT", 0.05)
+    monkeypatch.setattr(tb, "_LOG_FLUSH_INTERVAL", 0)
+
+    async def _hang(rows):
+        await asyncio.Event().wait()
+
+    svc = _bot_service()
+    monkeypatch.setattr(svc, "_write_logs", _hang)
+    svc._log_queue = asyncio.Queue(maxsize=1)
+    svc._log_task = asyncio.create_task(svc._log_worker())
+    await svc._log("1", "command", "/a", None, None, "success")
+    await asyncio.sleep(0)  # the writer takes /a and hangs in _write_logs
+    await svc._log("1", "command", "/b", None, None, "success")
+    await asyncio.sleep(0)
+    assert svc._log_queue.full()
+    task = svc._log_task
+
+    await asyncio.wait_for(svc.close(), timeout=1)
+    assert task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_log_writes_inline_without_worker_and_stamps_time():
+    """Before initialize() (or after close()) rows are written directly."""
+    svc = _bot_service()
+    mock_session = _mock_async_session()
+    mock_session.add_all = MagicMock()
 
-def test_winning_streak_all_losses():
-    from src.integrations.telegram_bot import _winning_streak
-    assert _winning_streak([-10, -20, -5]) == 0
+    with patch("src.integrations.telegram_bot.AsyncSessionLocal", return_value=mock_session):
+        await svc._log("1", "command", "/help", "/help", "ok", "success")
+
+    (row,) = mock_session.add_all.call_args.args[0]
+    assert row.command == "/help" and row.created_at is not None
+    mock_session.commit.assert_awaited_once()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# /help — always works
+# ─────────────────────────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_help_shows_all_commands():
+    """/help lists every major command."""
+    svc = _bot_service()
+    upd = _update("/help")
+
+    await svc.cmd_help(upd, _ctx())
+
+    text = upd.message.reply_text.call_args[0][0]
+    for cmd in ("/portfolio", "/trade", "/close", "/history", "/performance", "/chat"):
+        assert cmd in text, f"{cmd} missing from /help output"
 
 
 # ─────────────────────────────────────────────────────────────────────────────
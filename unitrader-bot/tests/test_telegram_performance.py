@@ -0,0 +1,59 @@
+"""Unit tests for the Telegram /performance stats aggregated in SQL."""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+async def _stats(db, make_trade, profits: list[float]) -> tuple:
+    from src.integrations.telegram_bot import _PERFORMANCE_STMT
+
+    # Oldest first, inserted newest first so row order can't fake the streak.
+    n = len(profits)
+    db.add_all([
+        make_trade("u1", "BTCUSDT", minutes_ago=n - i, profit=max(p, 0.0), loss=max(-p, 0.0))
+        for i, p in reversed(list(enumerate(profits)))
+    ])
+    await db.commit()
+    return (await db.execute(_PERFORMANCE_STMT, {"uid": "u1"})).one()
+
+
+async def test_no_closed_trades(trades_db, make_trade):
+    trades_db.add(make_trade("u2", "BTCUSDT", profit=10.0))
+    await trades_db.commit()
+    count, _total, _worst, _best, _wins, streak = await _stats(trades_db, make_trade, [])
+    assert count == 0
+    assert not streak
+
+
+async def test_aggregates_match_per_trade_pnl(trades_db, make_trade):
+    stats = await _stats(trades_db, make_trade, [200, 150, -80, 300])
+    assert tuple(stats) == (4, 570.0, -80.0, 300.0, 3, 2)
+
+
+@pytest.mark.parametrize(
+    ("profits", "expected"),
+    [
+        ([100, 200, 300], 3),
+        # W W L W W W L W  → best streak = 3
+        ([50, 80, -20, 90, 110, 70, -5, 30], 3),
+        ([-10, -20, -5], 0),
+    ],
+)
+async def test_longest_winning_streak_in_close_order(trades_db, make_trade, profits, expected):
+    *_, streak = await _stats(trades_db, make_trade, profits)
+    assert streak == expected
+
+
+async def test_performance_text_reads_one_aggregate_row(trades_db, make_trade):
+    from src.integrations.telegram_bot import TelegramBotService
+
+    user = SimpleNamespace(id="u1", ai_name="Atlas")
+    await _stats(trades_db, make_trade, [200, 150, -80, 300])
+    svc = TelegramBotService.__new__(TelegramBotService)
+
+    text = await svc._telegram_performance_text(trades_db, user)
+    assert "`75.0%`" in text
+    assert "`$+570.00`" in text
+    assert "`$+142.50`" in text
+    assert "Best Win Streak: `2`" in text
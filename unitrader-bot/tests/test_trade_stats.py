@@ -0,0 +1,37 @@
+"""Unit tests for the cached closed-trade aggregates."""
+
+import asyncio
+
+from src.services import trade_stats
+
+
+async def test_aggregates_loaded_once_per_ttl(monkeypatch):
+    calls = 0
+
+    async def _load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return {"total_trades": 10, "avg_profit_pct": 1.5, "win_rate": 60.0}
+
+    monkeypatch.setattr(trade_stats, "_load_trade_aggregates", _load)
+    monkeypatch.setattr(trade_stats, "_aggregates_cache", None)
+
+    first, second = await asyncio.gather(
+        trade_stats.get_trade_aggregates(), trade_stats.get_trade_aggregates()
+    )
+    assert first is second
+    assert await trade_stats.get_trade_aggregates() is first
+    assert calls == 1
+
+
+async def test_db_error_returns_zeros_uncached(monkeypatch):
+    async def _fail():
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(trade_stats, "_load_trade_aggregates", _fail)
+    monkeypatch.setattr(trade_stats, "_aggregates_cache", None)
+
+    stats = await trade_stats.get_trade_aggregates()
+    assert stats == {"total_trades": 0, "avg_profit_pct": 0.0, "win_rate": 0.0}
+    assert trade_stats._aggregates_cache is None
@@ -11,10 +11,12 @@ Tests are grouped by module:
 """
 
 import asyncio
+import math
 from datetime import datetime, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
 from src.services.trade_execution import (
@@ -309,6 +311,13 @@ class TestSupportResistance:
         result = calculate_support_resistance([100.0])
         assert result["pivot"] == 100.0
 
+    def test_uses_last_twenty_closes_and_accepts_arrays(self):
+        prices = [1000.0] + [100.0 + i for i in range(20)]
+        result = calculate_support_resistance(np.asarray(prices))
+        assert result["pivot"] == round((119.0 + 100.0 + 119.0) / 3, 8)
+        assert all(type(v) is float for v in result.values())
+        assert detect_trend(np.asarray(_prices(200, step=1.0))) == "uptrend"
+
 
 # ═════════════════════════════════════════════
 # CALCULATE INDICATORS (bundle)
@@ -329,6 +338,34 @@ class TestCalculateIndicators:
         result = calculate_indicators(prices)
         assert 0 <= result["rsi"] <= 100
 
+    def test_ema_matches_recursive_definition_across_blocks(self):
+        from src.integrations.market_data import _ema
+
+        prices = [100.0 + 5 * math.sin(i / 7) + i * 0.01 for i in range(600)]
+        k = 2 / 13
+        expected = [sum(prices[:12]) / 12]
+        for price in prices[12:]:
+            expected.append(price * k + expected[-1] * (1 - k))
+
+        result = _ema(np.asarray(prices), 12)
+        assert len(result) == len(expected)
+        assert np.allclose(result, expected, rtol=1e-12)
+
+    def test_compiled_and_vectorised_smoothing_agree(self):
+        from src.integrations import market_data
+
+        values = np.linspace(90.0, 110.0, 700) + np.sin(np.arange(700))
+        loop = market_data._smooth_loop(values, 1 / 14, 100.0)
+        with patch.object(market_data, "NUMBA_AVAILABLE", False):
+            vectorised = market_data._smooth(values, 1 / 14, 100.0)
+        assert np.allclose(loop, vectorised, rtol=1e-12)
+
+    def test_values_are_plain_floats(self):
+        result = calculate_indicators(_prices(200))
+        assert type(result["rsi"]) is float
+        assert type(result["macd"]["line"]) is float
+        assert type(result["ma50"]) is float
+
 
 # ═════════════════════════════════════════════
 # EXCHANGE KEY VALIDATION FUNCTIONS
@@ -593,6 +630,22 @@ class TestEncryptionRoundTrip:
         assert dec_key == key
         assert dec_secret == secret
 
+    def test_decrypt_is_cached_until_forgotten(self, monkeypatch):
+        from cryptography.fernet import Fernet
+
+        import security
+        monkeypatch.setattr(
+            security.settings, "field_encryption_key", Fernet.generate_key().decode()
+        )
+        enc_key, enc_secret = security.encrypt_api_key("PK_CACHE", "SK_CACHE")
+        assert security.decrypt_api_key(enc_key, enc_secret) == ("PK_CACHE", "SK_CACHE")
+
+        with patch.object(security, "_get_fernet", side_effect=AssertionError("decrypted")):
+            assert security.decrypt_api_key(enc_key, enc_secret) == ("PK_CACHE", "SK_CACHE")
+            security.forget_decrypted_api_key(enc_key, enc_secret)
+            with pytest.raises(AssertionError):
+                security.decrypt_api_key(enc_key, enc_secret)
+
     def test_hash_is_deterministic(self):
         from security import hash_api_key
         h1 = hash_api_key("PK_TEST_12345")
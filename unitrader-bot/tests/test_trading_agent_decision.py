@@ -0,0 +1,194 @@
+"""Unit tests for TradingAgent decision requests and exchange-client reuse."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.agents.core import trading_agent as ta
+
+
+_DECISION = {
+    "decision": "BUY",
+    "confidence": 72,
+    "entry_price": 100.0,
+    "stop_loss": 98.0,
+    "take_profit": 104.0,
+    "position_size_pct": 1.5,
+    "reasoning": "Uptrend with RSI support.",
+}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(ta.settings, "anthropic_api_key", "test-key")
+    monkeypatch.setattr(
+        ta, "get_token_manager", lambda: SimpleNamespace(log_call=AsyncMock())
+    )
+    return ta.TradingAgent(user_id="u1")
+
+
+async def _decide(agent, content):
+    agent._claude = SimpleNamespace(
+        messages=SimpleNamespace(
+            create=AsyncMock(return_value=SimpleNamespace(content=content, usage=None))
+        )
+    )
+    decision = await agent.get_claude_decision(
+        market_data={"symbol": "AAPL", "price": 100.0},
+        user_history={},
+        account_balance=1_000.0,
+        open_trades_count=0,
+    )
+    return decision, agent._claude.messages.create.await_args.kwargs
+
+
+async def test_decision_read_from_forced_tool_call(agent):
+    block = SimpleNamespace(type="tool_use", name="submit_trade_decision", input=_DECISION)
+    decision, kwargs = await _decide(agent, [block])
+
+    assert decision == _DECISION
+    assert kwargs["tool_choice"] == {"type": "tool", "name": "submit_trade_decision"}
+
+
+async def test_decision_falls_back_to_text_json(agent):
+    block = SimpleNamespace(type="text", text='{"decision": "WAIT", "confidence": 40}')
+    decision, _ = await _decide(agent, [block])
+
+    assert decision["decision"] == "WAIT"
+    assert decision["confidence"] == 40
+
+
+async def test_latency_optimized_flag_sets_extra_body(agent, monkeypatch):
+    block = SimpleNamespace(type="tool_use", name="submit_trade_decision", input=_DECISION)
+
+    _, kwargs = await _decide(agent, [block])
+    assert kwargs["extra_body"] is None
+
+    monkeypatch.setattr(ta.settings, "claude_latency_optimized", True)
+    _, kwargs = await _decide(agent, [block])
+    assert kwargs["extra_body"] == {"performance_config": {"latency": "optimized"}}
+
+
+def test_user_prompt_is_compact_json():
+    prompt = ta._build_user_prompt(
+        {
+            "symbol": "AAPL",
+            "price": 187.123456,
+            "indicators": {"rsi": 61.27, "macd": {"line": 0.5}},
+            "support_resistance": {"support": None},
+        },
+        {"win_rate": 55.0},
+        1_000.0,
+        2,
+    )
+
+    assert " " not in prompt
+    data = json.loads(prompt)
+    assert data["price"] == 187.1235
+    assert data["indicators"]["rsi14"] == 61.3
+    assert data["sr"]["support"] == 0
+    assert data["account"] == {"balance_usd": 1000.0, "open_trades": 2}
+
+
+async def test_exchange_clients_are_pooled_per_credentials(monkeypatch):
+    built = []
+
+    def _build(exchange, key, secret, *, is_paper):
+        client = SimpleNamespace(aclose=AsyncMock(), key=key)
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(ta, "get_exchange_client", _build)
+    monkeypatch.setattr(ta, "_CLIENT_POOL", ta.OrderedDict())
+
+    first = ta._pooled_exchange_client("binance", "k1", "s1", True)
+    assert ta._pooled_exchange_client("binance", "k1", "s1", True) is first
+    assert ta._pooled_exchange_client("binance", "k2", "s1", True) is not first
+    assert len(built) == 2
+
+    await ta.close_pooled_exchange_clients()
+    assert ta._CLIENT_POOL == {}
+    assert all(c.aclose.await_count == 1 for c in built)
+
+
+async def test_client_pool_evicts_lru_and_defers_close(monkeypatch):
+    built = []
+
+    def _build(exchange, key, secret, *, is_paper):
+        client = SimpleNamespace(aclose=AsyncMock(), key=key)
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(ta, "get_exchange_client", _build)
+    monkeypatch.setattr(ta, "_CLIENT_POOL", ta.OrderedDict())
+    monkeypatch.setattr(ta, "_CLIENT_POOL_MAX", 2)
+
+    a = ta._pooled_exchange_client("binance", "a", "s", True)
+    b = ta._pooled_exchange_client("binance", "b", "s", True)
+    assert ta._pooled_exchange_client("binance", "a", "s", True) is a  # a is now most recent
+    ta._pooled_exchange_client("binance", "c", "s", True)
+
+    assert ta._pooled_exchange_client("binance", "a", "s", True) is a
+    assert b not in ta._CLIENT_POOL.values()
+    # The evicted client may still be mid-order in another cycle.
+    await asyncio.sleep(0)
+    b.aclose.assert_not_awaited()
+    assert len(ta._PENDING_CLIENT_CLOSES) == 1
+
+    await ta.close_pooled_exchange_clients()
+    assert ta._PENDING_CLIENT_CLOSES == set()
+    assert all(c.aclose.await_count == 1 for c in built)
+
+
+def test_agents_share_one_claude_client(monkeypatch):
+    monkeypatch.setattr(ta, "_claude_client", None)
+
+    first = ta.TradingAgent(user_id="u1")
+    second = ta.TradingAgent(user_id="u2")
+
+    assert first._claude is second._claude
+
+
+def test_learning_context_rendered_once_per_content():
+    ta._render_learning_context.cache_clear()
+    args = (("RSI 60-70 momentum",), (), ((8, "Favour uptrends"),))
+
+    text = ta._render_learning_context(*args)
+    assert ta._render_learning_context(*args) is text
+    assert "  - RSI 60-70 momentum" in text
+    assert "  [8] Favour uptrends" in text
+    assert "SETUPS TO AVOID" not in text
+    assert ta._render_learning_context((), (), ()) == ""
+
+
+async def test_pure_safety_rejection_skips_daily_loss_query(agent):
+    db = SimpleNamespace(execute=AsyncMock(side_effect=AssertionError("queried")))
+    user_settings = SimpleNamespace(max_daily_loss=5.0, max_position_size=2.0)
+    low_conf = dict(_DECISION, confidence=10)
+
+    guard = await agent._safety_checks(low_conf, 1_000.0, user_settings, db, is_paper=False)
+
+    assert guard == {"allowed": False, "reason": "Confidence 10 < 50"}
+    db.execute.assert_not_awaited()
+
+
+async def test_agent_output_written_in_background(monkeypatch):
+    release = asyncio.Event()
+    written: list[dict] = []
+
+    async def _slow_record(**kwargs):
+        await release.wait()
+        written.append(kwargs)
+
+    monkeypatch.setattr(ta, "record_agent_output", _slow_record)
+
+    await ta._record_agent_output_nowait(agent_name="trading", outcome="skipped")
+    assert written == [] and len(ta._PENDING_OUTPUT_WRITES) == 1
+
+    release.set()
+    await asyncio.gather(*ta._PENDING_OUTPUT_WRITES)
+    assert written == [{"agent_name": "trading", "outcome": "skipped"}]
+    assert not ta._PENDING_OUTPUT_WRITES
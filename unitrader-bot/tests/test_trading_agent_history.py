@@ -0,0 +1,96 @@
+"""Unit tests for TradingAgent's SQL-side trade-history aggregates."""
+
+
+async def test_user_history_defaults_when_no_closed_trades(trades_db):
+    from src.agents.core.trading_agent import TradingAgent
+
+    agent = TradingAgent(user_id="u1")
+    out = await agent._get_user_history(trades_db, "BTCUSDT")
+    assert out == {"win_rate": 50.0, "avg_profit": 0.0, "avg_loss": 0.0, "count": 0}
+
+
+async def test_user_history_aggregates_wins_and_losses(trades_db, make_trade):
+    from src.agents.core.trading_agent import TradingAgent
+
+    trades_db.add_all(
+        [
+            make_trade("u1", "BTCUSDT", profit=10.0, profit_percent=4.0),
+            make_trade("u1", "BTCUSDT", profit=5.0, profit_percent=2.0),
+            make_trade("u1", "BTCUSDT", loss=3.0, profit_percent=-1.5),
+            make_trade("u1", "BTCUSDT", status="open"),
+            make_trade("u1", "ETHUSDT", profit=99.0, profit_percent=50.0),
+            make_trade("u2", "BTCUSDT", loss=1.0, profit_percent=-9.0),
+        ]
+    )
+    await trades_db.commit()
+
+    agent = TradingAgent(user_id="u1")
+    out = await agent._get_user_history(trades_db, "BTCUSDT")
+    assert out == {"win_rate": 66.7, "avg_profit": 3.0, "avg_loss": -1.5, "count": 3}
+
+
+async def test_user_history_only_considers_last_50_closed(trades_db, make_trade):
+    from src.agents.core.trading_agent import TradingAgent
+
+    # 50 recent losses, plus one older win that falls outside the window.
+    trades_db.add_all(
+        [make_trade("u1", "AAPL", loss=1.0, profit_percent=-1.0, minutes_ago=i) for i in range(50)]
+        + [make_trade("u1", "AAPL", profit=1.0, profit_percent=1.0, minutes_ago=500)]
+    )
+    await trades_db.commit()
+
+    agent = TradingAgent(user_id="u1")
+    out = await agent._get_user_history(trades_db, "AAPL")
+    assert out["count"] == 50
+    assert out["win_rate"] == 0.0
+
+
+async def test_user_context_returns_history_and_open_count(trades_db, make_trade):
+    from src.agents.core.trading_agent import TradingAgent
+
+    trades_db.add_all(
+        [
+            make_trade("u1", "BTCUSDT", profit=10.0, profit_percent=4.0),
+            make_trade("u1", "BTCUSDT", status="open"),
+            make_trade("u1", "ETHUSDT", status="open"),
+            make_trade("u2", "BTCUSDT", status="open"),
+        ]
+    )
+    await trades_db.commit()
+
+    agent = TradingAgent(user_id="u1")
+    history, open_count = await agent._get_user_context(trades_db, "BTCUSDT")
+    assert history == {"win_rate": 100.0, "avg_profit": 4.0, "avg_loss": 0.0, "count": 1}
+    # Open count is across all of the user's symbols.
+    assert open_count == 2
+
+
+async def test_daily_loss_cached_and_bumped_on_close(trades_db, monkeypatch, make_trade):
+    from src.agents.core import trading_agent as ta
+
+    monkeypatch.setattr(ta, "_daily_loss_cache", {})
+    trades_db.add(make_trade("u1", "AAPL", loss=12.5))
+    await trades_db.commit()
+    agent = ta.TradingAgent(user_id="u1")
+
+    assert await agent._daily_loss_today(trades_db) == 12.5
+
+    trades_db.add(make_trade("u1", "MSFT", loss=7.5))
+    await trades_db.commit()
+    assert await agent._daily_loss_today(trades_db) == 12.5  # cached
+
+    ta.record_realised_loss("u1", 7.5)
+    assert await agent._daily_loss_today(trades_db) == 20.0
+
+
+def test_settle_trade_sign_per_side(make_trade):
+    from src.agents.core.trading_agent import _settle_trade
+
+    long = make_trade("u1", "AAPL", status="open")
+    assert _settle_trade(long, 110.0) == (10.0, 10.0)
+    assert (long.status, long.profit, long.loss, long.exit_price) == ("closed", 10.0, None, 110.0)
+
+    short = make_trade("u1", "AAPL", status="open")
+    short.side = "SELL"
+    assert _settle_trade(short, 110.0) == (-10.0, -10.0)
+    assert (short.profit, short.loss, short.profit_percent) == (None, 10.0, -10.0)